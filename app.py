@@ -1,11 +1,10 @@
 from io import StringIO
 import sys
+import threading
+import pandas as pd
 import streamlit as st
-from krr_system import (
-    TimeDomainDescription,
-    Fluent,
-    Scenario,
-)
+from krr_system import Fluent
+from krr_system.store import Store, decode, encode
 
 
 # to be deleted when TimeDomainDescription.description() will return value instead of print
@@ -21,34 +20,17 @@ class Capturing(list):
         sys.stdout = self._stdout
 
 
-file_fluents = open("variables/fluents.txt", "r")
-list_of_fluents = file_fluents.read()
+@st.experimental_singleton
+def get_store(path: str) -> Store:
+    """One connection shared by every rerun and session"""
+    store = Store(path)
+    if store.version() == 0:
+        # data entered before the store existed
+        store.import_legacy("variables")
+    return store
 
-file_actions = open("variables/actions.txt", "r")
-list_of_actions = file_actions.read()
 
-file_statements = open("variables/statements.txt", "r")
-list_of_statements = file_statements.read()
-
-file_initial_states = open("variables/initial_states.txt", "r")
-list_of_initial_states = file_initial_states.read()
-
-file_observations = open("variables/observations.txt", "r")
-list_of_observations = file_observations.read()
-
-file_action_occurences = open("variables/action_occurences.txt", "r")
-list_of_action_occurences = file_action_occurences.read()
-
-file_technical_vars = open("variables/technical_variables.txt", "r")
-list_of_technical_vars = file_technical_vars.read()
-
-file_fluents.close()
-file_actions.close()
-file_statements.close()
-file_initial_states.close()
-file_observations.close()
-file_action_occurences.close()
-file_technical_vars.close()
+store = get_store("krr.db")
 
 st.title("Knowledge Representation and Reasoning")
 
@@ -58,34 +40,7 @@ reset_button = st.button(label="Reset environment")
 
 st.header("Domain Description")
 if reset_button:
-    list_of_fluents = ""
-    list_of_actions = ""
-    list_of_statements = ""
-    list_of_initial_states = ""
-    list_of_observations = ""
-    list_of_action_occurences = ""
-    list_of_technical_vars = "1;1"
-    file_fluents = open("variables/fluents.txt", "w")
-    file_actions = open("variables/actions.txt", "w")
-    file_statements = open("variables/statements.txt", "w")
-    file_initial_states = open("variables/initial_states.txt", "w")
-    file_observations = open("variables/observations.txt", "w")
-    file_action_occurences = open("variables/action_occurences.txt", "w")
-    file_technical_vars = open("variables/technical_variables.txt", "w")
-    file_fluents.write("")
-    file_actions.write("")
-    file_statements.write("")
-    file_initial_states.write("")
-    file_observations.write("")
-    file_action_occurences.write("")
-    file_technical_vars.write("1;1")
-    file_fluents.close()
-    file_actions.close()
-    file_statements.close()
-    file_initial_states.close()
-    file_observations.close()
-    file_action_occurences.close()
-    file_technical_vars.close()
+    store.reset()
 
 # fluents input
 
@@ -99,18 +54,7 @@ with col2:
     fluent_button = st.button(label="Submit fluent")
 
 if fluent_button:
-    file_fluents = open("variables/fluents.txt", "a")
-
-    if len(list_of_fluents) == 0:
-        file_fluents.write(fluent_input)
-        list_of_fluents += fluent_input
-    else:
-        list_of_fluents_splitted = list_of_fluents.split(",")
-        if fluent_input not in list_of_fluents_splitted:
-            file_fluents.write("," + fluent_input)
-            list_of_fluents += "," + fluent_input
-
-    file_fluents.close()
+    store.add_fluent(fluent_input)
 
 # actions input
 
@@ -127,32 +71,14 @@ with col3:
     action_button = st.button(label="Submit action")
 
 if action_button:
-    action_couple = f"{action_input};{duration_input}"
-
-    file_actions = open("variables/actions.txt", "a")
-
-    if len(list_of_actions) == 0:
-        file_actions.write(action_couple)
-        list_of_actions += action_couple
-    else:
-        list_of_actions_splitted = list_of_actions.split(",")
-        if action_couple not in list_of_actions_splitted:
-            file_actions.write("," + action_couple)
-            list_of_actions += "," + action_couple
-
-    file_actions.close()
+    store.add_action(action_input, duration_input)
 
 # duration modification
 
 col1, col2, col3 = st.columns([3, 2, 1])
 
-actions = list_of_actions.split(",")
-if len(list_of_actions) == 0:
-    action_names = []
-    action_durations_values = []
-else:
-    action_names = [action.split(";")[0] for action in actions]
-    action_durations_values = [action.split(";")[1] for action in actions]
+action_names = [name for name, _ in store.actions()]
+fluent_names = store.fluents()
 
 with col1:
     duration_action = st.selectbox("Choose action to modify duration", action_names)
@@ -168,30 +94,19 @@ with col3:
         duration_button = st.button(label="Submit duration", disabled=True)
 
 if duration_button:
-    file_actions = open("variables/actions.txt", "w")
-
-    action_index = action_names.index(duration_action)
-    action_durations_values[action_index] = str(duration)
-    new_durations = [
-        f"{action_names[i]};{action_durations_values[i]}"
-        for i in range(len(action_names))
-    ]
-    list_of_actions = ",".join(new_durations)
-    file_actions.write(list_of_actions)
-    file_actions.close()
+    store.set_duration(duration_action, duration)
 
 # statement input
 
-condition_values, fluent_values = list_of_technical_vars.split(";")
-condition_values = int(condition_values)
-fluent_values = int(fluent_values)
+condition_values = int(store.setting("conditions", "1"))
+fluent_values = int(store.setting("fluents", "1"))
 
 st.subheader("Statements")
 col1, col2, col3, col4 = st.columns([4, 3, 3, 2])
 
 with col1:
     statement_action = st.selectbox(
-        "Choose action", [action.split(";")[0] for action in list_of_actions.split(",")]
+        "Choose action", action_names
     )
     statement_type = st.radio(
         "Choose type of statement", ("causes", "releases", "impossible")
@@ -211,7 +126,7 @@ with col2:
         # 1st statement
         if fluent_values > 0:
             statement_fluent_1 = st.selectbox(
-                "Choose fluent 1st", list_of_fluents.split(",")
+                "Choose fluent 1st", fluent_names
             )
             statement_fluent_false_1 = st.checkbox("False", key="fluent_false_1")
             statement_fluent_state_1 = "False" if statement_fluent_false_1 else "True"
@@ -219,7 +134,7 @@ with col2:
         # 2nd statement
         if fluent_values > 1:
             statement_fluent_2 = st.selectbox(
-                "Choose fluent 2nd", list_of_fluents.split(",")
+                "Choose fluent 2nd", fluent_names
             )
             statement_fluent_false_2 = st.checkbox("False", key="fluent_false_2")
             statement_fluent_state_2 = "False" if statement_fluent_false_2 else "True"
@@ -227,7 +142,7 @@ with col2:
         # 3rd statement
         if fluent_values > 2:
             statement_fluent_3 = st.selectbox(
-                "Choose fluent 3rd", list_of_fluents.split(",")
+                "Choose fluent 3rd", fluent_names
             )
             statement_fluent_false_3 = st.checkbox("False", key="fluent_false_3")
             statement_fluent_state_3 = "False" if statement_fluent_false_3 else "True"
@@ -235,7 +150,7 @@ with col2:
         # 4th statement
         if fluent_values > 3:
             statement_fluent_4 = st.selectbox(
-                "Choose fluent 4th", list_of_fluents.split(",")
+                "Choose fluent 4th", fluent_names
             )
             statement_fluent_false_4 = st.checkbox("False", key="fluent_false_4")
             statement_fluent_state_4 = "False" if statement_fluent_false_4 else "True"
@@ -243,7 +158,7 @@ with col2:
         # 5th statement
         if fluent_values > 4:
             statement_fluent_5 = st.selectbox(
-                "Choose fluent 5th", list_of_fluents.split(",")
+                "Choose fluent 5th", fluent_names
             )
             statement_fluent_false_5 = st.checkbox("False", key="fluent_false_5")
             statement_fluent_state_5 = "False" if statement_fluent_false_5 else "True"
@@ -263,7 +178,7 @@ with col3:
     # 1st statement condition
     if condition_values > 0:
         statement_condition_1 = st.selectbox(
-            "Choose condition 1st", list_of_fluents.split(",")
+            "Choose condition 1st", fluent_names
         )
         statement_condition_false_1 = st.checkbox("False", key="condition_false_1")
         statement_condition_state_1 = "False" if statement_condition_false_1 else "True"
@@ -271,7 +186,7 @@ with col3:
     #  2nd statement condition
     if condition_values > 1:
         statement_condition_2 = st.selectbox(
-            "Choose condition 2nd", list_of_fluents.split(",")
+            "Choose condition 2nd", fluent_names
         )
         statement_condition_false_2 = st.checkbox("False", key="condition_false_2")
         statement_condition_state_2 = "False" if statement_condition_false_2 else "True"
@@ -279,7 +194,7 @@ with col3:
     # 3rd statement condition
     if condition_values > 2:
         statement_condition_3 = st.selectbox(
-            "Choose condition 3rd", list_of_fluents.split(",")
+            "Choose condition 3rd", fluent_names
         )
         statement_condition_false_3 = st.checkbox("False", key="condition_false_3")
         statement_condition_state_3 = "False" if statement_condition_false_3 else "True"
@@ -287,7 +202,7 @@ with col3:
     # 4th statement condition
     if condition_values > 3:
         statement_condition_4 = st.selectbox(
-            "Choose condition 4th", list_of_fluents.split(",")
+            "Choose condition 4th", fluent_names
         )
         statement_condition_false_4 = st.checkbox("False", key="condition_false_4")
         statement_condition_state_4 = "False" if statement_condition_false_4 else "True"
@@ -295,7 +210,7 @@ with col3:
     # 5th statement condition
     if condition_values > 4:
         statement_condition_5 = st.selectbox(
-            "Choose condition 5th", list_of_fluents.split(",")
+            "Choose condition 5th", fluent_names
         )
         statement_condition_false_5 = st.checkbox("False", key="condition_false_5")
         statement_condition_state_5 = "False" if statement_condition_false_5 else "True"
@@ -305,9 +220,10 @@ with col4:
     submit_button = st.text("")
     submit_button = st.button(label="Submit statement")
 
-file_technical_vars = open("variables/technical_variables.txt", "w")
-file_technical_vars.write(f"{condition_values};{fluent_values}")
-file_technical_vars.close()
+if (condition_values, fluent_values) != (int(store.setting("conditions", "1")), int(store.setting("fluents", "1"))):
+    with store.transaction(versioned=False):
+        store.set_setting("conditions", str(condition_values))
+        store.set_setting("fluents", str(fluent_values))
 
 if submit_button:
     statement_conditions = ""
@@ -347,24 +263,15 @@ if submit_button:
         statement_quartet = (
             f"{statement_action};{statement_type};;{statement_conditions}"
         )
-    # else:
-    #     statement_quartet = f"{statement_action};{statement_type};{statement_fluent};{statement_fluent_state};;;"
-
-    file_statements = open("variables/statements.txt", "a")
 
-    if len(list_of_statements) == 0:
-        file_statements.write(statement_quartet)
-        list_of_statements += statement_quartet
-    else:
-        list_of_statements_splitted = list_of_statements.split(",")
-        if statement_quartet not in list_of_statements_splitted:
-            file_statements.write("," + statement_quartet)
-            list_of_statements += "," + statement_quartet
-    st.write(list_of_statements)
-
-    file_statements.close()
+    _, _, statement_fluents, statement_conditions = statement_quartet.split(";")
+    store.add_statement(
+        statement_action,
+        statement_type,
+        decode(statement_fluents),
+        decode(statement_conditions),
+    )
     st.write(f"{statement_quartet}")
-    st.write(list_of_statements.split(","))
 
 # initial condition input
 
@@ -375,7 +282,7 @@ with col1:
     initial_state_fluent = st.selectbox(
         key="initial_state_fluent",
         label="Choose fluent",
-        options=list_of_fluents.split(","),
+        options=fluent_names,
     )
     initial_state_fluent_false = st.checkbox(
         key="initial_state_fluent_false", label="False"
@@ -386,21 +293,7 @@ with col2:
     initial_state = st.button(label="Submit inital state")
 
 if initial_state:
-    initial_state_couple = f"{initial_state_fluent};{initial_state_fluent_value}"
-
-    file_initial_states = open("variables/initial_states.txt", "a")
-
-    if len(list_of_initial_states) == 0:
-        file_initial_states.write(initial_state_couple)
-        list_of_initial_states += initial_state_couple
-    else:
-        list_of_initial_states_splitted = list_of_initial_states.split(",")
-        if initial_state_fluent not in [
-            initial.split(";")[0] for initial in list_of_initial_states_splitted
-        ]:
-            file_initial_states.write("," + initial_state_couple)
-            list_of_initial_states += "," + initial_state_couple
-    file_initial_states.close()
+    store.add_initial_state(initial_state_fluent, initial_state_fluent_value == "True")
 
 st.header("Scenario")
 
@@ -414,7 +307,7 @@ with col1:
     observation_fluent = st.selectbox(
         key="observation_fluent",
         label="Choose fluent",
-        options=list_of_fluents.split(","),
+        options=fluent_names,
     )
     observation_fluent_false = st.checkbox(
         key="observation_fluent_false", label="False"
@@ -429,27 +322,10 @@ with col3:
     observation = st.button(label="Submit observation")
 
 if observation:
-    observation_couple = (
-        f"{observation_fluent};{observation_fluent_value};{observation_fluent_time}"
+    store.add_observation(
+        observation_fluent, observation_fluent_value == "True", observation_fluent_time
     )
 
-    file_observations = open("variables/observations.txt", "a")
-
-    if len(list_of_observations) == 0:
-        file_observations.write(observation_couple)
-        list_of_observations += observation_couple
-    else:
-        list_of_observations_splitted = list_of_observations.split(",")
-        existing_observations = [
-            [obs.split(";")[0], obs.split(";")[2]]
-            for obs in list_of_observations_splitted
-        ]
-        duplicate_observation = [observation_fluent, str(observation_fluent_time)]
-        if duplicate_observation not in existing_observations:
-            file_observations.write("," + observation_couple)
-            list_of_observations += "," + observation_couple
-    file_observations.close()
-
 # action occurences input
 
 st.subheader("Action occurences")
@@ -460,7 +336,7 @@ with col1:
     action_occurence = st.selectbox(
         key="action_occurence",
         label="Choose action occurence",
-        options=[action.split(";")[0] for action in list_of_actions.split(",")],
+        options=action_names,
     )
 with col2:
     action_occurence_time = st.number_input(
@@ -471,98 +347,57 @@ with col3:
     action_occurence_button = st.button(label="Submit action occurence")
 
 if action_occurence_button:
-    action_occurence_couple = f"{action_occurence};{action_occurence_time}"
-
-    file_action_occurences = open("variables/action_occurences.txt", "a")
-    st.write()
-    if len(list_of_action_occurences) == 0:
-        file_action_occurences.write(action_occurence_couple)
-        list_of_action_occurences += action_occurence_couple
-    else:
-        list_of_action_occurence_times = [
-            ac.split(";")[1] for ac in list_of_action_occurences.split(",")
-        ]
-        if action_occurence_time not in list_of_action_occurence_times:
-            file_action_occurences.write("," + action_occurence_couple)
-            list_of_action_occurences += "," + action_occurence_couple
+    store.add_occurrence(action_occurence, action_occurence_time)
 
 # model preparation
 
 calculate_button = st.button("Calculate model")
 
-def scenario_calculation():
-    m = TimeDomainDescription()
-    if len(list_of_initial_states) > 0:
-        for initial_state in list_of_initial_states.split(","):
-            state = initial_state.split(";")
-            m.initially(**{state[0]: state[1] == "True"})
-
-    if len(list_of_actions) > 0:
-        for duration in list_of_actions.split(","):
-            state = duration.split(";")
-            m.duration(state[0], int(state[1]))
-    if len(list_of_statements) > 0:
-        for statement in list_of_statements.split(","):
-            stmnt = statement.split(";")
-            if stmnt[1] == "causes" or stmnt[1] == "releases":
-                statement_fluents_model = stmnt[2].split(":")
-                fluent_values_model = []
-                for i in statement_fluents_model:
-                    fluent_values_model.append(
-                        Fluent(**{i.split("#")[0]: i.split("#")[1] == "True"})
-                    )
-
-            statement_conditions_model = stmnt[3].split(":")
-            condition_values_model = []
-            try:
-                for i in statement_conditions_model:
-                    condition_values_model.append(
-                        Fluent(**{i.split("#")[0]: i.split("#")[1] == "True"})
-                    )
-            except:
-                pass
-
-            if stmnt[1] == "causes":
-                m.causes(
-                    stmnt[0],
-                    fluent_values_model,
-                    conditions=condition_values_model,
-                )
-            elif stmnt[1] == "releases":
-                m.releases(stmnt[0], fluent_values_model)
-            elif stmnt[1] == "impossible":
-                m.impossible(stmnt[0], conditions=condition_values_model)
+def scenario_lock():
+    """
+    Held across every use of the session's scenario: reruns of a session can overlap,
+    and queries move the scenario's domain state back and forth
+    """
+    return st.session_state.setdefault("live_lock", threading.Lock())
 
-    OBS = ()
-    if len(list_of_observations) > 0:
-        OBS_list = []
-        for observation in list_of_observations.split(","):
-            obs = observation.split(";")
-            OBS_list.append(Fluent(**{obs[0]: obs[1] == "True"}))
-        OBS = (OBS_list, int(obs[2]))
 
-    ACS = ()
-    if len(list_of_action_occurences) > 0:
-        ACS_list = []
-        for action in list_of_action_occurences.split(","):
-            acs = action.split(";")
-            ACS_list.append((acs[0], int(acs[1])))
-        ACS = tuple(ACS_list)
-
-    # with Capturing() as output:
-    #     m.description()
-
-    return Scenario(domain=m, observations=OBS, action_occurances=ACS), m.description()
+def scenario_calculation():
+    """
+    Keeps the last domain and scenario built from the store in the session, one entry per
+    session, so that every panel and rerun reuses one compiled domain and one simulated timeline
+    """
+    live = st.session_state.setdefault("live_scenario", dict())
+    version = store.version()
+    if live.get("version") != version:
+        m = store.domain()
+        output = m.description()
+        s = store.scenario(m)
+        if live and live["output"] == output and live["scenario"].observations == s.observations:
+            # only the occurrences changed, the timeline is simulated again from the first changed one
+            live["scenario"].action_occurances = s.action_occurances
+            s = live["scenario"]
+        live.update(version=version, scenario=s, output=output)
+    return live["scenario"], live["output"]
 
 
 if calculate_button:
-    s, output = scenario_calculation()
-    try:
-        s_result = s.is_consistent(verbose=True)
-        st.text(output)
-        st.write(f"Is consistent: {s_result}")
-    except Exception as e:
-        st.write(f"Your mistake: {e}")
+    with scenario_lock():
+        s, output = scenario_calculation()
+        try:
+            s_result = s.is_consistent(verbose=True)
+            inference = s.infer_initial_state()
+            st.text(output)
+            st.write(f"Is consistent: {s_result}")
+            st.write(f"Observations consistent: {inference.consistent}")
+            if inference.initial:
+                st.write(f"Inferred initial state: {inference.initial}")
+            trace = s.trace()
+            timeline = pd.DataFrame(trace.values, index=trace.times, columns=trace.names)
+            st.write("Fluents over time (1 true, -1 false, 0 unknown)")
+            # occurances starting together share a time, the state after the last of them is what holds then
+            st.line_chart(timeline[~timeline.index.duplicated(keep="last")])
+        except Exception as e:
+            st.write(f"Your mistake: {e}")
 
 # action query
 
@@ -574,7 +409,7 @@ with col1:
     action_query = st.selectbox(
         key="action_query",
         label="Choose action",
-        options=[action.split(";")[0] for action in list_of_actions.split(",")],
+        options=action_names,
     )
 with col2:
     action_query_time = st.number_input(
@@ -587,18 +422,19 @@ with col3:
     )
 
 if action_query_button:
-    s = scenario_calculation()
-    try:
-        with Capturing() as output:
-            s_result = s.is_consistent(verbose=True)
-            if s_result:
-                a_result = s.does_action_perform(action_query, action_query_time)
-            else:
-                a_result = False
-        st.write(output)
-        st.write(f"Does action perform: {a_result}")
-    except Exception as e:
-        st.write(f"Your mistake: {e}")
+    with scenario_lock():
+        s, _ = scenario_calculation()
+        try:
+            with Capturing() as output:
+                s_result = s.is_consistent(verbose=True)
+                if s_result:
+                    a_result = s.does_action_perform(action_query, action_query_time)
+                else:
+                    a_result = False
+            st.write(output)
+            st.write(f"Does action perform: {a_result}")
+        except Exception as e:
+            st.write(f"Your mistake: {e}")
 
 # condition query
 
@@ -610,7 +446,7 @@ with col1:
     condition_query = st.selectbox(
         key="condition_query",
         label="Choose condition",
-        options=list_of_fluents.split(","),
+        options=fluent_names,
     )
     condition_query_false = st.checkbox(key="condition_query_false", label="False")
     condition_query_value = "False" if condition_query_false else "True"
@@ -625,97 +461,85 @@ with col3:
     )
 
 if condition_query_button:
-    s = scenario_calculation()
-    try:
-        with Capturing() as output:
-            s_result = s.is_consistent()
-            if s_result:
-                q_result = s.check_if_condition_hold(Fluent(**{condition_query: condition_query_value == "True"}), condition_query_time, verbose=True)
+    with scenario_lock():
+        s, _ = scenario_calculation()
+        try:
+            with Capturing() as output:
+                s_result = s.is_consistent()
+                if s_result:
+                    q_result = s.check_if_condition_hold(Fluent(**{condition_query: condition_query_value == "True"}), condition_query_time, verbose=True)
+                else:
+                    q_result = False
+            st.write(output)
+            if q_result is None:
+                st.write("Condition possible, but unnecessary")
+            elif q_result:
+                st.write("Condition necessary")
             else:
-                q_result = False
-        st.write(output)
-        if q_result is None:
-            st.write("Condition possible, but unnecessary")
-        elif q_result:
-            st.write("Condition necessary")
-        else:
-            st.write("Condition impossible")
-    except Exception as e:
-        st.write(f"Your mistake: {e}")
+                st.write("Condition impossible")
+        except Exception as e:
+            st.write(f"Your mistake: {e}")
 
 # sidebar with current values
 
 with st.sidebar:
     st.subheader("Current example")
-    if len(list_of_fluents) == 0:
+    fluent_names = store.fluents()
+    if len(fluent_names) == 0:
         st.text("--- no fluents inserted ---")
     else:
         st.text("Fluents")
-        for fluent in list_of_fluents.split(","):
+        for fluent in fluent_names:
             st.text("- " + fluent)
-    if len(list_of_actions) == 0:
+    action_durations = store.actions()
+    if len(action_durations) == 0:
         st.text("--- no actions inserted ---")
     else:
-        action_durations = list_of_actions.split(",")
-        action_names = [
-            action_duration.split(";")[0] for action_duration in action_durations
-        ]
-        action_durations_values = [
-            action_duration.split(";")[1] for action_duration in action_durations
-        ]
         st.text("Actions (duration)")
-        for action in action_names:
-            st.text(
-                "- "
-                + action
-                + " ("
-                + action_durations_values[action_names.index(action)]
-                + ")"
-            )
+        for action, action_duration in action_durations:
+            st.text(f"- {action} ({action_duration})")
 
-    if len(list_of_statements) == 0:
+    statements = store.statements()
+    if len(statements) == 0:
         st.text("--- no statements inserted ---")
     else:
         st.text("Statements")
-        for statement in list_of_statements.split(","):
-            stmnt = statement.split(";")
+        for statement in statements:
             statement_fluents_description = (
-                stmnt[2].replace("#", " = ").replace(":", " AND ")
+                encode(statement.fluents).replace("#", " = ").replace(":", " AND ")
             )
             statement_condtions_description = (
-                stmnt[3].replace("#", " = ").replace(":", " AND ")
+                encode(statement.conditions).replace("#", " = ").replace(":", " AND ")
             )
-            if stmnt[1] != "impossible":
+            if statement.kind != "impossible":
                 st.text(
-                    f"ACTION {stmnt[0]} {stmnt[1]} FLUENT {statement_fluents_description} GIVEN THAT {statement_condtions_description}"
+                    f"ACTION {statement.action} {statement.kind} FLUENT {statement_fluents_description} GIVEN THAT {statement_condtions_description}"
                 )
             else:
-                st.write(stmnt)
                 st.text(
-                    f"ACTION {stmnt[0]} {stmnt[1]} GIVEN THAT {statement_condtions_description}"
+                    f"ACTION {statement.action} {statement.kind} GIVEN THAT {statement_condtions_description}"
                 )
-    action_durations = list_of_actions.split(",")
 
-    if len(list_of_initial_states) == 0:
+    initial_states = store.initial_states()
+    if len(initial_states) == 0:
         st.text("--- no initial values inserted ---")
     else:
         st.text("Initial state")
-        for initial_state in list_of_initial_states.split(","):
-            state = initial_state.split(";")
-            st.text(f"- {state[0]}={state[1]}")
+        for fluent, value in initial_states:
+            st.text(f"- {fluent}={value}")
 
-    if len(list_of_observations) == 0:
+    observations = store.observations()
+    if len(observations) == 0:
         st.text("--- no observations inserted ---")
     else:
         st.text("Observations")
-        for observation in list_of_observations.split(","):
-            obs = observation.split(";")
-            st.text(f"- {obs[0]}={obs[1]} ({obs[2]})")
+        for fluent, value, time in observations:
+            st.text(f"- {fluent}={value} ({time})")
 
-    if len(list_of_action_occurences) == 0:
+    occurrences = store.occurrences()
+    if len(occurrences) == 0:
         st.text("--- no action occurences inserted ---")
     else:
         st.text("Action occurences")
-        for action_occurence in list_of_action_occurences.split(","):
-            act = action_occurence.split(";")
-            st.text(f"- {act[0]}={act[1]}")
+        for action, time in occurrences:
+            st.text(f"- {action}={time}")
@@ -0,0 +1 @@
+"""Synthetic workloads and timings of the reasoning engine, run with `python -m benchmarks`"""
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import random
+from typing import List, Tuple, Type
+
+from krr_system.domain import DomainDescription, Fluent, TimeDomainDescription
+from krr_system.scenario import Scenario
+from krr_system.structure import Statement
+
+
+def _literals(r: random.Random, names: List[str], count: int) -> List[Fluent]:
+    # one literal per fluent, so a rule never sets a fluent to both values
+    return [Fluent(name, r.random() < 0.5) for name in r.sample(names, min(count, len(names)))]
+
+
+def random_domain(seed: int = 0, fluents: int = 20, actions: int = 10, rules: int = 3, conditions: int = 2,
+                  impossible: float = 0.1, release: float = 0.1, max_duration: int = 3,
+                  cls: Type[DomainDescription] = TimeDomainDescription) -> DomainDescription:
+    """
+    Domain over fluents f0, f1, ... and actions a0, a1, ..., every action with `rules` causes
+    rules of up to two effects and `conditions` conditions each; a rule is a releases rule
+    with probability `release` and an action gets an impossibility clause with probability `impossible`.
+    Half of the fluents start known.
+    """
+    r = random.Random(seed)
+    names = [f"f{i}" for i in range(fluents)]
+    domain = cls()
+    domain.initially(**{f.name: f.value for f in _literals(r, names, fluents // 2)})
+    for a in range(actions):
+        action = f"a{a}"
+        for _ in range(rules):
+            effects = _literals(r, names, r.randint(1, 2))
+            if r.random() < release:
+                domain.releases(action, effects, _literals(r, names, conditions) or None)
+            else:
+                domain.causes(action, effects, _literals(r, names, conditions) or None)
+        if r.random() < impossible:
+            domain.impossible(action, _literals(r, names, 2))
+        if isinstance(domain, TimeDomainDescription):
+            domain.duration(action, r.randint(1, max_duration))
+    return domain
+
+
+def random_occurances(domain: TimeDomainDescription, seed: int = 0, occurances: int = 100) -> List[Tuple[str, int]]:
+    """Occurances starting when the previous action ends, or one time unit later"""
+    r = random.Random(seed)
+    actions = sorted(domain._causes)
+    time, result = domain.time, []
+    for _ in range(occurances):
+        action = r.choice(actions)
+        result.append((action, time))
+        time += domain.durations.get(action, 1) + r.randint(0, 1)
+    return result
+
+
+def random_observations(domain: DomainDescription, seed: int = 0, observations: int = 0,
+                        horizon: int = 100) -> List[Tuple[Fluent, int]]:
+    r = random.Random(seed)
+    names = sorted(domain.fluents)
+    return [(Fluent(r.choice(names), r.random() < 0.5), r.randint(1, horizon)) for _ in range(observations)]
+
+
+def random_scenario(domain: TimeDomainDescription, seed: int = 0, occurances: int = 100,
+                    observations: int = 0) -> Scenario:
+    action_occurances = random_occurances(domain, seed, occurances)
+    horizon = action_occurances[-1][1] if action_occurances else domain.time
+    return Scenario(domain, random_observations(domain, seed, observations, horizon), action_occurances)
+
+
+def random_statements(domain: DomainDescription, seed: int = 0, statements: int = 100, length: int = 10,
+                      fluents: int = 2, shared: float = 0.0) -> List[Statement]:
+    """Statements of `length` actions, each starting with a prefix of an earlier one with probability `shared`"""
+    r = random.Random(seed)
+    actions, names = sorted(domain._causes), sorted(domain.fluents)
+    result = []
+    for _ in range(statements):
+        literals = _literals(r, names, fluents)
+        prefix = []
+        if result and shared and r.random() < shared:
+            earlier = r.choice(result).actions
+            prefix = earlier[:r.randint(0, len(earlier))]
+        result.append(Statement(literals, prefix + [r.choice(actions) for _ in range(length - len(prefix))]))
+    return result
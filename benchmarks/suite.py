@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import Callable, Dict, List, NamedTuple
+
+from benchmarks.generator import random_domain, random_occurances, random_scenario, random_statements
+from krr_system.domain import DomainDescription, Fluent
+from krr_system.events import execute
+from krr_system.scenario import Scenario
+from krr_system.structure import Structure
+
+
+class Case(NamedTuple):
+    name: str
+    params: Dict[str, int]
+    setup: Callable[..., Callable[[], object]]  # builds the workload, returns the timed call
+
+
+def _do_action(fluents, actions, rules, conditions, occurances):
+    domain = random_domain(0, fluents, actions, rules, conditions).compiled()
+    occurrences = random_occurances(domain, 1, occurances)
+
+    def run():
+        snapshot = domain.snapshot()
+        try:
+            for action, time in occurrences:
+                domain.do_action(action, time)
+        finally:
+            domain.restore(snapshot)
+    return run
+
+
+def _is_consistent(fluents, actions, rules, conditions, occurances):
+    domain = random_domain(0, fluents, actions, rules, conditions).compiled()
+    occurrences = random_occurances(domain, 1, occurances)
+    # a new Scenario every time, as it keeps the timeline it simulated
+    return lambda: Scenario(domain, [], occurrences).is_consistent()
+
+
+def _is_consistent_indexed(fluents, actions, rules, conditions, occurances):
+    domain = random_domain(0, fluents, actions, rules, conditions).compile(incremental=True)
+    occurrences = random_occurances(domain, 1, occurances)
+    return lambda: Scenario(domain, [], occurrences).is_consistent()
+
+
+def _execute(fluents, actions, rules, conditions, occurances):
+    domain = random_domain(0, fluents, actions, rules, conditions).compiled()
+    occurrences = random_occurances(domain, 1, occurances)
+    return lambda: execute(domain, occurrences)
+
+
+def _check_if_condition_hold(fluents, actions, rules, conditions, occurances):
+    domain = random_domain(0, fluents, actions, rules, conditions).compiled()
+    scenario = random_scenario(domain, 1, occurances)
+    queries = [([Fluent(f"f{i % fluents}", True)], time) for i, (_, time) in enumerate(scenario.action_occurances)]
+
+    def run():
+        fresh = Scenario(domain, [], scenario.action_occurances)
+        for query, time in queries:
+            fresh.check_if_condition_hold(query, time)
+    return run
+
+
+def _is_statement_true(fluents, actions, rules, conditions, statements, length, shared=0):
+    domain = random_domain(0, fluents, actions, rules, conditions, cls=DomainDescription).compiled()
+    statement_list = random_statements(domain, 1, statements, length, shared=shared / 100)
+
+    def run():
+        structure = Structure(domain)
+        for statement in statement_list:
+            structure.is_statement_true(statement)
+    return run
+
+
+def _check_statements(fluents, actions, rules, conditions, statements, length, shared=0):
+    domain = random_domain(0, fluents, actions, rules, conditions, cls=DomainDescription).compiled()
+    statement_list = random_statements(domain, 1, statements, length, shared=shared / 100)
+    return lambda: Structure(domain).check_statements(statement_list)
+
+
+def cases(quick: bool = False) -> List[Case]:
+    """Every benchmark over a grid of sizes, smaller ones only if quick"""
+    sizes = [16, 64] if quick else [16, 64, 256]
+    lengths = [100, 1000] if quick else [100, 1000, 10000]
+    result = []
+    for fluents in sizes:
+        for occurances in lengths:
+            params = dict(fluents=fluents, actions=10, rules=4, conditions=2, occurances=occurances)
+            result.append(Case("do_action", params, _do_action))
+            result.append(Case("is_consistent", params, _is_consistent))
+            result.append(Case("execute", params, _execute))
+            result.append(Case("check_if_condition_hold", params, _check_if_condition_hold))
+        for rules in ([32] if quick else [32, 128]):
+            params = dict(fluents=fluents, actions=10, rules=rules, conditions=2, occurances=1000)
+            result.append(Case("is_consistent", params, _is_consistent))
+            result.append(Case("is_consistent_indexed", params, _is_consistent_indexed))
+        params = dict(fluents=fluents, actions=10, rules=4, conditions=2, statements=200, length=20)
+        result.append(Case("is_statement_true", params, _is_statement_true))
+        result.append(Case("check_statements", params, _check_statements))
+        # percent of the statements extending a prefix of an earlier one
+        params = dict(fluents=fluents, actions=10, rules=4, conditions=2, statements=200, length=20, shared=90)
+        result.append(Case("is_statement_true", params, _is_statement_true))
+        result.append(Case("check_statements", params, _check_statements))
+    return result
+
+
+def key(name: str, params: Dict[str, int]) -> str:
+    return name + "[" + ",".join(f"{k}={v}" for k, v in params.items()) + "]"
+
+
+def measure(run: Callable[[], object], repeat: int, min_time: float) -> Dict[str, float]:
+    """Best time of a call over repeat rounds, each round calling it enough times to last min_time"""
+    number, elapsed = 1, 0.0
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed * 10 > min_time else 10
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        best = min(best, (time.perf_counter() - start) / number)
+    return dict(seconds=best, number=number, repeat=repeat)
+
+
+def run_cases(selected: List[Case], repeat: int = 3, min_time: float = 0.2, log=None) -> dict:
+    results = []
+    for case in selected:
+        timing = measure(case.setup(**case.params), repeat, min_time)
+        results.append(dict(name=case.name, params=case.params, key=key(case.name, case.params), **timing))
+        if log is not None:
+            print(f"{results[-1]['key']:<90} {timing['seconds'] * 1e3:10.3f} ms", file=log)
+    return dict(python=platform.python_version(), machine=platform.machine(), results=results)
+
+
+def compare(results: dict, baseline: dict, threshold: float, log) -> List[str]:
+    """Keys of the benchmarks slower than threshold times their baseline"""
+    before = {result["key"]: result["seconds"] for result in baseline["results"]}
+    slower = []
+    for result in results["results"]:
+        if result["key"] not in before:
+            continue
+        ratio = result["seconds"] / before[result["key"]]
+        flag = ratio > threshold
+        if flag:
+            slower.append(result["key"])
+        print(f"{result['key']:<90} {ratio:6.2f}x{'  REGRESSION' if flag else ''}", file=log)
+    return slower
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Times the reasoning engine.")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes only")
+    parser.add_argument("--filter", default="", help="run benchmarks whose key contains this text")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds every round lasts at least")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="slowdown against the baseline counted as a regression")
+    args = parser.parse_args(argv)
+
+    selected = [case for case in cases(args.quick) if args.filter in key(case.name, case.params)]
+    results = run_cases(selected, args.repeat, args.min_time, log=sys.stderr)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=1)
+    else:
+        json.dump(results, sys.stdout, indent=1)
+        print()
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if compare(results, baseline, args.threshold, sys.stderr):
+            return 1
+    return 0
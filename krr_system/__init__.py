@@ -1,3 +1,4 @@
 from .domain import DomainDescription, TimeDomainDescription, Fluent
 from .scenario import Scenario
 from .structure import Structure, Statement
+from .state import BitState
@@ -0,0 +1,3 @@
+from krr_system.cli import main
+
+main()
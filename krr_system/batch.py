@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from krr_system.domain import TimeDomainDescription
+from krr_system.state import Condition, Effect
+from krr_system.utils import FALSE, TRUE, UNKNOWN, fuzzy_all, fuzzy_and_array, fuzzy_eq_array, fuzzy_not_array
+
+
+class BatchResult(NamedTuple):
+    consistent: np.ndarray  # (K,) bool
+    states: np.ndarray  # (K, F) int8 of TRUE, FALSE, UNKNOWN, the state when the scenario ended or broke
+    names: List[str]  # fluent of every column
+
+
+class _Condition(NamedTuple):
+    columns: np.ndarray
+    required: np.ndarray
+    conflict: np.ndarray
+    vague: bool
+    never: bool
+
+
+class _Effect(NamedTuple):
+    columns: np.ndarray
+    targets: np.ndarray  # UNKNOWN for released fluents
+
+
+class _Action(NamedTuple):
+    rules: Tuple[Tuple[_Condition, _Effect], ...]
+    impossibles: Tuple[_Condition, ...]
+    duration: int
+
+
+def _bits(mask: int) -> List[int]:
+    bits = []
+    while mask:
+        low = mask & -mask
+        bits.append(low.bit_length() - 1)
+        mask ^= low
+    return bits
+
+
+def _condition(condition: Condition) -> _Condition:
+    columns = _bits(condition.mask & ~condition.conflict)
+    required = [TRUE if condition.bits >> c & 1 else FALSE for c in columns]
+    return _Condition(np.array(columns, dtype=np.intp), np.array(required, dtype=np.int8),
+                      np.array(_bits(condition.conflict), dtype=np.intp), condition.vague, condition.never)
+
+
+def _effect(effect: Effect) -> _Effect:
+    columns = _bits(effect.mask | effect.release)
+    targets = [UNKNOWN if effect.release >> c & 1 else TRUE if effect.bits >> c & 1 else FALSE for c in columns]
+    return _Effect(np.array(columns, dtype=np.intp), np.array(targets, dtype=np.int8))
+
+
+def _check(states: np.ndarray, condition: _Condition) -> np.ndarray:
+    """Row-wise DomainDescription._check, TRUE/FALSE/UNKNOWN per row"""
+    if condition.never:
+        return np.full(len(states), FALSE, dtype=np.int8)
+    met = fuzzy_all(fuzzy_eq_array(states[:, condition.columns], condition.required), axis=1)
+    if len(condition.conflict):
+        # a fluent required to be both True and False
+        conflict = states[:, condition.conflict]
+        met = fuzzy_and_array(met, fuzzy_all(fuzzy_and_array(conflict, fuzzy_not_array(conflict)), axis=1))
+    if condition.vague:
+        met = fuzzy_and_array(met, UNKNOWN)
+    return met
+
+
+def _compile(domain: TimeDomainDescription) -> Dict[str, _Action]:
+    domain.compiled()
+    return {action: _Action(tuple((_condition(c), _effect(e)) for c, e in table.rules),
+                            tuple(_condition(c) for c in table.impossibles),
+                            domain.durations.get(action, 1))
+            for action, table in domain._table.items()}
+
+
+def initial_states(domain: TimeDomainDescription, count: int) -> np.ndarray:
+    state = domain.compact().fluents
+    row = np.array([TRUE if state.value >> i & 1 else FALSE if state.known >> i & 1 else UNKNOWN
+                    for i in range(len(state))], dtype=np.int8)
+    return np.tile(row, (count, 1))
+
+
+def simulate_batch(domain: TimeDomainDescription,
+                   action_occurances: Sequence[Sequence[Tuple[str, int]]]) -> BatchResult:
+    """
+    Runs many occurance lists over one domain at once, as Scenario.is_consistent would run each of them.
+    At every step the scenarios are grouped by the action they perform and each group
+    is checked and updated with array operations.
+    """
+    domain = domain.fork()  # compiling would switch the caller's domain to compact mode
+    actions = _compile(domain)
+    names = list(domain.fluents.names)
+    codes = {action: i for i, action in enumerate(actions)}
+    tables = list(actions.values())
+
+    count = len(action_occurances)
+    length = max((len(occurances) for occurances in action_occurances), default=0)
+    steps = np.full((count, length), -1, dtype=np.int32)
+    times = np.zeros((count, length), dtype=np.int64)
+    for k, occurances in enumerate(action_occurances):
+        for step, (action, time) in enumerate(occurances):
+            # unknown actions raise a KeyError, as they do in do_action
+            steps[k, step] = codes[action]
+            times[k, step] = time
+
+    states = initial_states(domain, count)
+    clock = np.full(count, domain.time, dtype=np.int64)
+    consistent = np.ones(count, dtype=bool)
+
+    for step in range(length):
+        running = consistent & (steps[:, step] >= 0)
+        early = running & (times[:, step] < clock)
+        consistent &= ~early
+        running &= ~early
+
+        for code in np.unique(steps[running, step]):
+            rows = np.flatnonzero(running & (steps[:, step] == code))
+            table = tables[code]
+            group = states[rows]
+
+            unsure = np.zeros(len(rows), dtype=bool)
+            impossible = np.zeros(len(rows), dtype=bool)
+            for clause in table.impossibles:
+                met = _check(group, clause)
+                impossible |= met == TRUE
+                unsure |= met == UNKNOWN
+            if impossible.any():
+                consistent[rows[impossible]] = False
+                rows, group, unsure = rows[~impossible], group[~impossible], unsure[~impossible]
+
+            clock[rows] += table.duration
+            for condition, effect in table.rules:
+                met = _check(group, condition)
+                certain = (met == TRUE) & ~unsure
+                uncertain = (met != FALSE) & ~certain
+                if not len(effect.columns):
+                    continue
+                current = group[:, effect.columns]
+                stay = (effect.targets != UNKNOWN) & (current == effect.targets)
+                group[:, effect.columns] = np.where(certain[:, None], effect.targets,
+                                                    np.where(uncertain[:, None] & ~stay, UNKNOWN, current))
+            states[rows] = group
+
+    return BatchResult(consistent, states, names)
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, List, Tuple
+
+from krr_system.domain import Fluent, TimeDomainDescription
+from krr_system.inference import observations_by_time
+from krr_system.state import Condition, Effect
+
+FALSE, TRUE = 0, 1
+
+
+class BDD:
+    """
+    Reduced ordered binary decision diagrams over a fixed number of variables,
+    variable i being tested before variable i + 1. Nodes are integers, 0 and 1 are the terminals.
+    """
+
+    def __init__(self, count: int):
+        self.count = count
+        self.nodes: List[Tuple[int, int, int]] = [(count, FALSE, FALSE), (count, TRUE, TRUE)]
+        self.unique: Dict[Tuple[int, int, int], int] = dict()
+        self.cache: Dict[tuple, int] = dict()
+
+    def node(self, var: int, low: int, high: int) -> int:
+        if low == high:
+            return low
+        key = (var, low, high)
+        u = self.unique.get(key)
+        if u is None:
+            u = self.unique[key] = len(self.nodes)
+            self.nodes.append(key)
+        return u
+
+    def cube(self, mask: int, bits: int) -> int:
+        """Conjunction of the variables in mask, negated where bits are not set"""
+        u = TRUE
+        for var in range(mask.bit_length() - 1, -1, -1):
+            if mask >> var & 1:
+                u = self.node(var, FALSE, u) if bits >> var & 1 else self.node(var, u, FALSE)
+        return u
+
+    def not_(self, u: int) -> int:
+        if u <= TRUE:
+            return 1 - u
+        key = ("not", u)
+        if key not in self.cache:
+            var, low, high = self.nodes[u]
+            self.cache[key] = self.node(var, self.not_(low), self.not_(high))
+        return self.cache[key]
+
+    def and_(self, u: int, v: int) -> int:
+        if u == FALSE or v == FALSE:
+            return FALSE
+        if u == TRUE or u == v:
+            return v
+        if v == TRUE:
+            return u
+        key = ("and", min(u, v), max(u, v))
+        if key not in self.cache:
+            self.cache[key] = self._split(self.and_, u, v)
+        return self.cache[key]
+
+    def or_(self, u: int, v: int) -> int:
+        if u == TRUE or v == TRUE:
+            return TRUE
+        if u == FALSE or u == v:
+            return v
+        if v == FALSE:
+            return u
+        key = ("or", min(u, v), max(u, v))
+        if key not in self.cache:
+            self.cache[key] = self._split(self.or_, u, v)
+        return self.cache[key]
+
+    def _split(self, op, u: int, v: int) -> int:
+        u_var, u_low, u_high = self.nodes[u]
+        v_var, v_low, v_high = self.nodes[v]
+        var = min(u_var, v_var)
+        if u_var != var:
+            u_low = u_high = u
+        if v_var != var:
+            v_low = v_high = v
+        return self.node(var, op(u_low, v_low), op(u_high, v_high))
+
+    def exists(self, u: int, mask: int) -> int:
+        """Quantifies the variables in mask away"""
+        if u <= TRUE or not mask >> self.nodes[u][0]:
+            return u
+        key = ("exists", u, mask)
+        if key not in self.cache:
+            var, low, high = self.nodes[u]
+            low, high = self.exists(low, mask), self.exists(high, mask)
+            self.cache[key] = self.or_(low, high) if mask >> var & 1 else self.node(var, low, high)
+        return self.cache[key]
+
+    def restrict(self, u: int, mask: int, bits: int) -> int:
+        """Cofactor fixing the variables in mask to bits"""
+        if u <= TRUE or not mask >> self.nodes[u][0]:
+            return u
+        key = ("restrict", u, mask, bits)
+        if key not in self.cache:
+            var, low, high = self.nodes[u]
+            if mask >> var & 1:
+                self.cache[key] = self.restrict(high if bits >> var & 1 else low, mask, bits)
+            else:
+                self.cache[key] = self.node(var, self.restrict(low, mask, bits), self.restrict(high, mask, bits))
+        return self.cache[key]
+
+
+class SymbolicScenario:
+    """
+    Scenario evaluated exactly over all of its models: sets of two-valued states are BDDs
+    over the domain's fluents, actions are image operations and released or unknown fluents
+    take every value instead of becoming None. Observations restrict the models.
+    """
+
+    def __init__(self, domain: TimeDomainDescription, observations, action_occurances):
+        self.domain = domain.compiled()
+        self.action_occurances = tuple(tuple(occurance) for occurance in action_occurances)
+        self.horizon = list(accumulate((time for _, time in self.action_occurances), max))
+        state = self.domain.fluents
+        self.bdd = BDD(len(state))
+
+        # constraints of the observations on the state after each number of occurances
+        self.observed = [TRUE] * (len(self.action_occurances) + 1)
+        for fluents, time in observations_by_time(observations):
+            count = bisect_right(self.horizon, time)
+            self.observed[count] = self.bdd.and_(self.observed[count], self.condition(state.condition(fluents)))
+
+        self._models: List[int] | None = None
+
+    def condition(self, condition: Condition) -> int:
+        if condition.never or condition.conflict:
+            return FALSE
+        return self.bdd.cube(condition.mask, condition.bits)
+
+    def _fire(self, states: int, effect: Effect) -> int:
+        bdd = self.bdd
+        return bdd.and_(bdd.exists(states, effect.mask | effect.release), bdd.cube(effect.mask, effect.bits))
+
+    def _unfire(self, states: int, effect: Effect) -> int:
+        """States from which firing the effect leads into states"""
+        bdd = self.bdd
+        return bdd.exists(bdd.restrict(states, effect.mask, effect.bits), effect.release)
+
+    def _image(self, states: int, action: str) -> int:
+        bdd = self.bdd
+        table = self.domain._table[action]
+        for clause in table.impossibles:
+            if not clause.vague:
+                states = bdd.and_(states, bdd.not_(self.condition(clause)))
+        for condition, effect in table.rules:
+            met = self.condition(condition)
+            fired = self._fire(bdd.and_(states, met), effect)
+            # a condition on a None value may or may not hold
+            kept = states if condition.vague else bdd.and_(states, bdd.not_(met))
+            states = bdd.or_(fired, kept)
+        return states
+
+    def _preimage(self, states: int, action: str) -> int:
+        bdd = self.bdd
+        table = self.domain._table[action]
+        for condition, effect in reversed(table.rules):
+            met = self.condition(condition)
+            fired = bdd.and_(met, self._unfire(states, effect))
+            kept = states if condition.vague else bdd.and_(bdd.not_(met), states)
+            states = bdd.or_(fired, kept)
+        for clause in table.impossibles:
+            if not clause.vague:
+                states = bdd.and_(states, bdd.not_(self.condition(clause)))
+        return states
+
+    def models(self) -> List[int]:
+        """For every number of occurances, the states it leaves in runs of the whole scenario"""
+        if self._models is not None:
+            return self._models
+        bdd = self.bdd
+        state = self.domain.fluents
+        count = len(self.action_occurances)
+
+        forward = [bdd.and_(bdd.cube(state.known, state.value), self.observed[0])]
+        clock = self.domain.time
+        for step, (action, time) in enumerate(self.action_occurances):
+            if time < clock:
+                self._models = [FALSE] * (count + 1)
+                return self._models
+            clock += self.domain.durations.get(action, 1)
+            forward.append(bdd.and_(self._image(forward[-1], action), self.observed[step + 1]))
+
+        backward = [TRUE] * (count + 1)
+        for step in range(count - 1, -1, -1):
+            action = self.action_occurances[step][0]
+            backward[step] = self._preimage(bdd.and_(backward[step + 1], self.observed[step + 1]), action)
+        self._models = [bdd.and_(f, b) for f, b in zip(forward, backward)]
+        return self._models
+
+    def is_consistent(self) -> bool:
+        return self.models()[-1] != FALSE
+
+    def does_action_perform(self, action: str, time: int) -> bool:
+        return self.is_consistent() and (action, time) in self.action_occurances
+
+    def check_if_condition_hold(self, conditions: List[Fluent] | Fluent, after_time: int) -> bool | None:
+        """True if the conditions hold in every model, None if only in some, False if in none"""
+        if isinstance(conditions, Fluent):
+            conditions = [conditions]
+        bdd = self.bdd
+        models = self.models()[bisect_right(self.horizon, after_time)]
+        condition = self.domain.fluents.condition(conditions)
+        met = self.condition(condition)
+        if bdd.and_(models, met) == FALSE:
+            return False
+        if condition.vague or bdd.and_(models, bdd.not_(met)) != FALSE:
+            return None
+        return True
@@ -0,0 +1,239 @@
+"""
+Binary format: a header, a table of sections and the sections themselves, each starting
+at a multiple of 8 bytes and holding a little-endian array, so a memory-mapped file can
+be read section by section without decoding the rest.
+"""
+from __future__ import annotations
+
+import mmap
+import struct
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from krr_system.domain import Fluent, TimeDomainDescription
+from krr_system.inference import observations_by_time
+from krr_system.scenario import Scenario
+from krr_system.utils import FALSE, TRUE, UNKNOWN
+
+MAGIC = b"KRRD"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sII")  # magic, version, number of sections
+_ENTRY = struct.Struct("<4sQQ")  # tag, offset, length in bytes
+
+META = np.dtype([("time", "<i8"), ("termination_time", "<f8"), ("state", "<i4"), ("compact", "<i4")])
+# one record per causes/releases rule and per impossibility, in the order they were added;
+# conditions is -1 for a rule given without conditions
+RULE = np.dtype([("action", "<i4"), ("impossible", "<i4"), ("literals", "<i8"), ("effects", "<i4"),
+                 ("conditions", "<i4")])
+LITERAL = np.dtype([("fluent", "<i4"), ("value", "i1")])
+DURATION = np.dtype([("duration", "<i8"), ("known", "<i8")])
+SCENARIO = np.dtype([("occurances", "<i8"), ("occurance_count", "<i8"), ("observations", "<i8"),
+                     ("observation_count", "<i8"), ("assumed", "<i8"), ("assumed_count", "<i8")])
+# observations are literals[literals:literals + count], observed at time
+OBSERVATION = np.dtype([("literals", "<i8"), ("count", "<i8"), ("time", "<i8")])
+SECTIONS = {
+    b"META": META, b"FOFF": np.dtype("<i8"), b"FNAM": np.dtype("u1"), b"AOFF": np.dtype("<i8"),
+    b"ANAM": np.dtype("u1"), b"STAT": np.dtype("i1"), b"RULE": RULE, b"LITS": LITERAL, b"DURA": DURATION,
+    b"SCEN": SCENARIO, b"OCCA": np.dtype("<i4"), b"OCCT": np.dtype("<i8"), b"OBSV": OBSERVATION,
+}
+
+
+def _code(value: bool | None) -> int:
+    return UNKNOWN if value is None else TRUE if value else FALSE
+
+
+def _value(code: int) -> bool | None:
+    return None if code == UNKNOWN else code == TRUE
+
+
+class _Names:
+
+    def __init__(self):
+        self.index: Dict[str, int] = dict()
+
+    def __call__(self, name: str) -> int:
+        return self.index.setdefault(name, len(self.index))
+
+    def sections(self) -> Tuple[np.ndarray, np.ndarray]:
+        encoded = [name.encode() for name in self.index]
+        offsets = np.zeros(len(encoded) + 1, dtype="<i8")
+        np.cumsum([len(name) for name in encoded], out=offsets[1:])
+        return offsets, np.frombuffer(b"".join(encoded), dtype="u1")
+
+
+def _strings(offsets: np.ndarray, blob: np.ndarray) -> List[str]:
+    data = blob.tobytes()
+    bounds = offsets.tolist()
+    return [data[start:end].decode() for start, end in zip(bounds, bounds[1:])]
+
+
+def dumps(domain: TimeDomainDescription, scenarios: Sequence[Scenario] = ()) -> bytes:
+    """Encodes the domain, its current state included, and scenarios run on it"""
+    fluents, actions = _Names(), _Names()
+    state = [domain.fluents[name].value for name in domain.fluents]
+    for name in domain.fluents:
+        fluents(name)
+
+    rules, literals = [], []
+
+    def add(action: str, impossible: bool, effects, conditions):
+        rules.append((actions(action), impossible, len(literals), len(effects),
+                      -1 if conditions is None else len(conditions)))
+        literals.extend((fluents(f.name), _code(f.value)) for f in effects)
+        literals.extend((fluents(f.name), _code(f.value)) for f in conditions or ())
+
+    for action, causes in domain._causes.items():
+        for effects, conditions in causes:
+            add(action, False, effects, conditions)
+    for action, clauses in domain.impossibles.items():
+        for conditions in clauses:
+            add(action, True, (), conditions)
+    for action in domain.durations:
+        actions(action)
+
+    records, occurance_actions, occurance_times, observations = [], [], [], []
+    for scenario in scenarios:
+        groups = observations_by_time(scenario.observations)
+        assumed = [Fluent(name, value) for name, value in scenario._assumed.items()]
+        records.append((len(occurance_actions), len(scenario.action_occurances),
+                        len(observations), len(groups), len(literals), len(assumed)))
+        literals.extend((fluents(f.name), _code(f.value)) for f in assumed)
+        for action, time in scenario.action_occurances:
+            occurance_actions.append(actions(action))
+            occurance_times.append(time)
+        for group, time in groups:
+            observations.append((len(literals), len(group), time))
+            literals.extend((fluents(f.name), _code(f.value)) for f in group)
+
+    durations = [(domain.durations.get(action, 0), action in domain.durations) for action in actions.index]
+    fluent_offsets, fluent_names = fluents.sections()
+    action_offsets, action_names = actions.sections()
+    sections = {
+        b"META": np.array([(domain.time, domain.termination_time, len(state), not isinstance(domain.fluents, dict))],
+                          dtype=META),
+        b"FOFF": fluent_offsets, b"FNAM": fluent_names, b"AOFF": action_offsets, b"ANAM": action_names,
+        b"STAT": np.array([_code(value) for value in state], dtype="i1"),
+        b"RULE": np.array(rules, dtype=RULE), b"LITS": np.array(literals, dtype=LITERAL),
+        b"DURA": np.array(durations, dtype=DURATION), b"SCEN": np.array(records, dtype=SCENARIO),
+        b"OCCA": np.array(occurance_actions, dtype="<i4"), b"OCCT": np.array(occurance_times, dtype="<i8"),
+        b"OBSV": np.array(observations, dtype=OBSERVATION),
+    }
+
+    offset = _HEADER.size + _ENTRY.size * len(sections)
+    table, chunks = [], []
+    for tag, array in sections.items():
+        offset += -offset % 8
+        data = array.tobytes()
+        table.append(_ENTRY.pack(tag, offset, len(data)))
+        chunks.append(data)
+        offset += len(data)
+    out = bytearray(_HEADER.pack(MAGIC, VERSION, len(sections)) + b"".join(table))
+    for data in chunks:
+        out += bytes(-len(out) % 8)
+        out += data
+    return bytes(out)
+
+
+def save(path: str, domain: TimeDomainDescription, scenarios: Sequence[Scenario] = ()):
+    with open(path, "wb") as file:
+        file.write(dumps(domain, scenarios))
+
+
+class DomainFile:
+    """
+    Encoded domain over a buffer or a memory-mapped file. Sections are NumPy views into
+    the buffer, so e.g. occurances can be read without building the domain.
+    """
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        magic, version, count = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("not a krr_system domain file")
+        if version != VERSION:
+            raise ValueError(f"unsupported domain file version {version}, expected {VERSION}")
+        self.sections: Dict[bytes, Tuple[int, int]] = dict()
+        for i in range(count):
+            tag, offset, length = _ENTRY.unpack_from(buffer, _HEADER.size + i * _ENTRY.size)
+            self.sections[tag] = offset, length
+        self._decoded: List[Fluent] | None = None
+
+    @classmethod
+    def open(cls, path: str) -> DomainFile:
+        with open(path, "rb") as file:
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def section(self, tag: bytes) -> np.ndarray:
+        offset, length = self.sections[tag]
+        dtype = SECTIONS[tag]
+        return np.frombuffer(self.buffer, dtype=dtype, count=length // dtype.itemsize, offset=offset)
+
+    def fluent_names(self) -> List[str]:
+        return _strings(self.section(b"FOFF"), self.section(b"FNAM"))
+
+    def action_names(self) -> List[str]:
+        return _strings(self.section(b"AOFF"), self.section(b"ANAM"))
+
+    def occurances(self, scenario: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Action indices into action_names() and start times of a scenario's occurances"""
+        record = self.section(b"SCEN")[scenario]
+        start, stop = record["occurances"], record["occurances"] + record["occurance_count"]
+        return self.section(b"OCCA")[start:stop], self.section(b"OCCT")[start:stop]
+
+    def _literals(self) -> List[Fluent]:
+        if self._decoded is None:
+            # every (fluent, value) pair once, as Fluent interns them anyway
+            pool = [Fluent(name, value) for name in self.fluent_names() for value in (False, None, True)]
+            literals = self.section(b"LITS")
+            codes = literals["fluent"].astype(np.int64) * 3 + literals["value"] + 1
+            self._decoded = [pool[code] for code in codes.tolist()]
+        return self._decoded
+
+    def domain(self) -> TimeDomainDescription:
+        names, actions, literals = self.fluent_names(), self.action_names(), self._literals()
+        time, termination_time, count, compact = self.section(b"META")[0].tolist()
+        domain = TimeDomainDescription()
+        for name, value in zip(names[:count], self.section(b"STAT").tolist()):
+            domain.fluents[name] = Fluent(name, _value(value))
+        for action, impossible, start, effects, conditions in self.section(b"RULE").tolist():
+            conditions = None if conditions < 0 else literals[start + effects:start + effects + conditions]
+            if impossible:
+                domain.impossibles.setdefault(actions[action], []).append(conditions)
+            else:
+                domain._add_action(actions[action], literals[start:start + effects], conditions)
+        for action, (duration, known) in zip(actions, self.section(b"DURA").tolist()):
+            if known:
+                domain.durations[action] = duration
+        domain.time = time
+        domain.termination_time = int(termination_time) if termination_time.is_integer() else termination_time
+        return domain.compact() if compact else domain
+
+    def scenarios(self, domain: TimeDomainDescription | None = None) -> List[Scenario]:
+        """Scenarios of the file, all run on domain, decoded from this file by default"""
+        if domain is None:
+            domain = self.domain()
+        actions, literals = self.action_names(), self._literals()
+        observations = self.section(b"OBSV").tolist()
+        scenarios = []
+        for i, (_, _, first, count, assumed, assumed_count) in enumerate(self.section(b"SCEN").tolist()):
+            codes, times = self.occurances(i)
+            scenario = Scenario(domain, [(literals[start:start + length], time)
+                                         for start, length, time in observations[first:first + count]],
+                                [(actions[code], time) for code, time in zip(codes.tolist(), times.tolist())])
+            scenario._assumed = {f.name: f.value for f in literals[assumed:assumed + assumed_count]}
+            scenarios.append(scenario)
+        return scenarios
+
+
+def loads(data: bytes) -> Tuple[TimeDomainDescription, List[Scenario]]:
+    file = DomainFile(data)
+    domain = file.domain()
+    return domain, file.scenarios(domain)
+
+
+def load(path: str) -> Tuple[TimeDomainDescription, List[Scenario]]:
+    file = DomainFile.open(path)
+    domain = file.domain()
+    return domain, file.scenarios(domain)
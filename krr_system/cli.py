@@ -0,0 +1,136 @@
+"""
+Headless query runner, `python -m krr_system DOMAIN [QUERIES] [--workers N]`.
+
+DOMAIN is a text domain (see krr_system.language) or a binary one (see krr_system.binary).
+QUERIES is a JSONL file, stdin by default, with one query per line:
+
+    {"id": 1, "query": "consistency"}
+    {"id": 2, "query": "action", "action": "shoot", "time": 3}
+    {"id": 3, "query": "condition", "fluents": {"alive": false}, "time": 4}
+
+Queries run on the scenario of the domain file, or its "scenario"-th one for binary files,
+unless they give their own "occurrences": [["load", 1], ...] and "observations": [[{"alive": true}, 2], ...].
+Initially unknown fluents take the values the observations force, and if no execution
+of the scenario agrees with its observations every query about it answers false.
+Results are JSON lines {"id": ..., "result": true | false | null} or {"id": ..., "error": "..."},
+one per query and in the order of the queries, each scenario answered in one pass over its occurrences.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Dict, List, TextIO, Tuple
+
+from krr_system import binary, language
+from krr_system.domain import Fluent, TimeDomainDescription
+from krr_system.parallel import QueryBatch, run_query_batches
+from krr_system.scenario import Scenario
+
+
+def read_domain(path: str) -> Tuple[TimeDomainDescription, List[Scenario]]:
+    with open(path, "rb") as file:
+        magic = file.read(len(binary.MAGIC))
+    if magic == binary.MAGIC:
+        return binary.load(path)
+    description = language.load_file(path)
+    return description.domain, [Scenario(*description)]
+
+
+def _fluents(fluents: Dict[str, bool | None]) -> List[Fluent]:
+    return [Fluent(name, value) for name, value in fluents.items()]
+
+
+class _Group:
+    """Queries of one scenario, and where their answers go"""
+
+    def __init__(self, observations, action_occurances, assumed):
+        self.batch = QueryBatch(observations, action_occurances, assumed, [], [])
+        # position in the output, kind, index into the batch's queries
+        self.answers: List[Tuple[int, str, int]] = []
+
+
+def _group_key(query: dict):
+    if "occurrences" in query or "observations" in query:
+        return "inline", json.dumps([query.get("occurrences", []), query.get("observations", [])])
+    return "file", int(query.get("scenario", 0))
+
+
+def _new_group(key, query: dict, scenarios: List[Scenario]) -> _Group:
+    if key[0] == "inline":
+        observations = [(_fluents(fluents), time) for fluents, time in query.get("observations", [])]
+        occurances = [(action, time) for action, time in query.get("occurrences", [])]
+        return _Group(observations, occurances, None)
+    scenario = scenarios[key[1]]
+    return _Group(scenario.observations, list(scenario.action_occurances),
+                  scenario._assumed if scenario._assumed or not scenario.observations else None)
+
+
+def run(domain: TimeDomainDescription, scenarios: List[Scenario], queries: TextIO, out: TextIO, workers: int = 1):
+    groups: Dict[object, _Group] = dict()
+    results: List[dict] = []  # one per query, in their order
+
+    for number, line in enumerate(queries, 1):
+        if not line.strip():
+            continue
+        results.append({"id": number})
+        try:
+            query = json.loads(line)
+            results[-1]["id"] = query.get("id", number)
+            key = _group_key(query)
+            if key not in groups:
+                groups[key] = _new_group(key, query, scenarios)
+            group = groups[key]
+            kind = query.get("query", "consistency")
+            if kind == "action":
+                group.batch.actions.append((query["action"], int(query["time"])))
+                group.answers.append((len(results) - 1, kind, len(group.batch.actions) - 1))
+            elif kind == "condition":
+                group.batch.conditions.append((_fluents(query["fluents"]), int(query["time"])))
+                group.answers.append((len(results) - 1, kind, len(group.batch.conditions) - 1))
+            elif kind == "consistency":
+                group.answers.append((len(results) - 1, kind, 0))
+            else:
+                raise ValueError(f"unknown query {kind!r}")
+        except (ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+            results[-1]["error"] = f"line {number}: {type(e).__name__}: {e}"
+
+    answers = run_query_batches(domain, (group.batch for group in groups.values()), workers)
+    for group, answer in zip(groups.values(), answers):
+        for position, kind, i in group.answers:
+            if isinstance(answer, str):
+                results[position]["error"] = answer
+            else:
+                consistent, holds, performs = answer
+                results[position]["result"] = (consistent if kind == "consistency" else holds[i]
+                                               if kind == "condition" else performs[i])
+    for result in results:
+        out.write(json.dumps(result) + "\n")
+    out.flush()
+
+
+def _workers(text: str) -> int:
+    try:
+        workers = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a number of workers: {text!r}")
+    if workers < 1:
+        raise argparse.ArgumentTypeError(f"needs at least one worker, got {workers}")
+    return workers
+
+
+def main(argv: List[str] | None = None):
+    parser = argparse.ArgumentParser(prog="python -m krr_system", description="Answers JSONL queries about a domain.")
+    parser.add_argument("domain", help="text or binary domain file")
+    parser.add_argument("queries", nargs="?", default="-", help="JSONL query file, - for stdin")
+    parser.add_argument("--workers", type=_workers, default=1, help="processes answering scenarios in parallel")
+    args = parser.parse_args(argv)
+    try:
+        domain, scenarios = read_domain(args.domain)
+    except (OSError, ValueError) as e:
+        parser.error(f"can not read {args.domain}: {e}")
+    if args.queries == "-":
+        run(domain, scenarios, sys.stdin, sys.stdout, args.workers)
+    else:
+        with open(args.queries) as queries:
+            run(domain, scenarios, queries, sys.stdout, args.workers)
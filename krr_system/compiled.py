@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from typing import Dict, List, NamedTuple, Tuple
+
+from krr_system.state import BitState, Condition, Effect, apply, check
+
+ALWAYS = Condition(0, 0)
+
+
+class Rule(NamedTuple):
+    condition: Condition
+    effect: Effect
+
+
+class ActionTable(NamedTuple):
+    """Rules of a single action, in the order they are applied, and its impossibility clauses"""
+    rules: Tuple[Rule, ...]
+    impossibles: Tuple[Condition, ...]
+
+
+def covers(general: Condition, specific: Condition) -> bool:
+    """True if `specific` is never more satisfied than `general`, in the order False < None < True"""
+    if specific.never:
+        return True
+    if general.never:
+        return False
+    return (general.mask & ~specific.mask == 0
+            and (general.bits ^ specific.bits) & general.mask == 0
+            and general.conflict & ~specific.conflict == 0
+            and (specific.vague or not general.vague))
+
+
+def compile_rules(state: BitState, causes) -> Tuple[Rule, ...]:
+    """
+    Rules are applied one after another, so only a rule that directly follows a rule
+    with the same effect and a covering condition is dropped, as it can not change the state
+    """
+    rules: List[Rule] = []
+    for to_set, conditions in causes:
+        rule = Rule(state.condition(conditions) if conditions else ALWAYS, state.effect(to_set))
+        if rules and rules[-1].effect == rule.effect and covers(rules[-1].condition, rule.condition):
+            continue
+        rules.append(rule)
+    return tuple(rules)
+
+
+def compile_impossibles(state: BitState, impossibles) -> Tuple[Condition, ...]:
+    """Any clause being True makes the action impossible, so clauses covered by another one are dropped"""
+    clauses: List[Condition] = []
+    for conditions in impossibles:
+        clause = state.condition(conditions) if conditions else ALWAYS
+        if clause.never or any(covers(c, clause) for c in clauses):
+            continue
+        clauses = [c for c in clauses if not covers(clause, c)]
+        clauses.append(clause)
+    return tuple(clauses)
+
+
+def compile_domain(domain) -> Dict[str, ActionTable]:
+    state: BitState = domain.fluents
+    return {action: ActionTable(compile_rules(state, causes), compile_impossibles(state, domain.impossibles.get(action, ())))
+            for action, causes in domain._causes.items()}
+
+
+def check_possible(known: int, value: int, table: ActionTable) -> bool | None:
+    """Mask counterpart of DomainDescription._possible"""
+    result = True
+    for clause in table.impossibles:
+        met = check(known, value, clause)
+        if met is True:
+            return False
+        if met is None:
+            result = None
+    return result
+
+
+def run_rules(known: int, value: int, table: ActionTable, possible: bool | None) -> Tuple[int, int]:
+    """Mask counterpart of applying every DomainDescription._do of an action"""
+    for condition, effect in table.rules:
+        met = check(known, value, condition)
+        if met is False:
+            continue
+        known, value = apply(known, value, effect, met is True and possible is True)
+    return known, value
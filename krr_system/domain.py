@@ -3,41 +3,25 @@ from __future__ import annotations
 from copy import copy, deepcopy
 from typing import List, Tuple, Dict
 
-from krr_system.utils import fuzzy_eq, fuzzy_and
-
-
-class Fluent:
-    def __init__(self, **fluents):
-        for name, value in fluents.items():
-            assert (isinstance(name, str))
-            self.name = name
-            self.value = value
-            break  # only the first value is processed
-
-    # for if statements
-    def __bool__(self):
-        return self.value
-
-    # for ==, != comparisons
-    def __eq__(self, other):
-        if isinstance(other, bool) or other is None:
-            return fuzzy_eq(self.value, other)
-        elif isinstance(other, Fluent):
-            return fuzzy_and(fuzzy_eq(self.value, other.value), self.name == other.name)
-        else:
-            return False
-
-    def __repr__(self):
-        return f"{self.name}={self.value}"
+from krr_system.compiled import ActionTable, check_possible, compile_domain, run_rules
+from krr_system.fluent import Fluent
+from krr_system.index import RuleIndex
+from krr_system.state import BitState, Condition
 
 
 class DomainDescription:
 
-    def __init__(self):
+    def __init__(self, compact: bool = False):
 
-        self.fluents: Dict[str, Fluent] = dict()
+        self.fluents: Dict[str, Fluent] | BitState = BitState() if compact else dict()
         self._causes: Dict[str, List[Tuple[List[Fluent], List[Fluent]]]] = dict()
         self.impossibles: Dict[str, List[List[Fluent]]] = dict()
+        self._table: Dict[str, ActionTable] | None = None
+        self._index: RuleIndex | None = None
+        self._incremental = False  # see compile
+        # encoded _check conditions by state size, as the encoding changes only when a fluent is added
+        self._conditions: Dict[Tuple[int, Tuple[Fluent, ...]], Condition] = dict()
+        self._version = 0
 
     def __repr__(self):
         return self.description()
@@ -67,14 +51,76 @@ class DomainDescription:
     def copy(self):
         return deepcopy(self)
 
+    def fork(self):
+        """
+        Compiled copy with its own state and rules, leaving this domain as it is.
+        A compiled domain shares its tables with the fork, as they never change,
+        so forking it does not copy every rule the way copy does.
+        """
+        if self._table is None:
+            return self.copy().compiled()
+        fork = copy(self)
+        fork.fluents = self.fluents.copy()
+        # the fork may add other fluents under the same state sizes
+        fork._conditions = dict(self._conditions)
+        fork._causes = {action: list(causes) for action, causes in self._causes.items()}
+        fork.impossibles = {action: list(clauses) for action, clauses in self.impossibles.items()}
+        if self._index is not None:
+            fork._index = RuleIndex(fork._table)
+        return fork
+
+    def _changed(self):
+        """Drops the compiled table and lets dependent caches know the description changed"""
+        self._table = None
+        self._index = None
+        self._version += 1
+
+    def snapshot(self):
+        """Copies only the mutable state, never the rules"""
+        if isinstance(self.fluents, BitState):
+            return self.fluents.known, self.fluents.value
+        return dict(self.fluents)
+
+    def restore(self, snapshot):
+        """Rolls the state back to a snapshot taken on this domain"""
+        if isinstance(snapshot, dict):
+            self.fluents = dict(snapshot)
+        else:
+            self.fluents.known, self.fluents.value = snapshot
+
+    def compact(self):
+        """Switches the state to BitState, so that checks and effects become mask operations"""
+        if not isinstance(self.fluents, BitState):
+            self.fluents = BitState(self.fluents)
+            self._conditions.clear()
+        return self
+
+    def compile(self, incremental: bool | None = None):
+        """
+        Freezes the rules into per action mask tables that do_action runs against,
+        until the domain description is changed again.
+        incremental=True also indexes the rules by fluent, see RuleIndex, for domains with
+        many rules per action; the choice is kept for later compilations.
+        """
+        if incremental is not None:
+            self._incremental = incremental
+        self.compact()
+        self._table = compile_domain(self)
+        self._index = RuleIndex(self._table) if self._incremental else None
+        return self
+
+    def compiled(self):
+        """Compiles the domain unless its table is still up to date"""
+        if self._table is None:
+            self.compile()
+        return self
+
     def _check_if_known(self, fluents: List[Fluent], default_value=None):
         if isinstance(fluents, Fluent):
             fluents = [fluents]
         for fluent in fluents:
             if fluent.name not in self.fluents:
-                assumed_fluent = copy(fluent)
-                assumed_fluent.value = default_value
-                self.fluents[fluent.name] = assumed_fluent
+                self.fluents[fluent.name] = Fluent(fluent.name, default_value)
 
     def _set(self, fluents: List[Fluent] | Fluent):
         if isinstance(fluents, Fluent):
@@ -86,6 +132,12 @@ class DomainDescription:
         """Checks a single list of fluent requirements"""
         if conditions is None:
             return True
+        if isinstance(self.fluents, BitState):
+            key = (len(self.fluents), tuple(conditions))
+            condition = self._conditions.get(key)
+            if condition is None:
+                condition = self._conditions[key] = self.fluents.condition(conditions)
+            return self.fluents.check(condition)
 
         conditions_met = []
         for f in conditions:
@@ -102,6 +154,10 @@ class DomainDescription:
 
     def _possible(self, action: str) -> bool | None:
         """Checks a list of lists of fluent requirements"""
+        if self._index is not None and action in self._table:
+            return self._index.possible(action, self.fluents.known, self.fluents.value)
+        if self._table is not None and action in self._table:
+            return check_possible(self.fluents.known, self.fluents.value, self._table[action])
         if action not in self.impossibles:
             return True
 
@@ -122,6 +178,10 @@ class DomainDescription:
         if conditions_met is False:
             return False
 
+        if isinstance(self.fluents, BitState):
+            self.fluents.apply(self.fluents.effect(fluents), not (conditions_met is None or possible is None))
+            return
+
         # at this stage both possible and conditions_met are either None or True
         diff: List[Fluent] = []
         for fluent in fluents:
@@ -130,18 +190,28 @@ class DomainDescription:
                 diff.append(fluent)
 
         if conditions_met is None or possible is None:
-            diff = [copy(f) for f in diff]
-            for fluent in diff:
-                fluent.value = None
+            diff = [Fluent(f.name, None) for f in diff]
         self._set(diff)
 
+    def _apply(self, action_name: str, possible: bool | None):
+        if self._index is not None:
+            state: BitState = self.fluents
+            state.known, state.value = self._index.run(action_name, state.known, state.value, possible)
+            return
+        if self._table is not None:
+            state: BitState = self.fluents
+            state.known, state.value = run_rules(state.known, state.value, self._table[action_name], possible)
+            return
+
+        for to_set, conditions in self._causes[action_name]:
+            self._do(to_set, self._check(conditions), possible)
+
     def do_action(self, action_name: str, *args, **kwargs):
         possible = self._possible(action_name)
         if possible is False:
             return False
 
-        for to_set, conditions in self._causes[action_name]:
-            self._do(to_set, self._check(conditions), possible)
+        self._apply(action_name, possible)
         return True
 
     def _add_action(self, action_name: str, fluents: List[Fluent] | Fluent, conditions: List[Fluent] | Fluent | None):
@@ -152,10 +222,12 @@ class DomainDescription:
         self._causes[action_name].append((fluents, conditions))
 
     def initially(self, **kwargs):
+        self._changed()
         for key, value in kwargs.items():
-            self.fluents[key] = Fluent(**{key: value})
+            self.fluents[key] = Fluent(key, value)
 
     def impossible(self, action: str, conditions: List[Fluent] | Fluent):
+        self._changed()
         if isinstance(conditions, Fluent):
             conditions = [conditions]
         if action not in self.impossibles:
@@ -164,6 +236,7 @@ class DomainDescription:
         self.impossibles[action].append(conditions)
 
     def causes(self, action: str, fluents: List[Fluent] | Fluent, conditions: List[Fluent] | Fluent | None = None):
+        self._changed()
         if isinstance(fluents, Fluent):
             fluents = [fluents]
         if isinstance(conditions, Fluent):
@@ -173,13 +246,13 @@ class DomainDescription:
         self._add_action(action, fluents, conditions)
 
     def releases(self, action: str, fluents: List[Fluent] | Fluent, conditions: List[Fluent] | Fluent | None = None):
+        self._changed()
         if isinstance(fluents, Fluent):
             fluents = [fluents]
         if isinstance(conditions, Fluent):
             conditions = [conditions]
 
-        for fluent in fluents:
-            fluent.value = None
+        fluents = [Fluent(fluent.name, None) for fluent in fluents]
 
         self._check_if_known(fluents)
         self._add_action(action, fluents, conditions)
@@ -187,8 +260,8 @@ class DomainDescription:
 
 class TimeDomainDescription(DomainDescription):
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, compact: bool = False):
+        super().__init__(compact)
         self.durations: Dict[str, int] = dict()
         self.time = 1
         self.termination_time = float('inf')
@@ -217,10 +290,24 @@ class TimeDomainDescription(DomainDescription):
                     repr += f"\n          under conditions: {conditions}"
         return repr
 
+    def fork(self):
+        fork = super().fork()
+        fork.durations = dict(fork.durations)
+        return fork
+
+    def snapshot(self):
+        return super().snapshot(), self.time
+
+    def restore(self, snapshot):
+        state, self.time = snapshot
+        super().restore(state)
+
     def duration(self, action, time):
+        self._changed()
         self.durations[action] = time
 
     def terminate_time(self, time):
+        self._changed()
         self.termination_time = time
 
     def make_time_step(self, action):
@@ -250,6 +337,5 @@ class TimeDomainDescription(DomainDescription):
             return False
 
         self.make_time_step(action_name)
-        for to_set, conditions in self._causes[action_name]:
-            self._do(to_set, self._check(conditions), possible)
+        self._apply(action_name, possible)
         return True
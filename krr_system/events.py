@@ -0,0 +1,140 @@
+"""
+Discrete-event execution of durative actions that may overlap. An occurance of an action
+lasting d that starts at time s checks whether it is possible and evaluates its rules at s,
+in the state every action ended by s left, and its effects take place at s + d. Occurances
+starting at the same time start in the order they are given, after the actions ending then.
+
+Actions running at the same time conflict if they set a fluent to different values,
+which breaks consistency just like an impossible action does. Effects of a running
+action are not visible to actions starting before it ends.
+
+Occurances that each start when the previous one ends give the same state and consistency
+as TimeDomainDescription.do_action run one after another.
+"""
+from __future__ import annotations
+
+from heapq import heappop, heappush
+from typing import Dict, List, NamedTuple, Sequence, Set, Tuple
+
+from krr_system.compiled import ActionTable, check_possible
+from krr_system.domain import TimeDomainDescription
+from krr_system.state import apply, check
+
+
+class Execution(NamedTuple):
+    consistent: bool
+    failed: int | None  # index of the occurance that broke consistency
+    conflicting: int | None  # index of the running occurance it conflicts with, if that is why
+    known: int  # state once every started action ended, as BitState masks
+    value: int
+    time: int  # when the last action ended
+
+
+class _Running(NamedTuple):
+    occurance: int
+    written: int  # fluents the action sets when it ends
+    known: int  # their values then
+    value: int
+
+
+def _effect(known: int, value: int, table: ActionTable, possible: bool | None) -> Tuple[int, int, int]:
+    """
+    Fluents an action sets when run in a state and the values they get, as in run_rules;
+    written are the fluents of every rule whose condition is not False
+    """
+    written = 0
+    for condition, rule_effect in table.rules:
+        met = check(known, value, condition)
+        if met is False:
+            continue
+        known, value = apply(known, value, rule_effect, met is True and possible is True)
+        written |= rule_effect.mask | rule_effect.release
+    return written, known & written, value & written
+
+
+def _relevant(table: ActionTable) -> int:
+    """Fluents whose values decide whether an action is possible and what it sets"""
+    mask = 0
+    for clause in table.impossibles:
+        mask |= clause.mask | clause.conflict
+    for condition, rule_effect in table.rules:
+        mask |= condition.mask | condition.conflict | rule_effect.mask | rule_effect.release
+    return mask
+
+
+def execute(domain: TimeDomainDescription, action_occurances: Sequence[Tuple[str, int]]) -> Execution:
+    """
+    Runs the occurances from the domain's state, stopping at the first one that is impossible,
+    starts before the domain's time or conflicts with a running action. Starts are sorted once
+    and ends wait in a heap, so it takes O(n log n) in the number of occurances, plus the
+    fluents every action sets.
+    """
+    domain = domain.fork()
+    tables = domain._table
+    masks = {name: _relevant(table) for name, table in tables.items()}
+    # (action, relevant known, relevant value) -> possible, written, target known, target value
+    outcomes: Dict[Tuple[str, int, int], Tuple[bool | None, int, int, int]] = dict()
+    known, value = domain.fluents.known, domain.fluents.value
+    time = domain.time
+
+    starts = [start for _, start in action_occurances]
+    ends: List[Tuple[int, int]] = []  # heap of (end, occurance) of the running actions
+    running: Dict[int, _Running] = dict()
+    # per fluent bit: running actions that set it, all to the same value
+    writers: Dict[int, Set[int]] = dict()
+    pending = 0  # fluents some running action sets
+
+    def end():
+        nonlocal known, value, pending, time
+        time, i = heappop(ends)
+        action = running.pop(i)
+        known = (known & ~action.written) | action.known
+        value = (value & ~action.written) | action.value
+        bits = action.written
+        while bits:
+            bit = bits & -bits
+            bits ^= bit
+            others = writers[bit]
+            others.discard(i)
+            if not others:
+                del writers[bit]
+                pending ^= bit
+
+    # a stable sort keeps occurances starting together in the order they were given
+    for i in sorted(range(len(starts)), key=starts.__getitem__):
+        at = starts[i]
+        while ends and ends[0][0] <= at:
+            end()
+        if at < domain.time:
+            return Execution(False, i, None, known, value, time)
+        name = action_occurances[i][0]
+        mask = masks[name]
+        key = (name, known & mask, value & mask)
+        outcome = outcomes.get(key)
+        if outcome is None:
+            possible = check_possible(known, value, tables[name])
+            outcome = outcomes[key] = (possible, *_effect(known, value, tables[name], possible))
+        possible, written, target_known, target_value = outcome
+        if possible is False:
+            return Execution(False, i, None, known, value, time)
+
+        shared = written & pending
+        while shared:
+            bit = shared & -shared
+            shared ^= bit
+            other = running[next(iter(writers[bit]))]
+            if (other.known ^ target_known) & bit or (other.value ^ target_value) & bit:
+                return Execution(False, i, other.occurance, known, value, time)
+
+        running[i] = _Running(i, written, target_known, target_value)
+        bits = written
+        while bits:
+            bit = bits & -bits
+            bits ^= bit
+            writers.setdefault(bit, set()).add(i)
+        pending |= written
+        heappush(ends, (at + domain.durations.get(name, 1), i))
+
+    while ends:
+        end()
+    return Execution(True, None, None, known, value, time)
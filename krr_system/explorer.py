@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from array import array
+from heapq import heappop, heappush
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from krr_system.compiled import check_possible, run_rules
+from krr_system.domain import DomainDescription, Fluent
+
+
+class StateGraph:
+    """
+    Reachable transition system of a domain. States are numbered in BFS order, state 0 being
+    the initial one, and the edges of state i are targets[offsets[i]:offsets[i + 1]],
+    performed by actions[labels[...]] taking durations[labels[...]].
+    """
+
+    def __init__(self, names: List[str], actions: List[str], durations: np.ndarray, time: int,
+                 keys: List[int], offsets: np.ndarray, targets: np.ndarray, labels: np.ndarray, complete: bool):
+        self.names = names
+        self.actions = actions
+        self.durations = durations
+        self.time = time  # time the first action may start at
+        # a state is known << len(names) | value
+        self.keys = keys
+        self.offsets = offsets
+        self.targets = targets
+        self.labels = labels
+        self.complete = complete  # False if the state budget cut the exploration short
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _masks(self, i: int) -> Tuple[int, int]:
+        key = self.keys[i]
+        return key >> len(self.names), key & ((1 << len(self.names)) - 1)
+
+    def state(self, i: int) -> List[Tuple[str, bool | None]]:
+        known, value = self._masks(i)
+        return [(name, bool(value >> bit & 1) if known >> bit & 1 else None) for bit, name in enumerate(self.names)]
+
+    def edges(self, i: int):
+        for edge in range(self.offsets[i], self.offsets[i + 1]):
+            yield self.actions[self.labels[edge]], int(self.targets[edge])
+
+    def reachable(self, source: int = 0) -> np.ndarray:
+        """Mask of the states reachable from source"""
+        seen = np.zeros(len(self), dtype=bool)
+        seen[source] = True
+        frontier = np.array([source])
+        while len(frontier):
+            # edges of the whole frontier at once
+            starts = self.offsets[frontier]
+            lengths = self.offsets[frontier + 1] - starts
+            edges = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+            frontier = np.unique(self.targets[edges])
+            frontier = frontier[~seen[frontier]]
+            seen[frontier] = True
+        return seen
+
+    def _goal(self, goal: List[Fluent] | Fluent):
+        if isinstance(goal, Fluent):
+            goal = [goal]
+        index = {name: bit for bit, name in enumerate(self.names)}
+        condition = []
+        for f in goal:
+            if f.name not in index:
+                return None
+            condition.append((1 << index[f.name], f.value))
+        return condition
+
+    def _holds(self, i: int, condition) -> bool | None:
+        known, value = self._masks(i)
+        met = True
+        for bit, required in condition:
+            if required is None or not known & bit:
+                met = None
+            elif bool(value & bit) != bool(required):
+                return False
+        return met
+
+    def can_hold(self, goal: List[Fluent] | Fluent, source: int = 0) -> bool | None:
+        """True if the goal necessarily holds in some reachable state, None if it only may hold"""
+        condition = self._goal(goal)
+        if condition is None:
+            return False
+        result = False
+        for i in np.flatnonzero(self.reachable(source)):
+            met = self._holds(i, condition)
+            if met is True:
+                return True
+            if met is None:
+                result = None
+        return result
+
+    def shortest_path(self, goal: List[Fluent] | Fluent, source: int = 0) -> List[Tuple[str, int]] | None:
+        """Occurances with the smallest total duration leading from source to a state where the goal holds"""
+        time = self.time
+        condition = self._goal(goal)
+        if condition is None:
+            return None
+        durations = self.durations.tolist()
+        best: Dict[int, int] = {source: 0}
+        parents: Dict[int, Tuple[int, int]] = dict()
+        queue = [(0, source)]
+        while queue:
+            cost, i = heappop(queue)
+            if cost > best[i]:
+                continue
+            if self._holds(i, condition) is True:
+                edges = []
+                while i in parents:
+                    i, edge = parents[i]
+                    edges.append(edge)
+                occurances = []
+                for edge in reversed(edges):
+                    occurances.append((self.actions[self.labels[edge]], time))
+                    time += int(self.durations[self.labels[edge]])
+                return occurances
+            first = int(self.offsets[i])
+            for edge, (j, label) in enumerate(zip(self.targets[first:self.offsets[i + 1]].tolist(),
+                                                  self.labels[first:self.offsets[i + 1]].tolist()), first):
+                next_cost = cost + durations[label]
+                if next_cost < best.get(j, float('inf')):
+                    best[j] = next_cost
+                    parents[j] = (i, edge)
+                    heappush(queue, (next_cost, j))
+        return None
+
+
+def explore(domain: DomainDescription, max_states: int = 1_000_000) -> StateGraph:
+    """
+    Breadth-first exploration of every state reachable from the domain's state with actions
+    that are not impossible, deduplicating states by their masks
+    """
+    domain = domain.fork()
+    state = domain.fluents
+    width = len(state)
+    low = (1 << width) - 1
+    actions = list(domain._table)
+    tables = [domain._table[action] for action in actions]
+    durations = np.array([getattr(domain, "durations", {}).get(action, 1) for action in actions], dtype=np.int64)
+
+    start = state.known << width | state.value
+    ids: Dict[int, int] = {start: 0}
+    keys = [start]
+    offsets, targets, labels = array("q", [0]), array("i"), array("i")
+    complete = True
+
+    for key in keys:  # grows while iterating, in BFS order
+        known, value = key >> width, key & low
+        for label, table in enumerate(tables):
+            possible = check_possible(known, value, table)
+            if possible is False:
+                continue
+            next_known, next_value = run_rules(known, value, table, possible)
+            next_key = next_known << width | next_value
+            j = ids.get(next_key)
+            if j is None:
+                if len(keys) >= max_states:
+                    complete = False
+                    continue
+                j = ids[next_key] = len(keys)
+                keys.append(next_key)
+            targets.append(j)
+            labels.append(label)
+        offsets.append(len(targets))
+
+    return StateGraph(list(state.names), actions, durations, getattr(domain, "time", 1), keys,
+                      np.frombuffer(offsets, dtype=np.int64), np.frombuffer(targets, dtype=np.int32),
+                      np.frombuffer(labels, dtype=np.int32), complete)
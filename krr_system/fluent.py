@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from typing import Tuple
+from weakref import WeakValueDictionary
+
+from krr_system.utils import fuzzy_eq, fuzzy_and
+
+
+class Fluent:
+    """
+    Interned (name, value) pair: each pair exists once, so equal fluents are the same object.
+    Created either as Fluent(alive=True) or Fluent("alive", True), and never changed afterwards.
+    """
+    __slots__ = ("name", "value", "__weakref__")
+
+    # a pair is dropped once nothing refers to it any more
+    _pool: WeakValueDictionary[Tuple[str, bool | None], Fluent] = WeakValueDictionary()
+
+    def __new__(cls, *args, **fluents):
+        if args:
+            name, value = args
+        else:
+            for name, value in fluents.items():
+                break  # only the first value is processed
+        # 1 and True are the same key, so the first spelling would be the one every later lookup gets
+        value = None if value is None else bool(value)
+        fluent = cls._pool.get((name, value))
+        if fluent is None:
+            assert (isinstance(name, str))
+            fluent = object.__new__(cls)
+            object.__setattr__(fluent, "name", name)
+            object.__setattr__(fluent, "value", value)
+            fluent = cls._pool.setdefault((name, value), fluent)
+        return fluent
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Fluent is immutable, create Fluent(name, value) instead")
+
+    def __reduce__(self):
+        return self.__class__, (self.name, self.value)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __hash__(self):
+        return hash((self.name, self.value))
+
+    # for if statements
+    def __bool__(self):
+        return self.value
+
+    # for ==, != comparisons
+    def __eq__(self, other):
+        if other is self:
+            return fuzzy_eq(self.value, self.value)
+        if isinstance(other, bool) or other is None:
+            return fuzzy_eq(self.value, other)
+        elif isinstance(other, Fluent):
+            return fuzzy_and(fuzzy_eq(self.value, other.value), self.name == other.name)
+        else:
+            return False
+
+    def __repr__(self):
+        return f"{self.name}={self.value}"
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from bisect import bisect_right, insort
+from typing import Dict, List, Sequence, Tuple
+
+from krr_system.compiled import ActionTable
+from krr_system.state import Condition, apply, check
+
+
+def _watchers(conditions: Sequence[Condition]) -> Dict[int, List[int]]:
+    """Fluent bit -> positions of the conditions mentioning it"""
+    watch: Dict[int, List[int]] = dict()
+    for position, condition in enumerate(conditions):
+        mask = condition.mask
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            watch.setdefault(bit, []).append(position)
+    return watch
+
+
+class _ActionIndex:
+    """Cached results of the conditions of one action, for the state they were last checked in"""
+
+    def __init__(self, table: ActionTable, known: int, value: int):
+        self.effects = [effect for _, effect in table.rules]
+        self.conditions = [condition for condition, _ in table.rules]
+        self.clauses = table.impossibles
+        self._rule_watch = _watchers(self.conditions)
+        self._clause_watch = _watchers(self.clauses)
+        # past this many changed fluents rechecking every condition is cheaper
+        self._limit = (len(self.conditions) + len(self.clauses)) * len(self._rule_watch) // max(
+            1, sum(map(len, self._rule_watch.values())) + sum(map(len, self._clause_watch.values())))
+        self.check_all(known, value)
+
+    def check_all(self, known: int, value: int):
+        self.known, self.value = known, value
+        self.met = [check(known, value, condition) for condition in self.conditions]
+        self.live = [position for position, met in enumerate(self.met) if met is not False]
+        self.blocked = [check(known, value, clause) for clause in self.clauses]
+        self.impossible = self.blocked.count(True)  # clauses that are True
+        self.doubtful = self.blocked.count(None)  # clauses that are None
+
+    def refresh(self, known: int, value: int):
+        """Rechecks only the conditions on fluents changed since the last check"""
+        changed = (self.known ^ known) | (self.value ^ value)
+        if not changed:
+            return
+        if bin(changed).count("1") > self._limit:
+            self.check_all(known, value)
+            return
+        self.known, self.value = known, value
+        rules, clauses = set(), set()
+        while changed:
+            bit = changed & -changed
+            changed ^= bit
+            rules.update(self._rule_watch.get(bit, ()))
+            clauses.update(self._clause_watch.get(bit, ()))
+
+        for position in rules:
+            before, after = self.met[position], check(known, value, self.conditions[position])
+            if before is after:
+                continue
+            self.met[position] = after
+            if after is False:
+                self.live.pop(bisect_right(self.live, position) - 1)
+            elif before is False:
+                insort(self.live, position)
+        for position in clauses:
+            before, after = self.blocked[position], check(known, value, self.clauses[position])
+            self.blocked[position] = after
+            self.impossible += (after is True) - (before is True)
+            self.doubtful += (after is None) - (before is None)
+
+
+class RuleIndex:
+    """
+    Rule conditions and impossibility clauses of every action, indexed by the fluents they mention.
+    An action keeps the results of its conditions and rechecks only those on fluents that
+    changed since it last ran, so a step costs the size of the change, not the size of its rules.
+    An action is indexed the first time it is asked about, so building the index costs nothing
+    up front, however many rules the domain has. Gives the same answers as check_possible and run_rules.
+    """
+
+    def __init__(self, tables: Dict[str, ActionTable]):
+        self.tables = tables
+        self.actions: Dict[str, _ActionIndex] = dict()
+
+    def _index(self, action: str, known: int, value: int) -> _ActionIndex:
+        index = self.actions.get(action)
+        if index is None:
+            index = self.actions[action] = _ActionIndex(self.tables[action], known, value)
+        else:
+            index.refresh(known, value)
+        return index
+
+    def possible(self, action: str, known: int, value: int) -> bool | None:
+        """check_possible in a state"""
+        index = self._index(action, known, value)
+        if index.impossible:
+            return False
+        if index.doubtful:
+            return None
+        return True
+
+    def run(self, action: str, known: int, value: int, possible: bool | None) -> Tuple[int, int]:
+        """run_rules from a state, visiting only the rules whose condition is not False"""
+        index = self._index(action, known, value)
+        position = -1
+        while True:
+            live = index.live
+            i = bisect_right(live, position)
+            if i == len(live):
+                return known, value
+            position = live[i]
+            met = index.met[position]
+            known, value = apply(known, value, index.effects[position], met is True and possible is True)
+            # later rules see the effects of the earlier ones
+            index.refresh(known, value)
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+from krr_system.compiled import check_possible
+from krr_system.domain import Fluent, TimeDomainDescription
+from krr_system.state import Condition, apply, check
+
+
+class Inference(NamedTuple):
+    consistent: bool | None  # None if the observations could not be proven nor refuted
+    initial: Dict[str, bool]  # values of initially unknown fluents forced by the observations
+
+
+class _Operation(NamedTuple):
+    """Rule application that left a fluent unknown, with the state it was applied to"""
+    point: int
+    known: int
+    value: int
+    condition: Condition
+    met: bool | None
+    targets: int  # bits set to True by the rule
+    released: int  # bits set to None by the rule
+
+
+class _Frame(NamedTuple):
+    """State at the start of an occurance"""
+    point: int
+    known: int
+    value: int
+
+
+def observations_by_time(observations) -> List[Tuple[List[Fluent], int]]:
+    """Accepts a single (fluents, time) pair, as built in app.py, or a list of (fluent(s), time) pairs"""
+    if not observations:
+        return []
+    if len(observations) == 2 and isinstance(observations[1], int):
+        observations = [observations]
+    return [([fluents] if isinstance(fluents, Fluent) else list(fluents), time) for fluents, time in observations]
+
+
+def _literals(condition: Condition):
+    mask = condition.mask
+    while mask:
+        bit = mask & -mask
+        yield bit, bool(condition.bits & bit)
+        mask ^= bit
+
+
+def _unit(condition: Condition, known: int, value: int):
+    """The only literal that can still make a condition False, if there is exactly one"""
+    if condition.vague or condition.never or condition.conflict:
+        return None
+    if condition.mask & known & (value ^ condition.bits):
+        return None
+    unknown = condition.mask & ~known
+    if unknown & (unknown - 1):
+        return None
+    return unknown, not (condition.bits & unknown)
+
+
+class _Propagation:
+    """
+    Unit propagation of observations backwards along the occurance timeline.
+    The timeline is simulated forwards with the three-valued semantics; for every fluent
+    the history of operations that changed it or left it unknown is kept, so a required
+    value can be traced back to the initial state, through the rules that could have set it.
+    Every forward pass assigns at least one initial fluent or ends the propagation.
+    """
+
+    def __init__(self, domain: TimeDomainDescription, observations, action_occurances: Sequence[Tuple[str, int]]):
+        self.domain = domain.compiled()
+        self.occurances = list(action_occurances)
+        self.horizon = list(accumulate((time for _, time in self.occurances), max))
+        self.assigned: Dict[int, bool] = dict()
+        self.observations: List[Tuple[List[Tuple[int, bool]], int]] = []
+        self.broken = False
+        state = self.domain.fluents
+        for fluents, time in observations_by_time(observations):
+            literals = []
+            for f in fluents:
+                if f.name not in state:
+                    self.broken = True
+                elif f.value is not None:
+                    literals.append((1 << state.index[f.name], bool(f.value)))
+            self.observations.append((literals, time))
+
+    def simulate(self):
+        domain = self.domain
+        state = domain.fluents
+        known, value = state.known, state.value
+        for bit, v in self.assigned.items():
+            known |= bit
+            value = value | bit if v else value & ~bit
+        self.initial = known, value
+        self.history: Dict[int, Tuple[List[int], List[Tuple[bool, bool, _Operation]]]] = dict()
+        self.frames: List[_Frame] = []
+        self.unsure: List[Tuple[_Frame, Tuple[Condition, ...]]] = []
+        self.failed: int | None = None
+
+        point, clock = 0, domain.time
+        for step, (action, time) in enumerate(self.occurances):
+            frame = _Frame(point, known, value)
+            self.frames.append(frame)
+            table = domain._table[action]
+            possible = check_possible(known, value, table)
+            if time < clock or possible is False:
+                self.failed = step
+                return
+            if possible is None:
+                self.unsure.append((frame, table.impossibles))
+            clock += domain.durations.get(action, 1)
+
+            for condition, effect in table.rules:
+                met = check(known, value, condition)
+                if met is not False:
+                    certain = met is True and possible is True
+                    stay = effect.mask & known & ~(value ^ effect.bits)
+                    diff = (effect.mask | effect.release) & ~stay
+                    operation = _Operation(point, known, value, condition, met, effect.bits, effect.release)
+                    known, value = apply(known, value, effect, certain)
+                    while diff:
+                        bit = diff & -diff
+                        diff ^= bit
+                        points, entries = self.history.setdefault(bit, ([], []))
+                        points.append(point + 1)
+                        entries.append((bool(known & bit), bool(value & bit), operation))
+                point += 1
+        self.frames.append(_Frame(point, known, value))
+
+    def value_at(self, bit: int, point: int) -> Tuple[bool, bool, _Operation | None]:
+        points, entries = self.history.get(bit, ((), ()))
+        i = bisect_right(points, point) - 1
+        if i < 0:
+            known, value = self.initial
+            return bool(known & bit), bool(value & bit), None
+        return entries[i]
+
+    def require(self, bit: int, v: bool, point: int) -> bool:
+        """Propagates that a fluent has value v at a point, False on a contradiction"""
+        stack = [(bit, v, point)]
+        while stack:
+            bit, v, point = stack.pop()
+            known, value, operation = self.value_at(bit, point)
+            if known:
+                if value != v:
+                    return False
+                continue
+            if operation is None:
+                if self.assigned.setdefault(bit, v) != v:
+                    return False
+                self.progress = True
+                continue
+            if operation.released & bit:
+                # released fluents may take either value
+                continue
+
+            target = bool(operation.targets & bit)
+            if operation.met is True:
+                # the rule was unsure only because the action might be impossible,
+                # and a consistent scenario needs it to be possible
+                if target != v:
+                    return False
+                continue
+            if target == v:
+                before_known = operation.known & bit
+                if before_known and bool(operation.value & bit) != v and not (
+                        operation.condition.vague or operation.condition.conflict):
+                    # only the rule firing gives v, so all of its conditions held
+                    stack.extend((b, required, operation.point) for b, required in _literals(operation.condition))
+                continue
+            # the rule must not have fired and v was there before it
+            stack.append((bit, v, operation.point))
+            unit = _unit(operation.condition, operation.known, operation.value)
+            if unit is not None:
+                stack.append((*unit, operation.point))
+        return True
+
+    def propagate(self) -> bool:
+        """One forward pass and the requirements it gives, False on a contradiction"""
+        self.progress = False
+        self.simulate()
+        for literals, time in self.observations:
+            count = bisect_right(self.horizon, time)
+            if self.failed is not None and self.failed < count:
+                return False
+            point = self.frames[count].point
+            for bit, v in literals:
+                if not self.require(bit, v, point):
+                    return False
+        if self.failed is not None:
+            return False
+        for frame, clauses in self.unsure:
+            # every impossibility clause of an action that happens is False
+            for clause in clauses:
+                if check(frame.known, frame.value, clause) is None:
+                    unit = _unit(clause, frame.known, frame.value)
+                    if unit is not None and not self.require(*unit, frame.point):
+                        return False
+        return True
+
+    def holds(self) -> bool:
+        if self.failed is not None or self.unsure:
+            return False
+        for literals, time in self.observations:
+            frame = self.frames[bisect_right(self.horizon, time)]
+            for bit, v in literals:
+                if not frame.known & bit or bool(frame.value & bit) != v:
+                    return False
+        return True
+
+
+def infer(domain: TimeDomainDescription, observations, action_occurances: Sequence[Tuple[str, int]]) -> Inference:
+    """
+    Narrows down the unknown initial fluents with the observations.
+    The propagation is sound but not complete: a consistent result is True only if every
+    observation holds and every action is possible under the inferred initial values.
+    """
+    propagation = _Propagation(domain, observations, action_occurances)
+    consistent = not propagation.broken
+    while consistent:
+        consistent = propagation.propagate()
+        if not propagation.progress:
+            break
+
+    names = propagation.domain.fluents.names
+    initial = {names[bit.bit_length() - 1]: v for bit, v in propagation.assigned.items()}
+    if not consistent:
+        return Inference(False, initial)
+    return Inference(True if propagation.holds() else None, initial)
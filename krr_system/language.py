@@ -0,0 +1,201 @@
+"""
+Textual action description language, one statement per line:
+
+    initially alive, ¬loaded
+    load causes loaded, ¬jammed lasts 2
+    load releases hidden
+    shoot causes ¬alive if loaded, ¬hidden, ¬jammed
+    impossible paint if ¬inspired
+    shoot lasts 1
+    observed ¬alive at 4
+    load occurs at 1
+
+Negation is written as ¬, ~ or not, everything after # is a comment.
+"""
+from __future__ import annotations
+
+import re
+from typing import Iterable, Iterator, List, NamedTuple, Tuple
+
+from krr_system.domain import Fluent, TimeDomainDescription
+from krr_system.scenario import Scenario
+
+
+KEYWORDS = {"initially", "causes", "releases", "impossible", "if", "lasts", "observed", "occurs", "at", "not"}
+
+NEGATIONS = {"¬", "~", "not"}
+
+_TOKEN = re.compile(r"\w+|[,¬~]")
+_INVALID = re.compile(r"[^\w\s,¬~]")
+
+
+class ParseError(ValueError):
+
+    def __init__(self, line: int, message: str):
+        super().__init__(f"line {line}: {message}")
+        self.line = line
+
+
+class Sentence(NamedTuple):
+    """One parsed statement, number being the duration or the time it mentions"""
+    kind: str  # initially, causes, releases, impossible, lasts, observed or occurs
+    action: str | None
+    fluents: List[Fluent]
+    conditions: List[Fluent]
+    number: int | None
+    line: int
+
+
+class Description(NamedTuple):
+    domain: TimeDomainDescription
+    observations: List[Tuple[List[Fluent], int]]
+    action_occurances: List[Tuple[str, int]]
+
+
+def tokenize(text: str, line: int) -> List[str]:
+    text = text.partition("#")[0]
+    invalid = _INVALID.search(text)
+    if invalid is not None:
+        raise ParseError(line, f"unexpected character {invalid.group()!r}")
+    return _TOKEN.findall(text)
+
+
+class _Line:
+    """Cursor over the tokens of one statement"""
+
+    def __init__(self, tokens: List[str], line: int):
+        self.tokens = tokens
+        self.tokens.append(None)  # end of the line
+        self.line = line
+        self.position = 0
+
+    def peek(self) -> str | None:
+        return self.tokens[self.position]
+
+    def take(self, what: str) -> str:
+        text = self.peek()
+        if text is None:
+            raise ParseError(self.line, f"expected {what} at the end of the line")
+        self.position += 1
+        return text
+
+    def expect(self, expected: str):
+        if self.take(repr(expected)) != expected:
+            raise ParseError(self.line, f"expected {expected!r}, got {self.tokens[self.position - 1]!r}")
+
+    def accept(self, text: str) -> bool:
+        if self.peek() == text:
+            self.position += 1
+            return True
+        return False
+
+    def name(self, what: str) -> str:
+        text = self.take(what)
+        if text in KEYWORDS or not (text[0].isalpha() or text[0] == "_"):
+            raise ParseError(self.line, f"expected {what}, got {text!r}")
+        return text
+
+    def number(self, what: str) -> int:
+        text = self.take(what)
+        if not text.isdecimal():
+            raise ParseError(self.line, f"expected {what}, got {text!r}")
+        return int(text)
+
+    def literals(self) -> List[Fluent]:
+        fluents = []
+        while True:
+            value = self.peek() not in NEGATIONS
+            if not value:
+                self.position += 1
+            fluents.append(Fluent(self.name("a fluent"), value))
+            if not self.accept(","):
+                return fluents
+
+    def end(self):
+        if self.peek() is not None:
+            raise ParseError(self.line, f"unexpected {self.peek()!r}")
+
+
+def parse(source: str | Iterable[str]) -> Iterator[Sentence]:
+    """
+    Parses the text or the lines of a file one line at a time, so files of any size
+    are read with memory bounded by their longest line
+    """
+    if isinstance(source, str):
+        source = source.splitlines()
+    for number, text in enumerate(source, 1):
+        tokens = tokenize(text, number)
+        if not tokens:
+            continue
+        line = _Line(tokens, number)
+        first = line.peek()
+        action, fluents, conditions, value = None, [], [], None
+
+        if first in ("initially", "impossible", "observed"):
+            line.position += 1
+        if first == "initially":
+            kind, fluents = first, line.literals()
+        elif first == "impossible":
+            kind, action = first, line.name("an action")
+            if line.accept("if"):
+                conditions = line.literals()
+        elif first == "observed":
+            kind, fluents = first, line.literals()
+            line.expect("at")
+            value = line.number("a time")
+        else:
+            action = line.name("a statement")
+            kind = line.take("causes, releases, lasts, occurs or at")
+            if kind in ("causes", "releases"):
+                fluents = line.literals()
+                if line.accept("if"):
+                    conditions = line.literals()
+                if line.accept("lasts"):
+                    value = line.number("a duration")
+            elif kind == "lasts":
+                value = line.number("a duration")
+            elif kind in ("occurs", "at"):
+                if kind == "occurs":
+                    line.expect("at")
+                kind, value = "occurs", line.number("a time")
+            else:
+                raise ParseError(number, f"expected causes, releases, lasts, occurs or at, got {kind!r}")
+        line.end()
+        yield Sentence(kind, action, fluents, conditions, value, number)
+
+
+def load(source: str | Iterable[str], domain: TimeDomainDescription | None = None) -> Description:
+    """Adds the statements to domain, a new one by default, and collects observations and occurances"""
+    if domain is None:
+        domain = TimeDomainDescription()
+    observations: List[Tuple[List[Fluent], int]] = []
+    action_occurances: List[Tuple[str, int]] = []
+    for sentence in parse(source):
+        kind = sentence.kind
+        if kind == "initially":
+            domain.initially(**{f.name: f.value for f in sentence.fluents})
+        elif kind == "causes":
+            domain.causes(sentence.action, sentence.fluents, conditions=sentence.conditions or None)
+        elif kind == "releases":
+            domain.releases(sentence.action, sentence.fluents, conditions=sentence.conditions or None)
+        elif kind == "impossible":
+            domain.impossible(sentence.action, conditions=sentence.conditions)
+        elif kind == "observed":
+            observations.append((sentence.fluents, sentence.number))
+        elif kind == "occurs":
+            action_occurances.append((sentence.action, sentence.number))
+        if kind in ("causes", "releases", "lasts") and sentence.number is not None:
+            if sentence.number < 1:
+                raise ParseError(sentence.line, "durations have to be positive")
+            domain.duration(sentence.action, sentence.number)
+    return Description(domain, observations, action_occurances)
+
+
+def load_file(path: str, domain: TimeDomainDescription | None = None) -> Description:
+    with open(path, encoding="utf-8") as file:
+        return load(file, domain)
+
+
+def load_scenario(source: str | Iterable[str], domain: TimeDomainDescription | None = None) -> Scenario:
+    description = load(source, domain)
+    return Scenario(description.domain, description.observations, description.action_occurances)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Sequence, Tuple
+
+from krr_system.domain import DomainDescription, Fluent, TimeDomainDescription
+from krr_system.scenario import Scenario
+from krr_system.structure import Statement, Structure
+
+# domain of the worker process, sent once by the pool initializer
+_domain: DomainDescription | None = None
+
+
+def _init(domain: DomainDescription):
+    global _domain
+    _domain = domain.compiled()
+
+
+def _consistent(action_occurances: Sequence[Tuple[str, int]]) -> bool:
+    return Scenario(_domain, [], action_occurances).is_consistent()
+
+
+def _statement(statement: Statement) -> bool | None:
+    return Structure(_domain).is_statement_true(statement)
+
+
+class QueryBatch(NamedTuple):
+    """Queries of one scenario, answered in a single pass over its occurances"""
+    observations: list
+    action_occurances: List[Tuple[str, int]]
+    assumed: Dict[str, bool] | None  # see Scenario.set_observations_as_true, None to infer it from the observations
+    conditions: List[Tuple[List[Fluent], int]]
+    actions: List[Tuple[str, int]]
+
+
+def _batch(batch: QueryBatch) -> Tuple[bool, List[bool | None], List[bool]] | str:
+    try:
+        scenario = Scenario(_domain, batch.observations, batch.action_occurances)
+        if batch.assumed is None:
+            if scenario.set_observations_as_true() is False:
+                # observations no execution of the scenario agrees with
+                return False, [False] * len(batch.conditions), [False] * len(batch.actions)
+        else:
+            scenario._assumed = dict(batch.assumed)
+        holds, performs = scenario.query_many(batch.conditions, batch.actions)
+        return scenario.is_consistent(), holds, performs
+    except Exception as e:
+        # e.g. an occurance of an unknown action, reported for the batch only
+        return f"{type(e).__name__}: {e}"
+
+
+def _map(domain: DomainDescription, task: Callable, items: Iterable, workers: int | None, chunksize: int | None) -> list:
+    items = list(items)
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        # a few chunks per worker keeps them busy without paying per item overhead
+        chunksize = max(1, len(items) // (workers * 4))
+    # a compiled fork of the domain is pickled once per worker, tasks carry only their own occurances or statement
+    with ProcessPoolExecutor(workers, initializer=_init, initargs=(domain.fork(),)) as pool:
+        return list(pool.map(task, items, chunksize=chunksize))
+
+
+def run_scenarios(domain: TimeDomainDescription, action_occurances: Iterable[Sequence[Tuple[str, int]]],
+                  workers: int | None = None, chunksize: int | None = None) -> List[bool]:
+    """Consistency of every occurance list over one domain, in the order of the lists"""
+    return _map(domain, _consistent, action_occurances, workers, chunksize)
+
+
+def run_statements(domain: DomainDescription, statements: Iterable[Statement],
+                   workers: int | None = None, chunksize: int | None = None) -> List[bool | None]:
+    """Structure.is_statement_true for every statement over one domain, in the order of the statements"""
+    return _map(domain, _statement, statements, workers, chunksize)
+
+
+def run_query_batches(domain: TimeDomainDescription, batches: Iterable[QueryBatch], workers: int | None = 1,
+                      chunksize: int = 1) -> Iterator[Tuple[bool, List[bool | None], List[bool]] | str]:
+    """
+    Consistency and query_many answers of every batch, yielded in the order of the batches
+    as soon as they are ready, or the error message of a batch that could not be run
+    """
+    if workers == 1:
+        _init(domain.fork())
+        yield from map(_batch, batches)
+        return
+    with ProcessPoolExecutor(workers, initializer=_init, initargs=(domain.fork(),)) as pool:
+        yield from pool.map(_batch, batches, chunksize=chunksize)
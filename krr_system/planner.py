@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from heapq import heappop, heappush
+from itertools import count
+from typing import Dict, List, Tuple
+
+from krr_system.compiled import check_possible, run_rules
+from krr_system.domain import Fluent, TimeDomainDescription
+from krr_system.state import check
+
+
+def _heuristic(known: int, value: int, goal_mask: int, goal_bits: int, achievers: Dict[int, int]) -> float:
+    """
+    Every goal literal that does not hold yet needs an action that sets it, so the longest
+    of the shortest such actions never overestimates the remaining duration
+    """
+    missing = goal_mask & ~(known & ~(value ^ goal_bits))
+    h = 0
+    while missing:
+        bit = missing & -missing
+        missing ^= bit
+        h = max(h, achievers.get(bit, float('inf')))
+    return h
+
+
+def plan(domain: TimeDomainDescription, goal: List[Fluent] | Fluent, deadline: float | None = None,
+         max_states: int | None = None) -> List[Tuple[str, int]] | None:
+    """
+    A* search for the action occurances with the smallest total duration after which
+    the goal necessarily holds, as Scenario.check_if_condition_hold would see it.
+    Each action starts when the previous one ends and the last one has to end
+    by the deadline, the domain's termination_time by default.
+    Returns None if the goal can not be reached or max_states were expanded without reaching it.
+    """
+    if isinstance(goal, Fluent):
+        goal = [goal]
+    if deadline is None:
+        deadline = domain.termination_time
+    domain = domain.fork()
+    state = domain.fluents
+    condition = state.condition(goal)
+    if condition.never or condition.conflict or condition.vague:
+        return None
+
+    durations = {action: domain.durations.get(action, 1) for action in domain._table}
+    # shortest action setting each fluent to its goal value
+    achievers: Dict[int, int] = dict()
+    for action, table in domain._table.items():
+        for _, effect in table.rules:
+            sets = effect.mask & ~(effect.bits ^ condition.bits) & condition.mask
+            while sets:
+                bit = sets & -sets
+                sets ^= bit
+                achievers[bit] = min(achievers.get(bit, durations[action]), durations[action])
+
+    start = (state.known, state.value)
+    best: Dict[Tuple[int, int], int] = {start: 0}
+    parents: Dict[Tuple[int, int], Tuple[Tuple[int, int], str]] = dict()
+    ties = count()
+    h = _heuristic(*start, condition.mask, condition.bits, achievers)
+    if h == float('inf'):
+        # some goal literal is set by no action
+        return None
+    queue = [(h, 0, next(ties), start)]
+    expanded = 0
+
+    while queue:
+        _, cost, _, key = heappop(queue)
+        if cost > best[key]:
+            continue
+        known, value = key
+        if check(known, value, condition) is True:
+            occurances = []
+            while key in parents:
+                key, action = parents[key]
+                occurances.append(action)
+            occurances.reverse()
+            time, result = domain.time, []
+            for action in occurances:
+                result.append((action, time))
+                time += durations[action]
+            return result
+
+        expanded += 1
+        if max_states is not None and expanded > max_states:
+            return None
+        for action, table in domain._table.items():
+            possible = check_possible(known, value, table)
+            if possible is False:
+                continue
+            next_cost = cost + durations[action]
+            if domain.time + next_cost > deadline:
+                continue
+            next_key = run_rules(known, value, table, possible)
+            if next_cost >= best.get(next_key, float('inf')):
+                continue
+            h = _heuristic(*next_key, condition.mask, condition.bits, achievers)
+            if h == float('inf') or domain.time + next_cost + h > deadline:
+                continue
+            best[next_key] = next_cost
+            parents[next_key] = (key, action)
+            heappush(queue, (next_cost + h, next_cost, next(ties), next_key))
+    return None
@@ -0,0 +1,196 @@
+"""
+Opt-in instrumentation of the reasoning engine. While a Profile is active the hot methods
+of the domain, Scenario and Structure classes are replaced by counting and timing wrappers;
+outside of it the classes are untouched, so profiling costs nothing when it is off.
+
+    with Profile() as profile:
+        scenario.is_consistent()
+    print(profile.summary())
+    profile.save_chrome_trace("trace.json")  # chrome://tracing or https://ui.perfetto.dev
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import defaultdict
+from functools import wraps
+from time import perf_counter
+from typing import Dict, List, Set, Tuple
+
+from krr_system.domain import DomainDescription
+from krr_system.scenario import Scenario
+from krr_system.structure import Structure
+
+active: Profile | None = None
+
+# (class, method, name in the profile), timed as a whole and kept as trace events
+CALLS = [
+    (Scenario, "is_consistent", "Scenario.is_consistent"),
+    (Scenario, "check_if_condition_hold", "Scenario.check_if_condition_hold"),
+    (Scenario, "does_action_perform", "Scenario.does_action_perform"),
+    (Scenario, "query_many", "Scenario.query_many"),
+    (Scenario, "infer_initial_state", "Scenario.infer_initial_state"),
+    (Structure, "is_statement_true", "Structure.is_statement_true"),
+    (Structure, "check_statements", "Structure.check_statements"),
+    (DomainDescription, "copy", "domain copies"),
+    # Scenario and Structure fork the domain, which copies it only when it is not compiled
+    (DomainDescription, "fork", "domain copies"),
+    (DomainDescription, "compile", "domain compilations"),
+]
+# counted and timed, but too frequent to be trace events
+COUNTS = [
+    (DomainDescription, "snapshot", "state snapshots"),
+    (DomainDescription, "restore", "state restores"),
+]
+
+
+def _clauses(domain: DomainDescription, action: str) -> int:
+    if domain._table is not None and action in domain._table:
+        return len(domain._table[action].impossibles)
+    return len(domain.impossibles.get(action, ()))
+
+
+def _rules(domain: DomainDescription, action: str) -> int:
+    if domain._table is not None:
+        return len(domain._table[action].rules)
+    return len(domain._causes[action])
+
+
+class Profile:
+    """
+    Counts and times Scenario and Structure calls, domain copies and state snapshots,
+    and per action the impossibility checks and rule applications they lead to.
+    Patches classes process-wide, so only one Profile can be active at a time.
+    """
+
+    def __init__(self, trace_actions: bool = False):
+        self.trace_actions = trace_actions  # record every action as a trace event, not only its totals
+        self.calls: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])  # name -> [count, seconds]
+        self.actions: Dict[str, Dict[str, float]] = defaultdict(lambda: dict.fromkeys(
+            ("checks", "check_seconds", "clauses", "impossible", "executed", "apply_seconds", "rules"), 0))
+        self.events: List[Tuple[str, str, float, float, dict]] = []  # name, category, start, duration, args
+        self.start = self.stop = None
+        self._originals: List[Tuple[type, str, object]] = []
+        self._running: Set[str] = set()  # names of the calls in progress
+
+    # activation
+
+    def __enter__(self) -> Profile:
+        global active
+        if active is not None:
+            raise RuntimeError("another Profile is already active")
+        active = self
+        self.start = perf_counter()
+        for cls, method, name in CALLS:
+            self._patch(cls, method, self._call(getattr(cls, method), name, True))
+        for cls, method, name in COUNTS:
+            self._patch(cls, method, self._call(getattr(cls, method), name, False))
+        self._patch(DomainDescription, "_possible", self._possible(DomainDescription._possible))
+        self._patch(DomainDescription, "_apply", self._apply(DomainDescription._apply))
+        return self
+
+    def __exit__(self, *args):
+        global active
+        for cls, method, original in reversed(self._originals):
+            setattr(cls, method, original)
+        self._originals.clear()
+        self.stop = perf_counter()
+        active = None
+
+    def _patch(self, cls: type, method: str, wrapper):
+        self._originals.append((cls, method, cls.__dict__[method]))
+        setattr(cls, method, wrapper)
+
+    # wrappers
+
+    def _call(self, function, name: str, event: bool):
+        calls = self.calls[name]
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if name in self._running:
+                # e.g. copy inside fork, counted once under their shared name
+                return function(*args, **kwargs)
+            self._running.add(name)
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                duration = perf_counter() - start
+                self._running.discard(name)
+                calls[0] += 1
+                calls[1] += duration
+                if event:
+                    self.events.append((name, "call", start, duration, {}))
+        return wrapper
+
+    def _possible(self, function):
+        @wraps(function)
+        def wrapper(domain, action):
+            start = perf_counter()
+            possible = function(domain, action)
+            duration = perf_counter() - start
+            stats = self.actions[action]
+            stats["checks"] += 1
+            stats["check_seconds"] += duration
+            stats["clauses"] += _clauses(domain, action)
+            stats["impossible"] += possible is False
+            if self.trace_actions:
+                self.events.append((f"{action} possible", "action", start, duration, {"result": possible}))
+            return possible
+        return wrapper
+
+    def _apply(self, function):
+        @wraps(function)
+        def wrapper(domain, action, possible):
+            start = perf_counter()
+            result = function(domain, action, possible)
+            duration = perf_counter() - start
+            stats = self.actions[action]
+            stats["executed"] += 1
+            stats["apply_seconds"] += duration
+            stats["rules"] += _rules(domain, action)
+            if self.trace_actions:
+                self.events.append((action, "action", start, duration, {}))
+            return result
+        return wrapper
+
+    # export
+
+    def to_dict(self) -> dict:
+        return {
+            "seconds": (self.stop or perf_counter()) - self.start if self.start is not None else 0.0,
+            "calls": {name: {"count": count, "seconds": seconds} for name, (count, seconds) in self.calls.items()},
+            "actions": {action: dict(stats) for action, stats in self.actions.items()},
+        }
+
+    def to_json(self, path: str | None = None) -> str:
+        text = json.dumps(self.to_dict(), indent=1)
+        if path is not None:
+            with open(path, "w") as file:
+                file.write(text)
+        return text
+
+    def chrome_trace(self) -> dict:
+        """Events in the Trace Event Format read by chrome://tracing and Perfetto, times in microseconds"""
+        pid, tid = os.getpid(), threading.get_ident()
+        events = [{"name": name, "cat": category, "ph": "X", "ts": (start - self.start) * 1e6,
+                   "dur": duration * 1e6, "pid": pid, "tid": tid, "args": args}
+                  for name, category, start, duration, args in self.events]
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": self.to_dict()}
+
+    def save_chrome_trace(self, path: str):
+        with open(path, "w") as file:
+            json.dump(self.chrome_trace(), file)
+
+    def summary(self) -> str:
+        lines = [f"{'call':<40}{'count':>10}{'ms':>12}"]
+        for name, (count, seconds) in sorted(self.calls.items(), key=lambda item: -item[1][1]):
+            lines.append(f"{name:<40}{count:>10}{seconds * 1e3:>12.3f}")
+        lines.append(f"\n{'action':<20}{'checks':>10}{'clauses':>10}{'check ms':>12}{'executed':>10}"
+                     f"{'rules':>10}{'apply ms':>12}")
+        for action, stats in sorted(self.actions.items(), key=lambda item: -item[1]["apply_seconds"]):
+            lines.append(f"{action:<20}{stats['checks']:>10}{stats['clauses']:>10}{stats['check_seconds'] * 1e3:>12.3f}"
+                         f"{stats['executed']:>10}{stats['rules']:>10}{stats['apply_seconds'] * 1e3:>12.3f}")
+        return "\n".join(lines)
@@ -1,8 +1,13 @@
+from __future__ import annotations
 
-from copy import deepcopy
-from typing import List, Tuple
+from bisect import bisect_right
+from collections import Counter
+from itertools import accumulate
+from typing import Dict, List, Tuple
 
 from krr_system.domain import TimeDomainDescription, Fluent
+from krr_system.inference import Inference, infer
+from krr_system.trace import Trace
 
 
 class Scenario:
@@ -10,11 +15,78 @@ class Scenario:
     def __init__(self, domain: TimeDomainDescription, observations: List[Tuple[Fluent, int]],
                  action_occurances: List[Tuple[str, int]]):
         self.observations = observations
+        # initial values assumed on top of the domain state, see set_observations_as_true
+        self._assumed: Dict[str, bool] = dict()
+        self._key = None
+        self._occurances: List[Tuple[str, int]] = []
         self.action_occurances = action_occurances
-        self.domain = deepcopy(domain)
+        # queries run on a private fork of the domain and roll its state back afterwards
+        self.domain = domain.fork()
 
-    def set_observations_as_true(self):
-        pass
+    @property
+    def action_occurances(self) -> Tuple[Tuple[str, int], ...]:
+        if self._view is None:
+            self._view = tuple(self._occurances)
+        return self._view
+
+    @action_occurances.setter
+    def action_occurances(self, action_occurances: List[Tuple[str, int]]):
+        """Keeps what was simulated for the occurances the new list starts with"""
+        occurances = [tuple(occurance) for occurance in action_occurances]
+        kept, old = 0, self._occurances
+        while kept < min(len(old), len(occurances)) and old[kept] == occurances[kept]:
+            kept += 1
+        self._replace(kept, occurances)
+
+    def append_occurrence(self, action: str, time: int) -> bool:
+        """Adds an occurance at the end, simulating only that one, returns is_consistent"""
+        occurance = (action, time)
+        self._occurances.append(occurance)
+        self._view = None
+        if self._key is not None:
+            self._horizon.append(max(self._horizon[-1], time) if self._horizon else time)
+            self._occuring[occurance] += 1
+        return self.is_consistent()
+
+    def remove_occurrence(self, index: int):
+        """Drops the index-th occurance, later queries resume from the state before it"""
+        index = range(len(self._occurances))[index]
+        self._replace(index, self._occurances[:index] + self._occurances[index + 1:])
+
+    def replace_occurrence(self, index: int, action: str, time: int):
+        """Changes the index-th occurance, later queries resume from the state before it"""
+        index = range(len(self._occurances))[index]
+        self._replace(index, self._occurances[:index] + [(action, time)] + self._occurances[index + 1:])
+
+    def _replace(self, kept: int, occurances: List[Tuple[str, int]]):
+        """Swaps in occurances sharing the first kept ones, dropping only the checkpoints after them"""
+        if self._key is not None:
+            for occurance in self._occurances[kept:]:
+                self._occuring[occurance] -= 1
+                if not self._occuring[occurance]:
+                    del self._occuring[occurance]
+            del self._checkpoints[kept + 1:]
+            if self._failed is not None and self._failed >= kept:
+                self._failed = None
+            del self._horizon[kept:]
+            for occurance in occurances[kept:]:
+                self._horizon.append(max(self._horizon[-1], occurance[1]) if self._horizon else occurance[1])
+                self._occuring[occurance] += 1
+        self._occurances = occurances
+        self._view = None
+
+    def set_observations_as_true(self) -> bool | None:
+        """
+        Assumes the initial values the observations force for the rest of the queries,
+        returns whether the observations are consistent with the scenario
+        """
+        inference = self.infer_initial_state()
+        self._assumed = inference.initial
+        self._key = None
+        return inference.consistent
+
+    def infer_initial_state(self) -> Inference:
+        return infer(self.domain, self.observations, self.action_occurances)
 
     def does_action_perform(self, action: str, time: int):
         """
@@ -22,31 +94,104 @@ class Scenario:
         thus to check if action is performed it is neough to check scenario
         consistency and existence is action occurances
         """
-        return self.is_consistent() and ((action, time) in self.action_occurances)
+        return self.is_consistent() and ((action, time) in self._occuring)
 
     def check_if_condition_hold(self, conditions: List[Fluent], after_time: int, verbose=False):
         if isinstance(conditions, Fluent):
             conditions = [conditions]
 
-        domain = deepcopy(self.domain)
-        for action, time in self.action_occurances:
-
-            # follow scenario to the specified point
-            if time > after_time:
-                break
-            if domain.do_action(action, time) is False:
-                if verbose:
-                    print(f"Action {action} at time {time} breaks consistency")
-                return False
+        # follow scenario to the specified point
+        self._sync()
+        count = bisect_right(self._horizon, after_time)
+        if not self._advance(count, verbose):
+            return False
 
         # domain frozen at time after after_time
-        return domain._check(conditions)
+        return self._check_at(count, conditions)
 
     def is_consistent(self, verbose=False):
-        domain = deepcopy(self.domain)
-        for action, time in self.action_occurances:
-            if domain.do_action(action, time) is False:
-                if verbose:
-                    print(f"Action {action} at time {time} breaks consistency")
-                return False
-        return True
\ No newline at end of file
+        return self._advance(len(self._occurances), verbose)
+
+    def query_many(self, conditions: List[Tuple[List[Fluent] | Fluent, int]] = (),
+                   actions: List[Tuple[str, int]] = ()) -> Tuple[List[bool | None], List[bool]]:
+        """
+        Answers condition queries (conditions, after_time) and action queries (action, time)
+        in a single forward pass over the occurances, sorted by time.
+        Results come back in the order of the queries, as check_if_condition_hold
+        and does_action_perform would give them.
+        """
+        self._sync()
+        holds: List[bool | None] = [None] * len(conditions)
+        for i in sorted(range(len(conditions)), key=lambda i: conditions[i][1]):
+            query, after_time = conditions[i]
+            if isinstance(query, Fluent):
+                query = [query]
+            count = bisect_right(self._horizon, after_time)
+            holds[i] = self._advance(count) and self._check_at(count, query)
+
+        consistent = self.is_consistent()
+        performs = [consistent and (action, time) in self._occuring for action, time in actions]
+        return holds, performs
+
+    def trace(self) -> Trace:
+        """Values of every fluent after each occurance, up to the one breaking consistency"""
+        self.is_consistent()
+        states = [state for state, _ in self._checkpoints]
+        times = [self._checkpoints[0][1]] + self._horizon[:len(states) - 1]
+        end = None if self._failed is None else self._horizon[self._failed]
+        return Trace.from_states(list(self.domain.fluents), times, states, end)
+
+    def _sync(self) -> TimeDomainDescription:
+        """Drops the checkpoints if the occurances or the domain changed since they were recorded"""
+        domain = self.domain.compiled()
+        key = (domain._version, domain.snapshot())
+        if key != self._key:
+            self._key = key
+            # checkpoint i is the state after the first i occurances
+            self._checkpoints = [self._origin(domain)]
+            self._failed = None
+            # occurances are followed until the first one starting after the queried time
+            self._horizon = list(accumulate((time for _, time in self._occurances), max))
+            self._occuring = Counter(self._occurances)
+        return domain
+
+    def _origin(self, domain: TimeDomainDescription):
+        if not self._assumed:
+            return domain.snapshot()
+        origin = domain.snapshot()
+        domain._set([Fluent(name, value) for name, value in self._assumed.items()])
+        start = domain.snapshot()
+        domain.restore(origin)
+        return start
+
+    def _advance(self, count: int, verbose=False) -> bool:
+        """Simulates the first count occurances once, False if one of them breaks consistency"""
+        domain = self._sync()
+        if self._failed is None and len(self._checkpoints) <= count:
+            origin = domain.snapshot()
+            domain.restore(self._checkpoints[-1])
+            try:
+                for action, time in self._occurances[len(self._checkpoints) - 1:count]:
+                    if domain.do_action(action, time) is False:
+                        self._failed = len(self._checkpoints) - 1
+                        break
+                    self._checkpoints.append(domain.snapshot())
+            finally:
+                domain.restore(origin)
+
+        if self._failed is not None and self._failed < count:
+            if verbose:
+                action, time = self._occurances[self._failed]
+                print(f"Action {action} at time {time} breaks consistency")
+            return False
+        return True
+
+    def _check_at(self, count: int, conditions: List[Fluent]):
+        """Checks conditions in the state after the first count occurances"""
+        domain = self.domain
+        origin = domain.snapshot()
+        domain.restore(self._checkpoints[count])
+        try:
+            return domain._check(conditions)
+        finally:
+            domain.restore(origin)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, NamedTuple
+
+from krr_system.fluent import Fluent
+
+
+class Condition(NamedTuple):
+    """List of fluent requirements encoded against a BitState index"""
+    mask: int  # fluents required to have a definite value
+    bits: int  # required values
+    conflict: int = 0  # fluents required to be both True and False
+    vague: bool = False  # some requirement has value None, so it is never fully met
+    never: bool = False  # requirement on a fluent missing from the state
+
+
+class Effect(NamedTuple):
+    """List of fluents set by a rule encoded against a BitState index"""
+    mask: int  # fluents set to a definite value
+    bits: int  # values they are set to
+    release: int = 0  # fluents set to None
+
+
+class BitState(Mapping):
+    """
+    Compact three-valued state: each fluent gets an integer index and the state
+    lives in two bitmasks, `known` (value is not None) and `value` (value is True).
+    Behaves like the Dict[str, Fluent] it replaces.
+    """
+
+    def __init__(self, fluents: Mapping | None = None):
+        self.index: Dict[str, int] = dict()
+        self.names: List[str] = []
+        self.known = 0
+        self.value = 0
+        if fluents:
+            for name, fluent in fluents.items():
+                self[name] = fluent
+
+    def __getitem__(self, name: str):
+        bit = 1 << self.index[name]
+        if not self.known & bit:
+            return Fluent(name, None)
+        return Fluent(name, bool(self.value & bit))
+
+    def __setitem__(self, name: str, fluent):
+        if name not in self.index:
+            self.index[name] = len(self.names)
+            self.names.append(name)
+        bit = 1 << self.index[name]
+        if fluent.value is None:
+            self.known &= ~bit
+            self.value &= ~bit
+        else:
+            self.known |= bit
+            self.value = self.value | bit if fluent.value else self.value & ~bit
+
+    def copy(self) -> BitState:
+        state = BitState()
+        state.index, state.names = dict(self.index), list(self.names)
+        state.known, state.value = self.known, self.value
+        return state
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def condition(self, conditions) -> Condition:
+        mask = bits = conflict = 0
+        vague = never = False
+        for f in conditions:
+            if f.name not in self.index:
+                never = True
+                continue
+            if f.value is None:
+                vague = True
+                continue
+            bit = 1 << self.index[f.name]
+            if mask & bit and bool(bits & bit) != bool(f.value):
+                conflict |= bit
+            mask |= bit
+            if f.value:
+                bits |= bit
+        return Condition(mask, bits, conflict, vague, never)
+
+    def effect(self, fluents) -> Effect:
+        """Encodes fluents to set, a fluent listed more than once keeps its last entry"""
+        mask = bits = release = 0
+        for f in fluents:
+            bit = 1 << self.index[f.name]
+            mask &= ~bit
+            bits &= ~bit
+            release &= ~bit
+            if f.value is None:
+                release |= bit
+            else:
+                mask |= bit
+                if f.value:
+                    bits |= bit
+        return Effect(mask, bits, release)
+
+    def check(self, condition: Condition) -> bool | None:
+        """Mask counterpart of DomainDescription._check"""
+        return check(self.known, self.value, condition)
+
+    def apply(self, effect: Effect, certain: bool):
+        self.known, self.value = apply(self.known, self.value, effect, certain)
+
+
+def check(known: int, value: int, condition: Condition) -> bool | None:
+    if condition.never:
+        return False
+    if (condition.mask & known & (value ^ condition.bits)) or (condition.conflict & known):
+        return False
+    if condition.vague or condition.mask & ~known:
+        return None
+    return True
+
+
+def apply(known: int, value: int, effect: Effect, certain: bool):
+    """
+    Mask counterpart of DomainDescription._do for conditions that are not False:
+    fluents already holding their target value stay, the rest become the target
+    value if certain, otherwise None
+    """
+    stay = effect.mask & known & ~(value ^ effect.bits)
+    diff = (effect.mask | effect.release) & ~stay
+    if not certain:
+        return known & ~diff, value & ~diff
+    return (known & ~diff) | (diff & effect.mask), (value & ~diff) | (diff & effect.bits)
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import List, NamedTuple, Tuple
+
+from krr_system.domain import Fluent, TimeDomainDescription
+from krr_system.scenario import Scenario
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fluents (name TEXT PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS actions (name TEXT PRIMARY KEY, duration INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS statements (
+    id INTEGER PRIMARY KEY,
+    action TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    fluents TEXT NOT NULL,
+    conditions TEXT NOT NULL,
+    UNIQUE (action, kind, fluents, conditions)
+);
+CREATE TABLE IF NOT EXISTS initial_states (fluent TEXT PRIMARY KEY, value INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS observations (
+    fluent TEXT NOT NULL,
+    time INTEGER NOT NULL,
+    value INTEGER NOT NULL,
+    PRIMARY KEY (time, fluent)
+);
+CREATE TABLE IF NOT EXISTS occurrences (time INTEGER PRIMARY KEY, action TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+TABLES = ("fluents", "actions", "statements", "initial_states", "observations", "occurrences", "settings")
+
+Literals = Tuple[Tuple[str, bool], ...]
+
+
+class StoredStatement(NamedTuple):
+    action: str
+    kind: str  # causes, releases or impossible
+    fluents: Literals
+    conditions: Literals
+
+
+def encode(literals) -> str:
+    """(name, value) pairs in the name#True:other#False form the app has always used"""
+    return ":".join(f"{name}#{bool(value)}" for name, value in literals)
+
+
+def decode(text: str) -> Literals:
+    return tuple((name, value == "True") for name, _, value in (item.partition("#") for item in text.split(":"))
+                 if name)
+
+
+class Store:
+    """
+    SQLite file holding everything entered in the app. Every write runs in a transaction,
+    and writes to the domain or scenario bump a version number, so readers can tell whether
+    the model changed. Safe to share between threads: one lock serializes every use of the connection.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._versioned = False  # whether the open transaction changes the model
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @contextmanager
+    def transaction(self, versioned: bool = True):
+        """
+        Groups writes into one transaction, nested transactions join the outer one.
+        versioned=False for writes that change neither the domain nor the scenario
+        """
+        with self._lock:
+            if self._depth:
+                self._depth += 1
+                self._versioned |= versioned
+                try:
+                    yield self
+                finally:
+                    self._depth -= 1
+                return
+            self._depth, self._versioned = 1, versioned
+            try:
+                with self.connection:
+                    yield self
+                    if self._versioned:
+                        self.connection.execute(
+                            "INSERT INTO settings VALUES ('version', '1') "
+                            "ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1")
+            finally:
+                self._depth = 0
+
+    def _insert(self, table: str, *values) -> bool:
+        """False if a row with the same key is already there"""
+        with self.transaction():
+            cursor = self.connection.execute(
+                f"INSERT OR IGNORE INTO {table} VALUES ({', '.join('?' * len(values))})", values)
+        return cursor.rowcount > 0
+
+    def _select(self, sql: str, *parameters) -> list:
+        with self._lock:
+            return self.connection.execute(sql, parameters).fetchall()
+
+    def version(self) -> int:
+        return int(self.setting("version", "0"))
+
+    def setting(self, key: str, default: str | None = None) -> str | None:
+        rows = self._select("SELECT value FROM settings WHERE key = ?", key)
+        return default if not rows else rows[0][0]
+
+    def set_setting(self, key: str, value: str):
+        """Settings only change how the app looks, so they do not bump the version"""
+        with self.transaction(versioned=False):
+            self.connection.execute("INSERT OR REPLACE INTO settings VALUES (?, ?)", (key, value))
+
+    def reset(self):
+        with self.transaction():
+            for table in TABLES[:-1]:
+                self.connection.execute(f"DELETE FROM {table}")
+            self.connection.execute("DELETE FROM settings WHERE key != 'version'")
+
+    # writes
+
+    def add_fluent(self, name: str) -> bool:
+        return self._insert("fluents", name)
+
+    def add_action(self, name: str, duration: int = 1) -> bool:
+        return self._insert("actions", name, duration)
+
+    def set_duration(self, name: str, duration: int):
+        with self.transaction():
+            self.connection.execute("UPDATE actions SET duration = ? WHERE name = ?", (duration, name))
+
+    def add_statement(self, action: str, kind: str, fluents=(), conditions=()) -> bool:
+        return self._insert("statements (action, kind, fluents, conditions)", action, kind,
+                            encode(fluents), encode(conditions))
+
+    def add_initial_state(self, fluent: str, value: bool) -> bool:
+        """Only the first initial value of a fluent is kept"""
+        return self._insert("initial_states", fluent, bool(value))
+
+    def add_observation(self, fluent: str, value: bool, time: int) -> bool:
+        """Only the first observation of a fluent at a time is kept"""
+        return self._insert("observations", fluent, time, bool(value))
+
+    def add_occurrence(self, action: str, time: int) -> bool:
+        """Only one action may occur at a time"""
+        return self._insert("occurrences", time, action)
+
+    # reads
+
+    def fluents(self) -> List[str]:
+        return [name for name, in self._select("SELECT name FROM fluents ORDER BY rowid")]
+
+    def actions(self) -> List[Tuple[str, int]]:
+        return self._select("SELECT name, duration FROM actions ORDER BY rowid")
+
+    def statements(self) -> List[StoredStatement]:
+        return [StoredStatement(action, kind, decode(fluents), decode(conditions)) for action, kind, fluents, conditions
+                in self._select("SELECT action, kind, fluents, conditions FROM statements ORDER BY id")]
+
+    def initial_states(self) -> List[Tuple[str, bool]]:
+        return [(fluent, bool(value)) for fluent, value
+                in self._select("SELECT fluent, value FROM initial_states ORDER BY rowid")]
+
+    def observations(self) -> List[Tuple[str, bool, int]]:
+        return [(fluent, bool(value), time) for fluent, value, time
+                in self._select("SELECT fluent, value, time FROM observations ORDER BY rowid")]
+
+    def occurrences(self) -> List[Tuple[str, int]]:
+        return self._select("SELECT action, time FROM occurrences ORDER BY rowid")
+
+    # model
+
+    def domain(self) -> TimeDomainDescription:
+        domain = TimeDomainDescription()
+        for fluent, value in self.initial_states():
+            domain.initially(**{fluent: value})
+        for action, duration in self.actions():
+            domain.duration(action, duration)
+        for statement in self.statements():
+            fluents = [Fluent(name, value) for name, value in statement.fluents]
+            conditions = [Fluent(name, value) for name, value in statement.conditions]
+            if statement.kind == "causes":
+                domain.causes(statement.action, fluents, conditions=conditions)
+            elif statement.kind == "releases":
+                domain.releases(statement.action, fluents)
+            elif statement.kind == "impossible":
+                domain.impossible(statement.action, conditions=conditions)
+        return domain
+
+    def scenario(self, domain: TimeDomainDescription | None = None) -> Scenario:
+        if domain is None:
+            domain = self.domain()
+        observations = tuple((Fluent(fluent, value), time) for fluent, value, time in self.observations())
+        return Scenario(domain=domain, observations=observations, action_occurances=self.occurrences())
+
+    def import_legacy(self, directory: str = "variables"):
+        """
+        One-time import of the comma and semicolon delimited text files the app used to keep
+        in directory, in a single transaction
+        """
+        def read(name: str) -> List[List[str]]:
+            path = os.path.join(directory, f"{name}.txt")
+            if not os.path.exists(path):
+                return []
+            with open(path) as file:
+                text = file.read().strip()
+            return [item.split(";") for item in text.split(",")] if text else []
+
+        with self.transaction():
+            for name, in read("fluents"):
+                self.add_fluent(name)
+            for name, duration in read("actions"):
+                if not self.add_action(name, int(duration)):
+                    # the files kept every duration an action was submitted with
+                    self.set_duration(name, int(duration))
+            for action, kind, fluents, conditions in read("statements"):
+                self.add_statement(action, kind, decode(fluents), decode(conditions))
+            for fluent, value in read("initial_states"):
+                self.add_initial_state(fluent, value == "True")
+            for fluent, value, time in read("observations"):
+                self.add_observation(fluent, value == "True", int(time))
+            for action, time in read("action_occurences"):
+                self.add_occurrence(action, int(time))
+            for values in read("technical_variables"):
+                self.set_setting("conditions", values[0])
+                self.set_setting("fluents", values[1])
@@ -1,5 +1,6 @@
-from copy import deepcopy
-from typing import List
+from __future__ import annotations
+
+from typing import List, Sequence, Tuple
 
 from krr_system.domain import Fluent, DomainDescription
 
@@ -10,15 +11,82 @@ class Statement:
         self.actions = actions
 
 
+def _common(a: Tuple[str, ...], b: Tuple[str, ...]) -> int:
+    """Number of actions two sequences start with in common"""
+    k, n = 0, min(len(a), len(b))
+    while k < n and a[k] == b[k]:
+        k += 1
+    return k
+
+
 class Structure:
 
     def __init__(self, model: DomainDescription):
-        self.model = deepcopy(model)
+        # statements are evaluated on a private fork of the model and roll its state back afterwards
+        self.model = model.fork()
 
     def is_statement_true(self, statement: Statement):
-        m = deepcopy(self.model)
+        m = self.model.compiled()
+        snapshot = m.snapshot()
+        try:
+            for action in statement.actions:
+                m.do_action(action)
+
+            return m._check(statement.fluents)
+        finally:
+            m.restore(snapshot)
+
+    def check_statements(self, statements: Sequence[Statement]) -> List[bool | None]:
+        """
+        is_statement_true for every statement, in their order, in one depth first walk of the
+        prefix trie of their action sequences. Sorting the sequences lists them in the order
+        of that walk, and a sequence branches from each later one at the depth of the smallest
+        common prefix between them, so every action edge of the trie runs once and the state is
+        snapshotted at each depth where a later sequence branches off the current one.
+        """
+        keys = [tuple(statement.actions) for statement in statements]
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        branches = [_common(keys[i], keys[j]) for i, j in zip(order, order[1:])] + [0]
 
-        for action in statement.actions:
-            m.do_action(action)
+        # need[j]: depths to snapshot on the way to the j-th sorted sequence; the branch
+        # depths of the later sequences are the running minima of branches, kept on a stack
+        need: List[List[int]] = [[] for _ in order]
+        stack: List[int] = []
+        for j in range(len(order) - 2, -1, -1):
+            branch = branches[j]
+            while stack and stack[-1] >= branch:
+                depth = stack.pop()
+                if depth > branch:
+                    need[j + 1].append(depth)
+            stack.append(branch)
+        if order:
+            need[0] = [depth for depth in stack if depth > 0]
+        for depths in need:
+            depths.sort()
 
-        return m._check(statement.fluents)
\ No newline at end of file
+        m = self.model.compiled()
+        origin = m.snapshot()
+        results: List[bool | None] = [None] * len(keys)
+        snapshots = [(0, origin)]  # (depth, state) at the branch points on the current path
+        depth = 0  # actions of the current path the model has run
+        try:
+            for i, branch, depths in zip(order, branches, need):
+                key = keys[i]
+                top, snapshot = snapshots[-1]
+                if depth != top:
+                    m.restore(snapshot)
+                depth = top
+                for target in depths:
+                    for action in key[depth:target]:
+                        m.do_action(action)
+                    snapshots.append((target, m.snapshot()))
+                    depth = target
+                for action in key[depth:]:
+                    m.do_action(action)
+                depth = len(key)
+                results[i] = m._check(statements[i].fluents)
+                while snapshots[-1][0] > branch:
+                    snapshots.pop()
+            return results
+        finally:
+            m.restore(origin)
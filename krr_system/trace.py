@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from typing import List
+
+import numpy as np
+
+from krr_system.domain import Fluent
+from krr_system.utils import FALSE, TRUE, UNKNOWN, fuzzy_all, fuzzy_eq_array, to_array, unpack
+
+
+class Trace:
+    """
+    Fluent values of a scenario as columns: row i is the state after the first i occurances,
+    encoded as TRUE/FALSE/UNKNOWN int8, and times[i] the start of occurance i - 1 (the domain's
+    start time for row 0). As in Scenario.check_if_condition_hold, a time t sees the last row
+    whose time is at most t, and row 0 before that. An inconsistent scenario ends at the state
+    its failing occurance was attempted in, and times from the start of that occurance on see no row.
+    """
+
+    def __init__(self, names: List[str], times: np.ndarray, values: np.ndarray, end: int | None = None):
+        self.names = names
+        self.index = {name: i for i, name in enumerate(names)}
+        self.times = times
+        self.values = values
+        self.end = end  # start of the occurance that broke consistency, None if none did
+
+    def __len__(self):
+        return len(self.times)
+
+    @classmethod
+    def from_states(cls, names: List[str], times, states, end: int | None = None) -> Trace:
+        """states are (known, value) masks, as BitState keeps them"""
+        width = (len(names) + 7) // 8
+        known = np.frombuffer(b"".join(k.to_bytes(width, "little") for k, _ in states), dtype=np.uint8)
+        value = np.frombuffer(b"".join(v.to_bytes(width, "little") for _, v in states), dtype=np.uint8)
+        values = unpack(known.reshape(len(states), width), value.reshape(len(states), width), len(names))
+        return cls(names, np.array(times, dtype=np.int64), values, end)
+
+    def rows(self, times) -> np.ndarray:
+        """Row seen at each of the times, len(self) if none is"""
+        rows = np.searchsorted(self.times[1:], times, side="right")
+        if self.end is not None:
+            rows = np.where(np.asarray(times) >= self.end, len(self), rows)
+        return rows
+
+    def column(self, name: str) -> np.ndarray:
+        return self.values[:, self.index[name]]
+
+    def value_at(self, name: str, time: int) -> bool | None:
+        row = int(self.rows(time))
+        if row == len(self):
+            raise ValueError(f"the scenario broke consistency before time {time}")
+        return [None, True, False][self.column(name)[row]]
+
+    def times_when(self, name: str, value: bool | None) -> np.ndarray:
+        """Times of the rows in which the fluent has value"""
+        return self.times[self.column(name) == (UNKNOWN if value is None else TRUE if value else FALSE)]
+
+    def changes(self, name: str, value: bool | None) -> np.ndarray:
+        """Times at which the fluent took value, having had another one in the row before"""
+        column = self.column(name)
+        code = UNKNOWN if value is None else TRUE if value else FALSE
+        rows = np.flatnonzero((column[1:] == code) & (column[:-1] != code)) + 1
+        return self.times[rows]
+
+    def first_change(self, name: str, value: bool | None) -> int | None:
+        times = self.changes(name, value)
+        return int(times[0]) if len(times) else None
+
+    def holds(self, conditions: List[Fluent] | Fluent, times) -> np.ndarray:
+        """
+        check_if_condition_hold at each of the times, TRUE/FALSE/UNKNOWN, except that
+        a condition on a fluent the domain does not know is always FALSE
+        """
+        if isinstance(conditions, Fluent):
+            conditions = [conditions]
+        rows = np.atleast_1d(self.rows(times))
+        if any(f.name not in self.index for f in conditions):
+            return np.full(len(rows), FALSE, dtype=np.int8)
+        columns = [self.index[f.name] for f in conditions]
+        required = to_array([f.value for f in conditions])
+        visible = rows < len(self)  # the others are after the scenario broke
+        met = np.full(len(rows), FALSE, dtype=np.int8)
+        met[visible] = fuzzy_all(fuzzy_eq_array(self.values[rows[visible]][:, columns], required), axis=1)
+        return met
@@ -1,3 +1,8 @@
+from typing import Tuple
+
+import numpy as np
+
+
 def fuzzy_not(o):
     if o is None:
         return o
@@ -22,3 +27,77 @@ def fuzzy_eq(o1, o2):
     if o1 is None or o2 is None:
         return None
     return o1 == o2
+
+
+# Array counterparts of the functions above, on int8 arrays encoding True/False/None as 1/-1/0,
+# and on packed (known, value) bit vectors, either ints as in BitState or unsigned NumPy arrays.
+# The scalar functions stay the reference semantics.
+
+TRUE, FALSE, UNKNOWN = 1, -1, 0
+
+
+def to_array(values) -> np.ndarray:
+    return np.array([UNKNOWN if v is None else TRUE if v else FALSE for v in values], dtype=np.int8)
+
+
+def from_array(array: np.ndarray) -> list:
+    return [None if v == UNKNOWN else bool(v == TRUE) for v in np.asarray(array).ravel()]
+
+
+def fuzzy_not_array(a: np.ndarray) -> np.ndarray:
+    return np.negative(a, dtype=np.int8)
+
+
+def fuzzy_or_array(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.where((a == UNKNOWN) | (b == UNKNOWN), UNKNOWN, np.maximum(a, b)).astype(np.int8)
+
+
+def fuzzy_and_array(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.minimum(a, b, dtype=np.int8)
+
+
+def fuzzy_eq_array(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.multiply(a, b, dtype=np.int8)
+
+
+def fuzzy_all(a: np.ndarray, axis=-1) -> np.ndarray:
+    """fuzzy_and over an axis, True for an empty one"""
+    return np.min(a, axis=axis, initial=TRUE).astype(np.int8)
+
+
+def fuzzy_any(a: np.ndarray, axis=-1) -> np.ndarray:
+    """fuzzy_or over an axis, False for an empty one"""
+    unknown = np.any(a == UNKNOWN, axis=axis)
+    return np.where(unknown, UNKNOWN, np.max(a, axis=axis, initial=FALSE)).astype(np.int8)
+
+
+def pack(a: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Packs the last axis into (known, value) bit vectors"""
+    return (np.packbits(a != UNKNOWN, axis=-1, bitorder="little"),
+            np.packbits(a == TRUE, axis=-1, bitorder="little"))
+
+
+def unpack(known: np.ndarray, value: np.ndarray, count: int) -> np.ndarray:
+    known = np.unpackbits(known, axis=-1, count=count, bitorder="little").astype(np.int8)
+    value = np.unpackbits(value, axis=-1, count=count, bitorder="little").astype(np.int8)
+    return known * (2 * value - 1)
+
+
+def packed_not(known, value):
+    return known, known & ~value
+
+
+def packed_or(known1, value1, known2, value2):
+    known = known1 & known2
+    return known, known & (value1 | value2)
+
+
+def packed_and(known1, value1, known2, value2):
+    false = (known1 & ~value1) | (known2 & ~value2)
+    true = known1 & value1 & known2 & value2
+    return false | true, true
+
+
+def packed_eq(known1, value1, known2, value2):
+    known = known1 & known2
+    return known, known & ~(value1 ^ value2)
@@ -0,0 +1,68 @@
+import random
+from typing import List, Tuple
+
+import pytest
+
+from krr_system import DomainDescription, Fluent, TimeDomainDescription
+
+NAMES = [f"f{i}" for i in range(6)]
+
+
+def _literal(r: random.Random, names: List[str], values=(True, False)) -> Fluent:
+    return Fluent(r.choice(names), r.choice(values))
+
+
+def make_domain(seed: int, cls=TimeDomainDescription, fluents: int = 6, actions: int = 4):
+    """
+    Small domain exercising the corners of the list-based engine: unknown initial values,
+    conditions on None or on fluents missing from the state, releases and impossibilities
+    """
+    r = random.Random(seed)
+    names = NAMES[:fluents]
+    domain = cls()
+    domain.initially(**{name: r.choice([True, False]) for name in names[:fluents // 2]})
+    for a in range(actions):
+        action = f"a{a}"
+        for _ in range(r.randint(1, 3)):
+            effects = list({f.name: f for f in (_literal(r, names) for _ in range(r.randint(1, 2)))}.values())
+            conditions = r.choice([None, [_literal(r, names + ["missing"], (True, False, None))
+                                          for _ in range(r.randint(0, 3))]])
+            if r.random() < 0.25:
+                domain.releases(action, effects, conditions)
+            else:
+                domain.causes(action, effects, conditions)
+        if r.random() < 0.5:
+            domain.impossible(action, [_literal(r, names) for _ in range(r.randint(1, 2))])
+        if isinstance(domain, TimeDomainDescription):
+            domain.duration(action, r.randint(1, 3))
+    return domain
+
+
+def make_occurances(seed: int, domain: DomainDescription, count: int = 8) -> List[Tuple[str, int]]:
+    r = random.Random(seed)
+    actions = sorted(domain._causes)
+    time, result = 1, []
+    for _ in range(count):
+        time += r.randint(0, 3)
+        result.append((r.choice(actions), time))
+    return result
+
+
+def plain_run(domain: TimeDomainDescription, action_occurances, after_time: float = float("inf")):
+    """
+    The list-based engine the scenario queries started from: a deep copy of the domain
+    runs every occurance up to after_time; None if one of them is not possible
+    """
+    assert isinstance(domain.fluents, dict) and domain._table is None, "needs a plain, uncompiled domain"
+    domain = domain.copy()
+    for action, time in action_occurances:
+        if time > after_time:
+            break
+        if domain.do_action(action, time) is False:
+            return None
+    return domain
+
+
+@pytest.fixture(params=range(40))
+def seed(request):
+    return request.param
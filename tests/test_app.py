@@ -0,0 +1,54 @@
+"""What app.py relies on to keep one domain and scenario per session between reruns"""
+from krr_system import Fluent
+from krr_system.store import Store
+
+
+def fill(store):
+    store.add_fluent("loaded")
+    store.add_fluent("alive")
+    store.add_action("load", 2)
+    store.add_action("shoot", 1)
+    store.add_statement("load", "causes", [("loaded", True)])
+    store.add_statement("shoot", "causes", [("alive", False)], [("loaded", True)])
+    store.add_initial_state("alive", True)
+    store.add_initial_state("loaded", False)
+    store.add_occurrence("load", 1)
+
+
+def test_reads_and_settings_keep_the_version():
+    with Store() as store:
+        fill(store)
+        version = store.version()
+        store.domain(), store.scenario(), store.fluents(), store.statements()
+        store.set_setting("conditions", "2")
+        with store.transaction(versioned=False):
+            store.set_setting("fluents", "3")
+        assert store.version() == version
+
+
+def test_model_writes_bump_the_version():
+    with Store() as store:
+        fill(store)
+        version = store.version()
+        store.add_occurrence("shoot", 3)
+        assert store.version() == version + 1
+        with store.transaction():
+            store.add_observation("alive", False, 4)
+            store.set_setting("fluents", "2")
+        assert store.version() == version + 2
+
+
+def test_reused_scenario_answers_like_a_rebuilt_one():
+    with Store() as store:
+        fill(store)
+        domain = store.domain()
+        live = store.scenario(domain)
+        assert live.check_if_condition_hold(Fluent("alive", False), 5) is False
+        store.add_occurrence("shoot", 3)
+        rebuilt = store.scenario()
+        assert store.domain().description() == domain.description()
+        live.action_occurances = rebuilt.action_occurances
+        for time in range(6):
+            for fluent in (Fluent("alive", False), Fluent("loaded", True)):
+                assert live.check_if_condition_hold(fluent, time) == rebuilt.check_if_condition_hold(fluent, time)
+        assert live.is_consistent() == rebuilt.is_consistent()
@@ -0,0 +1,45 @@
+import random
+
+import numpy as np
+import pytest
+
+from krr_system.batch import simulate_batch
+from krr_system.utils import FALSE, TRUE, UNKNOWN
+
+from conftest import make_domain, make_occurances, plain_run
+
+
+def test_batch_agrees_with_one_run_per_scenario(seed):
+    plain = make_domain(seed)
+    r = random.Random(seed)
+    lists = [make_occurances(seed * 100 + k, plain, r.randint(0, 10)) for k in range(20)]
+    result = simulate_batch(make_domain(seed), lists)
+    assert result.names == [name for name, _ in plain.state()]
+    for k, occurances in enumerate(lists):
+        run = plain_run(plain, occurances)
+        assert result.consistent[k] == (run is not None)
+        if run is not None:
+            codes = [TRUE if value is True else FALSE if value is False else UNKNOWN for _, value in run.state()]
+            assert list(result.states[k]) == codes
+
+
+def test_empty_batch():
+    result = simulate_batch(make_domain(0), [])
+    assert result.consistent.shape == (0,)
+    assert result.states.shape == (0, len(result.names))
+
+
+def test_unknown_action_raises():
+    with pytest.raises(KeyError):
+        simulate_batch(make_domain(0), [[("missing", 1)]])
+
+
+def test_states_are_int8():
+    result = simulate_batch(make_domain(0), [[("a0", 1)]])
+    assert result.states.dtype == np.int8
+
+
+def test_batch_leaves_the_domain_as_it_is():
+    domain = make_domain(0)
+    simulate_batch(domain, [make_occurances(0, domain)])
+    assert isinstance(domain.fluents, dict) and domain._table is None
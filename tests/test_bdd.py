@@ -0,0 +1,87 @@
+import itertools
+import random
+from bisect import bisect_right
+from itertools import accumulate
+
+from krr_system import Fluent
+from krr_system.bdd import BDD, FALSE, TRUE, SymbolicScenario
+from krr_system.state import check
+
+from conftest import make_domain
+
+
+def runs(domain, action_occurances):
+    """
+    Every two-valued run: unknown initial fluents and released fluents take both values,
+    and a rule whose condition requires a None value both fires and does not
+    """
+    domain = domain.copy().compiled()
+    state = domain.fluents
+    full = (1 << len(state)) - 1
+    unknown = [i for i in range(len(state)) if not state.known >> i & 1]
+    paths = []
+    for values in itertools.product([0, 1], repeat=len(unknown)):
+        start = state.value | sum(v << i for i, v in zip(unknown, values))
+        paths.append([start])
+    for action, _ in action_occurances:
+        table = domain._table[action]
+        extended = []
+        for path in paths:
+            if any(check(full, path[-1], clause) is True for clause in table.impossibles):
+                continue
+            states = [path[-1]]
+            for condition, effect in table.rules:
+                following = []
+                for s in states:
+                    met = check(full, s, condition)
+                    if met is not True:
+                        following.append(s)
+                    if met is False:
+                        continue
+                    s = (s & ~effect.mask & ~effect.release) | effect.bits
+                    released = [i for i in range(len(state)) if effect.release >> i & 1]
+                    for bits in itertools.product([0, 1], repeat=len(released)):
+                        following.append(s | sum(b << i for i, b in zip(released, bits)))
+                states = following
+            extended += [path + [s] for s in states]
+        paths = extended
+    return domain.fluents.index, paths
+
+
+def test_symbolic_scenario_agrees_with_enumerated_runs(seed):
+    domain = make_domain(seed, fluents=5, actions=3)
+    r = random.Random(seed)
+    names = sorted(domain.fluents)
+    occurances, end = [], domain.time
+    for _ in range(r.randint(1, 4)):
+        action = r.choice(sorted(domain._causes))
+        occurances.append((action, end))
+        end += domain.durations[action]
+    observations = [(Fluent(r.choice(names), r.choice([True, False])), r.randint(0, end))
+                    for _ in range(r.randint(0, 2))]
+    horizon = list(accumulate((time for _, time in occurances), max))
+
+    index, paths = runs(domain, occurances)
+
+    def holds(path, fluent, time):
+        return bool(path[bisect_right(horizon, time)] >> index[fluent.name] & 1) == fluent.value
+
+    paths = [path for path in paths if all(holds(path, f, t) for f, t in observations)]
+    scenario = SymbolicScenario(domain.copy(), observations, occurances)
+    assert scenario.is_consistent() == bool(paths)
+    for _ in range(4):
+        fluent, time = Fluent(r.choice(names), r.choice([True, False])), r.randint(0, end)
+        values = {holds(path, fluent, time) for path in paths}
+        expected = False if values <= {False} else True if values == {True} else None
+        assert scenario.check_if_condition_hold(fluent, time) == expected
+
+
+def test_bdd_operations():
+    bdd = BDD(3)
+    a, b = bdd.cube(1, 1), bdd.cube(2, 2)
+    assert bdd.and_(a, bdd.not_(a)) == FALSE
+    assert bdd.or_(a, bdd.not_(a)) == TRUE
+    assert bdd.and_(a, b) == bdd.cube(3, 3)
+    assert bdd.exists(bdd.and_(a, b), 1) == b
+    assert bdd.restrict(bdd.and_(a, b), 1, 1) == b
+    assert bdd.restrict(bdd.and_(a, b), 1, 0) == FALSE
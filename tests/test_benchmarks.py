@@ -0,0 +1,54 @@
+import io
+import json
+
+from benchmarks.generator import random_domain, random_occurances, random_scenario, random_statements
+from benchmarks.suite import cases, compare, main
+from krr_system import DomainDescription
+
+
+def test_generator_is_deterministic():
+    first, second = random_domain(3, fluents=8, actions=4), random_domain(3, fluents=8, actions=4)
+    assert first.description() == second.description()
+    assert first.durations == second.durations
+    assert random_occurances(first, 3, 20) == random_occurances(second, 3, 20)
+    assert random_domain(4, fluents=8, actions=4).description() != first.description()
+
+
+def test_generator_sizes():
+    domain = random_domain(0, fluents=10, actions=5, rules=3, cls=DomainDescription)
+    assert len(domain._causes) == 5
+    assert all(len(rules) == 3 for rules in domain._causes.values())
+    scenario = random_scenario(random_domain(0), occurances=30, observations=4)
+    assert len(scenario.action_occurances) == 30 and len(scenario.observations) == 4
+    times = [time for _, time in scenario.action_occurances]
+    assert times == sorted(times)
+
+
+def test_shared_statements_extend_earlier_prefixes():
+    statements = random_statements(random_domain(0, cls=DomainDescription), statements=50, length=6, shared=1.0)
+    assert all(len(statement.actions) == 6 for statement in statements)
+    firsts = {tuple(statement.actions[:1]) for statement in statements}
+    assert len(firsts) < 50
+
+
+def test_every_benchmark_runs():
+    small = [case for case in cases(quick=True) if case.params["fluents"] == 16]
+    assert {case.name for case in small} == {case.name for case in cases()}
+    for case in small:
+        case.setup(**case.params)()
+
+
+def test_compare_flags_slowdowns():
+    baseline = {"results": [{"key": "a", "seconds": 1.0}, {"key": "b", "seconds": 1.0}]}
+    results = {"results": [{"key": "a", "seconds": 1.1}, {"key": "b", "seconds": 2.0}, {"key": "c", "seconds": 9.0}]}
+    assert compare(results, baseline, 1.25, io.StringIO()) == ["b"]
+
+
+def test_main_writes_results(tmp_path):
+    output = tmp_path / "results.json"
+    assert main(["--quick", "--filter", "do_action[fluents=16,", "--repeat", "1", "--min-time", "0",
+                 "--output", str(output)]) == 0
+    results = json.loads(output.read_text())["results"]
+    assert [result["name"] for result in results] == ["do_action", "do_action"]
+    assert main(["--quick", "--filter", "do_action[fluents=16,", "--repeat", "1", "--min-time", "0",
+                 "--output", str(output), "--baseline", str(output), "--threshold", "0"]) == 1
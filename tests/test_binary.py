@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from krr_system import Fluent, Scenario, TimeDomainDescription
+from krr_system.binary import DomainFile, dumps, load, loads, save
+
+from conftest import make_domain, make_occurances
+
+
+def assert_same_domain(domain, decoded):
+    assert decoded.description() == domain.description()
+    assert ({action: [(list(effects), conditions) for effects, conditions in causes]
+             for action, causes in decoded._causes.items()}
+            == {action: [(list(effects), conditions) for effects, conditions in causes]
+                for action, causes in domain._causes.items()})
+    assert decoded.impossibles == domain.impossibles
+    assert decoded.durations == domain.durations
+    assert (decoded.time, decoded.termination_time) == (domain.time, domain.termination_time)
+    assert type(decoded.termination_time) is type(domain.termination_time)
+    assert dict(decoded.fluents) == dict(domain.fluents)
+    assert type(decoded.fluents) is type(domain.fluents)
+
+
+def test_round_trip(seed, tmp_path):
+    domain = make_domain(seed)
+    if seed % 3 == 0:
+        domain.terminate_time(30)
+    if seed % 4 == 1:
+        domain.compact()
+    r = random.Random(seed)
+    scenarios = []
+    for k in range(3):
+        observations = [(Fluent(f"f{r.randrange(6)}", r.random() < 0.5), r.randint(1, 20)) for _ in range(r.randint(0, 3))]
+        scenario = Scenario(domain, observations, make_occurances(seed * 10 + k, domain))
+        if k == 1:
+            scenario.set_observations_as_true()
+        scenarios.append(scenario)
+    if seed % 2:
+        decoded, decoded_scenarios = loads(dumps(domain, scenarios))
+    else:
+        save(str(tmp_path / "domain.krr"), domain, scenarios)
+        decoded, decoded_scenarios = load(str(tmp_path / "domain.krr"))
+
+    assert_same_domain(domain, decoded)
+    assert len(decoded_scenarios) == len(scenarios)
+    for scenario, other in zip(scenarios, decoded_scenarios):
+        assert scenario.action_occurances == other.action_occurances
+        assert scenario._assumed == other._assumed
+        assert scenario.is_consistent() == other.is_consistent()
+        for time in range(0, 25, 4):
+            for fluent in (Fluent("f0", True), Fluent("f3", False), Fluent("missing", True)):
+                assert scenario.check_if_condition_hold(fluent, time) == other.check_if_condition_hold(fluent, time)
+        assert scenario.infer_initial_state() == other.infer_initial_state()
+
+
+def test_empty_domain():
+    domain = TimeDomainDescription()
+    decoded, scenarios = loads(dumps(domain))
+    assert_same_domain(domain, decoded)
+    assert scenarios == []
+
+
+def test_occurances_are_read_without_building_the_domain():
+    domain = make_domain(7)
+    file = DomainFile(dumps(domain, [Scenario(domain, [], [("a1", 3), ("a0", 9)])]))
+    actions, times = file.occurances(0)
+    assert [file.action_names()[code] for code in actions.tolist()] == ["a1", "a0"]
+    assert times.tolist() == [3, 9]
+
+
+def test_foreign_data_is_refused():
+    with pytest.raises(ValueError):
+        DomainFile(b"NOPE" + bytes(8))
+    data = bytearray(dumps(TimeDomainDescription()))
+    data[4] = 99
+    with pytest.raises(ValueError, match="version"):
+        DomainFile(bytes(data))
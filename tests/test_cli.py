@@ -0,0 +1,85 @@
+import io
+import json
+
+import pytest
+
+from krr_system import binary
+from krr_system.cli import main, read_domain, run
+
+SHOOTING = """initially alive
+load causes loaded, ¬jammed lasts 2
+load releases hidden
+shoot causes ¬alive if loaded, ¬hidden, ¬jammed
+shoot causes ¬loaded, ¬jammed
+shoot lasts 1
+load occurs at 1
+shoot at 3
+"""
+
+QUERIES = [
+    {"id": "c", "query": "consistency"},
+    {"id": "a1", "query": "action", "action": "shoot", "time": 3},
+    {"id": "a2", "query": "action", "action": "shoot", "time": 4},
+    {"id": "h", "query": "condition", "fluents": {"loaded": False}, "time": 4},
+    {"id": "i", "query": "condition", "fluents": {"loaded": True}, "time": 2, "occurrences": [["load", 1]]},
+    {"id": "bad", "query": "nope"},
+    {"id": "x", "query": "consistency", "occurrences": [["fly", 1]]},
+    {"id": "y", "query": "consistency", "scenario": 3},
+]
+
+
+@pytest.fixture
+def domain_file(tmp_path):
+    path = tmp_path / "shooting.adl"
+    path.write_text(SHOOTING, encoding="utf-8")
+    return str(path)
+
+
+def answer(domain_file, lines, workers=1):
+    out = io.StringIO()
+    run(*read_domain(domain_file), io.StringIO("\n".join(lines) + "\n"), out, workers)
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_results_follow_the_queries(domain_file, workers):
+    results = answer(domain_file, [json.dumps(query) for query in QUERIES] + ["", "not json"], workers)
+    assert [result["id"] for result in results] == [query["id"] for query in QUERIES] + [10]
+    assert [result.get("result") for result in results[:5]] == [True, True, False, True, True]
+    assert "unknown query" in results[5]["error"]
+    assert results[6]["error"].startswith("KeyError")
+    assert results[7]["error"].startswith("line 8: IndexError")
+    assert results[8]["error"].startswith("line 10: JSONDecodeError")
+
+
+def test_inline_observations_are_applied(domain_file):
+    occurrences = [["shoot", 1]]
+    results = answer(domain_file, [
+        json.dumps({"query": "condition", "fluents": {"hidden": False}, "time": 2, "occurrences": occurrences}),
+        # the shot only kills if hidden was initially false
+        json.dumps({"query": "condition", "fluents": {"hidden": False}, "time": 2, "occurrences": occurrences,
+                    "observations": [[{"alive": False}, 2]]}),
+        # no execution leaves loaded true after the shot
+        json.dumps({"query": "consistency", "occurrences": occurrences, "observations": [[{"loaded": True}, 2]]}),
+    ])
+    assert [result["result"] for result in results] == [None, True, False]
+
+
+def test_binary_domain(domain_file, tmp_path):
+    path = str(tmp_path / "shooting.krr")
+    binary.save(path, *read_domain(domain_file))
+    assert answer(path, [json.dumps(QUERIES[1])]) == [{"id": "a1", "result": True}]
+
+
+def test_main(domain_file, tmp_path, capsys):
+    queries = tmp_path / "queries.jsonl"
+    queries.write_text(json.dumps(QUERIES[0]) + "\n")
+    main([domain_file, str(queries)])
+    assert json.loads(capsys.readouterr().out) == {"id": "c", "result": True}
+
+
+@pytest.mark.parametrize("workers", ["0", "-1", "x"])
+def test_workers_must_be_positive(domain_file, workers, capsys):
+    with pytest.raises(SystemExit):
+        main([domain_file, "--workers", workers])
+    assert "--workers" in capsys.readouterr().err
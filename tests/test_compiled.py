@@ -0,0 +1,58 @@
+import random
+
+from krr_system import DomainDescription, Fluent, TimeDomainDescription
+from krr_system.compiled import compile_domain, covers
+from krr_system.state import BitState
+
+from conftest import make_domain, make_occurances
+
+
+def test_compiled_domain_agrees_with_list_rules(seed):
+    plain = make_domain(seed, cls=DomainDescription)
+    compiled = make_domain(seed, cls=DomainDescription).compile()
+    r = random.Random(seed)
+    for _ in range(12):
+        action = r.choice(sorted(plain._causes))
+        assert plain.do_action(action) == compiled.do_action(action)
+        assert plain.state() == compiled.state()
+
+
+def test_compiled_time_domain_agrees_with_list_rules(seed):
+    plain = make_domain(seed)
+    compiled = make_domain(seed).compile()
+    for action, time in make_occurances(seed, plain):
+        assert plain.do_action(action, time) == compiled.do_action(action, time)
+        assert plain.state() == compiled.state()
+        assert plain.time == compiled.time
+
+
+def test_repeated_rules_and_covered_clauses_are_dropped():
+    domain = DomainDescription()
+    domain.initially(a=True, b=None)
+    domain.causes("x", Fluent("b", True))
+    domain.causes("x", Fluent("b", True), conditions=[Fluent("a", True)])
+    domain.impossible("x", [Fluent("a", True), Fluent("b", False)])
+    domain.impossible("x", [Fluent("a", True)])
+    table = compile_domain(domain.compact())["x"]
+    assert len(table.rules) == 1
+    assert len(table.impossibles) == 1
+
+
+def test_covers():
+    state = BitState({"a": Fluent("a", True), "b": Fluent("b", True)})
+    a, ab = state.condition([Fluent("a", True)]), state.condition([Fluent("a", True), Fluent("b", False)])
+    assert covers(a, ab) and not covers(ab, a)
+    assert covers(a, state.condition([Fluent("missing", True)]))
+    assert not covers(state.condition([Fluent("a", None)]), a)
+
+
+def test_changes_drop_the_table():
+    domain = TimeDomainDescription()
+    domain.initially(a=False)
+    domain.causes("x", Fluent("a", True))
+    domain.compile()
+    domain.causes("y", Fluent("a", False))
+    assert domain._table is None
+    domain.do_action("x", 1)
+    domain.do_action("y", 2)
+    assert domain.state() == [("a", False)]
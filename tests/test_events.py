@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from krr_system import Fluent, TimeDomainDescription
+from krr_system.events import execute
+
+from conftest import make_domain
+
+
+def test_back_to_back_occurances_match_do_action(seed):
+    plain = make_domain(seed)
+    r = random.Random(seed)
+    time, occurances = 1, []
+    for _ in range(12):
+        action = r.choice(sorted(plain._causes))
+        occurances.append((action, time))
+        time += plain.durations[action] + r.randint(0, 1)
+
+    failed = None
+    for i, (action, start) in enumerate(occurances):
+        if plain.do_action(action, start) is False:
+            failed = i
+            break
+    domain = make_domain(seed)
+    execution = execute(domain, occurances)
+    assert isinstance(domain.fluents, dict) and domain._table is None
+    assert execution.consistent == (failed is None)
+    assert execution.failed == failed and execution.conflicting is None
+    if failed is None:
+        state = make_domain(seed).compact().fluents
+        state.known, state.value = execution.known, execution.value
+        assert [(name, state[name].value) for name in state] == plain.state()
+
+
+@pytest.fixture
+def overlapping():
+    domain = TimeDomainDescription()
+    domain.initially(a=False, b=False)
+    domain.causes("x", Fluent("a", True))
+    domain.duration("x", 3)
+    domain.causes("y", Fluent("b", True))
+    domain.duration("y", 2)
+    domain.causes("z", Fluent("a", False))
+    domain.duration("z", 1)
+    domain.impossible("w", Fluent("a", False))
+    domain.causes("w", Fluent("b", False))
+    domain.duration("w", 1)
+    return domain
+
+
+def test_actions_on_other_fluents_overlap(overlapping):
+    execution = execute(overlapping, [("x", 1), ("y", 2)])
+    assert execution.consistent and (execution.known, execution.value, execution.time) == (3, 3, 4)
+
+
+def test_running_actions_setting_different_values_conflict(overlapping):
+    execution = execute(overlapping, [("x", 1), ("z", 2)])
+    assert not execution.consistent and (execution.failed, execution.conflicting) == (1, 0)
+
+
+def test_running_actions_setting_the_same_value_agree(overlapping):
+    assert execute(overlapping, [("x", 1), ("x", 2)]).consistent
+
+
+def test_effects_are_seen_only_once_the_action_ends(overlapping):
+    early = execute(overlapping, [("x", 1), ("w", 3)])
+    assert not early.consistent and (early.failed, early.conflicting) == (1, None)
+    assert execute(overlapping, [("x", 1), ("w", 4)]).consistent
+    assert execute(overlapping, [("x", 1), ("z", 4)]).value == 0
+
+
+def test_occurances_before_the_domain_time_fail(overlapping):
+    overlapping.time = 5
+    assert execute(overlapping, [("x", 4)]).failed == 0
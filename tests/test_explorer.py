@@ -0,0 +1,71 @@
+from krr_system import DomainDescription, Fluent, TimeDomainDescription
+from krr_system.explorer import explore
+from krr_system.planner import plan
+
+from conftest import make_domain
+
+
+def plain_states(domain):
+    """Reachable states by breadth-first search over copies of the list-based domain"""
+    seen = {tuple(domain.state()): domain}
+    frontier = [domain]
+    while frontier:
+        following = []
+        for state in frontier:
+            for action in sorted(state._causes):
+                successor = state.copy()
+                if successor.do_action(action) is False:
+                    continue
+                key = tuple(successor.state())
+                if key not in seen:
+                    seen[key] = successor
+                    following.append(successor)
+        frontier = following
+    return set(seen)
+
+
+def test_explored_states_match_a_plain_search(seed):
+    domain = make_domain(seed, cls=DomainDescription, fluents=5, actions=3)
+    graph = explore(domain)
+    assert isinstance(domain.fluents, dict) and domain._table is None
+    assert graph.complete
+    states = {tuple(graph.state(i)) for i in range(len(graph))}
+    assert states == plain_states(domain)
+    assert graph.state(0) == domain.state()
+    assert graph.reachable().all()
+
+
+def test_shortest_path_agrees_with_the_planner(seed):
+    domain = make_domain(seed, fluents=5, actions=3)
+    graph = explore(domain)
+    goal = [Fluent(f"f{seed % 5}", seed % 2 == 0)]
+    path, planned = graph.shortest_path(goal), plan(domain, goal)
+
+    def cost(occurances):
+        return None if occurances is None else sum(domain.durations[action] for action, _ in occurances)
+
+    assert cost(path) == cost(planned)
+    assert (graph.can_hold(goal) is True) == (planned is not None)
+
+
+def test_budget_cuts_the_exploration_short():
+    domain = TimeDomainDescription()
+    domain.initially(**{f"b{i}": False for i in range(8)})
+    for i in range(8):
+        domain.causes(f"t{i}", Fluent(f"b{i}", True))
+    graph = explore(domain)
+    assert len(graph) == 2 ** 8 and graph.complete
+    assert len(graph.shortest_path([Fluent(f"b{i}", True) for i in range(8)])) == 8
+    small = explore(domain, max_states=10)
+    assert len(small) <= 10 and not small.complete
+
+
+def test_edges_follow_the_actions():
+    domain = TimeDomainDescription()
+    domain.initially(a=False)
+    domain.causes("on", Fluent("a", True))
+    domain.causes("off", Fluent("a", False))
+    graph = explore(domain)
+    assert len(graph) == 2
+    assert sorted(graph.edges(0)) == [("off", 0), ("on", 1)]
+    assert graph.can_hold(Fluent("missing", True)) is False
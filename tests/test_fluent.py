@@ -0,0 +1,55 @@
+import copy
+import gc
+import pickle
+
+import pytest
+
+from krr_system import Fluent
+
+
+def test_equal_fluents_are_the_same_object():
+    assert Fluent("alive", True) is Fluent(alive=True)
+    assert Fluent("alive", True) is not Fluent("alive", False)
+    assert Fluent("alive", None) is Fluent(alive=None)
+
+
+def test_fluents_are_immutable():
+    fluent = Fluent("alive", True)
+    with pytest.raises(AttributeError):
+        fluent.value = False
+    with pytest.raises(AttributeError):
+        fluent.other = 1
+    assert not hasattr(fluent, "__dict__")
+
+
+def test_copies_and_pickles_keep_the_interned_object():
+    fluent = Fluent("alive", False)
+    assert copy.copy(fluent) is fluent
+    assert copy.deepcopy([fluent])[0] is fluent
+    assert pickle.loads(pickle.dumps(fluent)) is fluent
+
+
+def test_three_valued_comparisons():
+    assert (Fluent("a", True) == True) is True
+    assert (Fluent("a", True) == False) is False
+    assert (Fluent("a", None) == True) is None
+    assert (Fluent("a", True) == Fluent("a", True)) is True
+    assert (Fluent("a", True) == Fluent("b", True)) is False
+    assert (Fluent("a", True) == "a") is False
+    assert hash(Fluent("a", True)) == hash(("a", True))
+
+
+def test_values_are_stored_as_bool():
+    assert Fluent("spelled", 1).value is True
+    assert Fluent("spelled", True) is Fluent("spelled", 1)
+    assert repr(Fluent(spelled=0)) == "spelled=False"
+    assert bool(Fluent(spelled=1)) is True
+
+
+def test_unused_fluents_leave_the_pool():
+    Fluent("short_lived", True)
+    gc.collect()
+    assert ("short_lived", True) not in Fluent._pool
+    kept = Fluent("long_lived", True)
+    gc.collect()
+    assert Fluent._pool[("long_lived", True)] is kept
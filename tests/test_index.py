@@ -0,0 +1,70 @@
+import random
+
+from benchmarks.generator import random_domain, random_occurances
+from krr_system import DomainDescription, Fluent, Scenario
+from krr_system.compiled import check_possible, run_rules
+from krr_system.index import RuleIndex
+
+from conftest import make_domain, make_occurances, plain_run
+
+
+def test_index_answers_like_the_tables(seed):
+    domain = make_domain(seed, cls=DomainDescription).compile()
+    tables = domain._table
+    state = domain.fluents
+    index = RuleIndex(tables)
+    full = (1 << len(state)) - 1
+    r = random.Random(seed)
+    known, value = state.known, state.value
+    for _ in range(50):
+        if r.random() < 0.2:
+            # an unrelated state, so many conditions change at once
+            known = r.getrandbits(len(state)) & full
+            value = r.getrandbits(len(state)) & known
+        action = r.choice(sorted(tables))
+        possible = check_possible(known, value, tables[action])
+        assert index.possible(action, known, value) == possible
+        following = run_rules(known, value, tables[action], possible)
+        assert index.run(action, known, value, possible) == following
+        known, value = following
+
+
+def test_incremental_domain_agrees_with_the_plain_run(seed):
+    plain = make_domain(seed)
+    occurances = make_occurances(seed, plain, count=15)
+    incremental = make_domain(seed).compile(incremental=True)
+    scenario = Scenario(incremental, [], occurances)
+    assert scenario.domain._index is not None
+    run = plain_run(plain, occurances)
+    assert scenario.is_consistent() == (run is not None)
+    if run is not None:
+        for name, _ in run.state():
+            for fluent in (Fluent(name, True), Fluent(name, False)):
+                assert scenario.check_if_condition_hold(fluent, 10 ** 9) == run._check([fluent])
+
+
+def test_many_rules_per_action():
+    domain = random_domain(3, fluents=40, actions=8, rules=64, conditions=3)
+    indexed = random_domain(3, fluents=40, actions=8, rules=64, conditions=3).compile(incremental=True)
+    occurances = random_occurances(domain, 3, 300)
+    plain, fast = Scenario(domain, [], occurances), Scenario(indexed, [], occurances)
+    assert plain.is_consistent() == fast.is_consistent()
+    assert plain._checkpoints == fast._checkpoints
+
+
+def test_the_choice_survives_changes():
+    domain = make_domain(0).compile(incremental=True)
+    domain.initially(f0=True)
+    assert domain._table is None
+    assert domain.compiled()._index is not None
+    assert make_domain(0).compiled()._index is None
+
+
+def test_actions_are_indexed_when_first_used():
+    domain = make_domain(0).compile(incremental=True)
+    assert domain._index.actions == {}
+    fork = domain.fork()
+    assert fork._index.actions == {} and fork._index is not domain._index
+    action = sorted(fork._table)[0]
+    fork.do_action(action, fork.time)
+    assert list(fork._index.actions) == [action] and domain._index.actions == {}
@@ -0,0 +1,59 @@
+import itertools
+import random
+
+from krr_system import Fluent, Scenario
+from krr_system.examples import example1
+from krr_system.inference import infer, observations_by_time
+
+from conftest import make_domain, plain_run
+
+
+def completions(domain, observations, occurances):
+    """Every assignment of the unknown initial fluents under which the scenario runs and the observations hold"""
+    unknown = [name for name, value in domain.state() if value is None]
+    for values in itertools.product([True, False], repeat=len(unknown)):
+        assignment = dict(zip(unknown, values))
+        complete = domain.copy()
+        complete.initially(**assignment)
+        if plain_run(complete, occurances) is None:
+            continue
+        if all(plain_run(complete, occurances, time)._check([fluent]) is True for fluent, time in observations):
+            yield assignment
+
+
+def test_inference_is_sound(seed):
+    domain = make_domain(seed)
+    r = random.Random(seed)
+    # each action starts when the previous one ends, so most scenarios run
+    occurances, time = [], domain.time
+    for _ in range(r.randint(1, 5)):
+        action = r.choice(sorted(domain._causes))
+        occurances.append((action, time))
+        time += domain.durations[action]
+    observations = [(Fluent(f"f{r.randrange(6)}", r.choice([True, False])), r.randint(0, time))
+                    for _ in range(r.randint(1, 3))]
+    result = infer(domain.copy(), observations, occurances)
+    models = list(completions(domain, observations, occurances))
+    if result.consistent is False:
+        assert not models
+    for model in models:
+        assert all(model[name] == value for name, value in result.initial.items())
+    if result.consistent is True:
+        unknown = sum(value is None for _, value in domain.state())
+        agreeing = [model for model in models if all(model[name] == value for name, value in result.initial.items())]
+        assert len(agreeing) == 2 ** (unknown - len(result.initial))
+
+
+def test_observation_fixes_an_unknown_initial_fluent():
+    domain = example1.copy()
+    domain.initially(loaded=None)
+    scenario = Scenario(domain, [(Fluent("loaded", True), 0)], [("shoot", 1)])
+    assert scenario.infer_initial_state().initial == {"loaded": True}
+    assert scenario.set_observations_as_true() is not False
+    assert scenario.check_if_condition_hold(Fluent("loaded", False), 2) is True
+
+
+def test_observations_by_time_accepts_one_pair():
+    assert observations_by_time((Fluent("a", True), 3)) == [([Fluent("a", True)], 3)]
+    assert observations_by_time([([Fluent("a", True)], 3)]) == [([Fluent("a", True)], 3)]
+    assert observations_by_time([]) == []
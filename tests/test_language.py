@@ -0,0 +1,64 @@
+import pytest
+
+from krr_system import Fluent
+from krr_system.examples import example1
+from krr_system.language import ParseError, load, load_file, load_scenario, parse
+
+SHOOTING = """
+# shooting
+initially alive
+load causes loaded, ¬jammed lasts 2
+load releases hidden
+jam causes jammed if loaded
+shoot causes ¬alive if loaded, not hidden, ~jammed
+shoot causes ¬loaded, ¬jammed
+jam lasts 1
+shoot lasts 1
+observed ¬alive at 5
+load occurs at 1
+shoot at 3
+"""
+
+
+def test_text_builds_the_same_domain_as_the_api():
+    description = load(SHOOTING)
+    assert description.domain.description() == example1.description()
+    assert description.domain.durations == example1.durations
+    assert description.observations == [([Fluent("alive", False)], 5)]
+    assert description.action_occurances == [("load", 1), ("shoot", 3)]
+
+
+def test_load_file_and_scenario(tmp_path):
+    path = tmp_path / "shooting.adl"
+    path.write_text(SHOOTING, encoding="utf-8")
+    assert load_file(str(path)).domain.description() == example1.description()
+    scenario = load_scenario(SHOOTING)
+    assert scenario.is_consistent()
+    assert scenario.check_if_condition_hold(Fluent("loaded", False), 4) is True
+
+
+def test_sentences():
+    sentence, = parse("impossible paint if ¬inspired  # comment")
+    assert (sentence.kind, sentence.action, sentence.conditions) == ("impossible", "paint", [Fluent("inspired", False)])
+    assert [s.kind for s in parse("a causes b\n\na lasts 2\nobserved b at 3")] == ["causes", "lasts", "observed"]
+
+
+@pytest.mark.parametrize("text", ["shoot causes", "shoot kills x", "observed a at x", "a causes b if", "initially ¬",
+                                  "x lasts 0", "a causes b $", "impossible if a", "causes a"])
+def test_errors_name_the_line(text):
+    with pytest.raises(ParseError) as error:
+        load("\n\n" + text)
+    assert error.value.line == 3
+    assert str(error.value).startswith("line 3: ")
+
+
+def test_lines_are_parsed_as_they_are_read():
+    def lines():
+        yield "a causes b"
+        yield "a $"
+        raise AssertionError("read past the bad line")
+
+    sentences = parse(lines())
+    assert next(sentences).kind == "causes"
+    with pytest.raises(ParseError):
+        next(sentences)
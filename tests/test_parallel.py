@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from krr_system import DomainDescription, Fluent, Scenario, Statement, Structure
+from krr_system.examples import example1
+from krr_system.parallel import QueryBatch, run_query_batches, run_scenarios, run_statements
+
+from conftest import make_domain, make_occurances
+
+
+def test_run_scenarios_keeps_the_order_of_the_lists():
+    domain = make_domain(5)
+    lists = [make_occurances(k, domain) for k in range(60)]
+    expected = [Scenario(domain, [], occurances).is_consistent() for occurances in lists]
+    assert run_scenarios(domain, lists, workers=2) == expected
+
+
+def test_run_statements_matches_structure():
+    domain = make_domain(7, cls=DomainDescription)
+    r = random.Random(1)
+    statements = [Statement([Fluent(f"f{r.randrange(6)}", True)], [r.choice(sorted(domain._causes)) for _ in range(3)])
+                  for _ in range(60)]
+    expected = [Structure(domain).is_statement_true(statement) for statement in statements]
+    assert run_statements(domain, statements, workers=2, chunksize=7) == expected
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_query_batches(workers):
+    occurances = [("load", 1), ("shoot", 3)]
+    batches = [
+        QueryBatch([], occurances, {}, [([Fluent("loaded", False)], 5)], [("shoot", 3), ("load", 2)]),
+        QueryBatch([], [("missing", 1)], {}, [], []),
+        # no run of the scenario leaves loaded True
+        QueryBatch([(Fluent("loaded", True), 5)], occurances, None, [([Fluent("alive", True)], 0)], [("load", 1)]),
+        QueryBatch([(Fluent("hidden", False), 5)], occurances, None, [([Fluent("alive", False)], 5)], []),
+    ]
+    results = list(run_query_batches(example1, batches, workers=workers))
+    assert results[0] == (True, [True], [True, False])
+    assert results[1].startswith("KeyError")
+    assert results[2] == (False, [False], [False])
+    assert results[3][0] is True
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_the_domain_is_left_as_it_is(workers):
+    domain = make_domain(3)
+    batches = [QueryBatch([], make_occurances(3, domain), {}, [], [])]
+    list(run_query_batches(domain, batches, workers=workers))
+    run_scenarios(domain, [make_occurances(4, domain)], workers=workers)
+    assert isinstance(domain.fluents, dict) and domain._table is None
@@ -0,0 +1,72 @@
+import itertools
+import random
+
+from krr_system import Fluent, TimeDomainDescription
+from krr_system.examples import example1, example3
+from krr_system.planner import plan
+
+from conftest import make_domain, plain_run
+
+
+def back_to_back(domain, actions):
+    time, occurances = domain.time, []
+    for action in actions:
+        occurances.append((action, time))
+        time += domain.durations.get(action, 1)
+    return occurances, time - domain.time
+
+
+def reaches(domain, occurances, goal):
+    run = plain_run(domain, occurances)
+    return run is not None and run._check(goal) is True
+
+
+def test_plan_is_valid_and_no_longer_than_any_short_sequence(seed):
+    domain = make_domain(seed, fluents=5, actions=3)
+    r = random.Random(seed)
+    goal = [Fluent(f"f{r.randrange(5)}", r.choice([True, False]))]
+    found = plan(domain, goal)
+    best = None
+    for length in range(5):
+        for actions in itertools.product(sorted(domain._causes), repeat=length):
+            occurances, cost = back_to_back(domain, actions)
+            if reaches(domain, occurances, goal):
+                best = cost if best is None else min(best, cost)
+    if found is not None:
+        assert reaches(domain, found, goal)
+        assert [time for _, time in found] == [time for _, time in back_to_back(domain, [a for a, _ in found])[0]]
+    if best is not None:
+        assert found is not None
+        assert back_to_back(domain, [a for a, _ in found])[1] <= best
+
+
+def test_examples():
+    assert plan(example3, Fluent("painted", True)) == [("paint", 1)]
+    assert plan(example1, Fluent("loaded", True)) == [("load", 1)]
+    assert plan(example1, Fluent("loaded", True), deadline=1) is None
+
+
+def test_goal_no_action_sets_is_refused_without_a_deadline():
+    domain = TimeDomainDescription()
+    domain.initially(a=False, b=False)
+    domain.causes("x", Fluent("a", True))
+    domain.causes("y", Fluent("a", False))
+    assert plan(domain, Fluent("b", True), deadline=float("inf")) is None
+    assert plan(domain, [Fluent("a", True), Fluent("b", True)], deadline=float("inf")) is None
+    assert plan(domain, Fluent("a", True), deadline=float("inf")) == [("x", 1)]
+
+
+def test_max_states_stops_the_search():
+    domain = TimeDomainDescription()
+    domain.initially(**{f"b{i}": False for i in range(6)})
+    for i in range(6):
+        domain.causes(f"t{i}", Fluent(f"b{i}", True))
+    goal = [Fluent(f"b{i}", True) for i in range(6)]
+    assert len(plan(domain, goal, deadline=float("inf"))) == 6
+    assert plan(domain, goal, deadline=float("inf"), max_states=2) is None
+
+
+def test_plan_leaves_the_domain_as_it_is():
+    domain = make_domain(0)
+    plan(domain, [Fluent("f0", True)])
+    assert isinstance(domain.fluents, dict) and domain._table is None
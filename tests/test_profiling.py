@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from krr_system import DomainDescription, Fluent, Scenario, Statement, Structure
+from krr_system.examples import example1
+from krr_system.profiling import Profile
+
+
+def test_counts_calls_and_actions():
+    scenario = Scenario(example1, [], [("load", 1), ("shoot", 3)])
+    with Profile(trace_actions=True) as profile:
+        assert scenario.is_consistent()
+        scenario.check_if_condition_hold(Fluent("alive", False), 5)
+    stats = profile.to_dict()
+    assert stats["calls"]["Scenario.is_consistent"]["count"] == 1
+    assert stats["calls"]["Scenario.check_if_condition_hold"]["count"] == 1
+    assert stats["actions"]["load"]["executed"] == 1
+    assert stats["actions"]["shoot"]["checks"] == 1
+    assert stats["actions"]["shoot"]["rules"] == 2
+    names = {event["name"] for event in profile.chrome_trace()["traceEvents"]}
+    assert {"Scenario.is_consistent", "load", "shoot possible"} <= names
+    assert "Scenario.is_consistent" in profile.summary()
+
+
+def test_classes_are_restored_afterwards():
+    methods = (Scenario.is_consistent, Structure.is_statement_true, DomainDescription._possible,
+               DomainDescription._apply, DomainDescription.snapshot)
+    with Profile():
+        assert Scenario.is_consistent is not methods[0]
+    assert (Scenario.is_consistent, Structure.is_statement_true, DomainDescription._possible,
+            DomainDescription._apply, DomainDescription.snapshot) == methods
+
+
+def test_answers_do_not_change():
+    domain = DomainDescription()
+    domain.initially(loaded=False)
+    domain.causes("load", Fluent("loaded", True))
+    statement = Statement([Fluent("loaded", True)], ["load"])
+    expected = Structure(domain).is_statement_true(statement)
+    with Profile() as profile:
+        assert Structure(domain).is_statement_true(statement) == expected
+    assert profile.calls["Structure.is_statement_true"][0] == 1
+
+
+def test_one_profile_at_a_time():
+    with Profile():
+        with pytest.raises(RuntimeError):
+            with Profile():
+                pass
+
+
+def test_exports(tmp_path):
+    with Profile() as profile:
+        Scenario(example1, [], [("load", 1)]).is_consistent()
+    assert json.loads(profile.to_json(str(tmp_path / "profile.json"))) == json.loads(
+        (tmp_path / "profile.json").read_text())
+    profile.save_chrome_trace(str(tmp_path / "trace.json"))
+    trace = json.loads((tmp_path / "trace.json").read_text())
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in trace["traceEvents"])
+
+
+def test_forks_count_as_domain_copies():
+    compiled, plain = example1.copy().compiled(), example1.copy()
+    with Profile() as profile:
+        for _ in range(5):
+            Scenario(compiled, [], [("load", 1)]).is_consistent()
+        Structure(plain)  # forking a domain that is not compiled copies it, counted once
+    assert profile.to_dict()["calls"]["domain copies"]["count"] == 6
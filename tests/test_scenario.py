@@ -0,0 +1,106 @@
+import random
+
+from krr_system import Fluent, Scenario
+from krr_system.examples import example1
+
+from conftest import make_domain, make_occurances, plain_run
+
+
+def expected_hold(domain, occurances, conditions, time):
+    run = plain_run(domain, occurances, time)
+    return False if run is None else run._check(conditions)
+
+
+def test_cached_timeline_answers_queries_in_any_order(seed):
+    domain = make_domain(seed)
+    occurances = make_occurances(seed, domain)
+    scenario = Scenario(domain, [], occurances)
+    r = random.Random(seed)
+    for _ in range(20):
+        conditions, time = [Fluent(f"f{r.randrange(6)}", r.choice([True, False]))], r.randint(0, 30)
+        assert scenario.check_if_condition_hold(conditions, time) == expected_hold(domain, occurances, conditions, time)
+
+
+def test_changing_the_domain_drops_the_timeline():
+    scenario = Scenario(example1.copy(), [], [("load", 1), ("jam", 3), ("shoot", 4)])
+    assert scenario.check_if_condition_hold(Fluent("loaded", True), 3) is True
+    scenario.domain.causes("jam", Fluent("loaded", False))
+    assert scenario.check_if_condition_hold(Fluent("loaded", True), 3) is False
+
+
+def test_changing_the_occurances_drops_the_timeline():
+    scenario = Scenario(example1.copy(), [], [("load", 1), ("shoot", 3)])
+    assert scenario.check_if_condition_hold(Fluent("loaded", False), 5) is True
+    scenario.action_occurances = [("load", 1)]
+    assert scenario.check_if_condition_hold(Fluent("loaded", True), 5) is True
+
+
+def test_inconsistency_is_reported_once_reached(seed, capsys):
+    domain = make_domain(seed)
+    occurances = make_occurances(seed, domain, count=3)
+    scenario = Scenario(domain, [], occurances)
+    consistent = plain_run(domain, occurances) is not None
+    assert scenario.is_consistent(verbose=True) == consistent
+    assert ("breaks consistency" in capsys.readouterr().out) != consistent
+
+
+def test_query_many_matches_single_queries(seed):
+    domain = make_domain(seed)
+    occurances = make_occurances(seed, domain)
+    r = random.Random(seed)
+    conditions = [(Fluent(f"f{r.randrange(6)}", r.choice([True, False])), r.randint(0, 30)) for _ in range(8)]
+    actions = [(r.choice(sorted(domain._causes)), r.randint(0, 30)) for _ in range(3)] + [occurances[1]]
+    single = Scenario(domain, [], occurances)
+    expected = ([single.check_if_condition_hold(c, t) for c, t in conditions],
+                [single.does_action_perform(a, t) for a, t in actions])
+    assert Scenario(domain, [], occurances).query_many(conditions, actions) == expected
+
+
+def test_query_many_without_queries():
+    assert Scenario(example1.copy(), [], []).query_many() == ([], [])
+
+
+def assert_like_a_fresh_scenario(scenario, domain, occurances):
+    fresh = Scenario(domain, [], occurances)
+    assert scenario.action_occurances == fresh.action_occurances
+    assert scenario.is_consistent() == fresh.is_consistent()
+    for time in range(0, 40, 2):
+        assert scenario.check_if_condition_hold(Fluent("f1", True), time) == fresh.check_if_condition_hold(
+            Fluent("f1", True), time)
+    for action, time in occurances[:3] + [("a0", 5)]:
+        assert scenario.does_action_perform(action, time) == fresh.does_action_perform(action, time)
+
+
+def test_edited_occurances_answer_like_a_fresh_scenario(seed):
+    domain = make_domain(seed)
+    actions = sorted(domain._causes)
+    r = random.Random(seed)
+    occurances = []
+    scenario = Scenario(domain, [], [])
+    for step in range(30):
+        edit = r.random()
+        if edit < 0.5 or not occurances:
+            action, time = r.choice(actions), (occurances[-1][1] if occurances else 1) + r.randint(0, 3)
+            occurances.append((action, time))
+            assert scenario.append_occurrence(action, time) == Scenario(domain, [], occurances).is_consistent()
+        elif edit < 0.65:
+            i = r.randrange(len(occurances))
+            del occurances[i]
+            scenario.remove_occurrence(i)
+        elif edit < 0.8:
+            i = r.randrange(len(occurances))
+            occurances[i] = (r.choice(actions), r.randint(1, 40))
+            scenario.replace_occurrence(i, *occurances[i])
+        else:
+            occurances = occurances[:r.randint(0, len(occurances))] + make_occurances(seed + step, domain, r.randint(0, 3))
+            scenario.action_occurances = occurances
+        if r.random() < 0.6:
+            assert_like_a_fresh_scenario(scenario, domain, occurances)
+
+
+def test_negative_indices_count_from_the_end():
+    scenario = Scenario(example1, [], [("load", 1), ("shoot", 3)])
+    scenario.remove_occurrence(-1)
+    assert scenario.action_occurances == (("load", 1),)
+    scenario.replace_occurrence(-1, "shoot", 1)
+    assert scenario.action_occurances == (("shoot", 1),)
@@ -0,0 +1,56 @@
+from krr_system import DomainDescription, Fluent, Scenario, Statement, Structure
+
+from conftest import make_domain, make_occurances, plain_run
+
+
+def test_restore_rolls_back_every_kind_of_state(seed):
+    for domain in (make_domain(seed), make_domain(seed).compact(), make_domain(seed).compile()):
+        before, start, snapshot = domain.state(), domain.time, domain.snapshot()
+        for action, time in make_occurances(seed, domain):
+            domain.do_action(action, time)
+        domain.restore(snapshot)
+        assert domain.state() == before
+        assert domain.time == start
+
+
+def test_fork_shares_no_state():
+    domain = make_domain(1).compile()
+    fork, time = domain.fork(), domain.time
+    fork.do_action("a0", 5)
+    fork.causes("a0", Fluent("f0", True))
+    fork.initially(extra=True)
+    assert "extra" not in domain.fluents and domain.time == time
+    assert domain._table is not None and len(domain._causes["a0"]) < len(fork._causes["a0"])
+
+
+def test_scenario_leaves_the_domain_alone(seed):
+    domain = make_domain(seed)
+    description, state = domain.description(), domain.state()
+    scenario = Scenario(domain, [], make_occurances(seed, domain))
+    scenario.is_consistent()
+    scenario.check_if_condition_hold(Fluent("f0", True), 10)
+    assert domain.description() == description and domain.state() == state
+    assert domain._table is None and isinstance(domain.fluents, dict)
+
+
+def test_scenario_agrees_with_the_plain_run(seed):
+    domain = make_domain(seed)
+    occurances = make_occurances(seed, domain)
+    scenario = Scenario(domain, [], occurances)
+    assert scenario.is_consistent() == (plain_run(domain, occurances) is not None)
+    for time in range(0, 30, 3):
+        run = plain_run(domain, occurances, time)
+        expected = False if run is None else run._check([Fluent("f1", True)])
+        assert scenario.check_if_condition_hold(Fluent("f1", True), time) == expected
+
+
+def test_structure_leaves_the_model_alone(seed):
+    domain = make_domain(seed, cls=DomainDescription)
+    state = domain.state()
+    structure = Structure(domain)
+    statement = Statement([Fluent("f2", True)], ["a0", "a1", "a0"])
+    expected = domain.copy()
+    for action in statement.actions:
+        expected.do_action(action)
+    assert structure.is_statement_true(statement) == expected._check(statement.fluents)
+    assert domain.state() == state and domain._table is None
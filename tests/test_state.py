@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from krr_system import BitState, DomainDescription, Fluent
+
+from conftest import NAMES, make_domain
+
+
+def test_bitstate_behaves_like_a_dict():
+    state = BitState({"a": Fluent("a", True), "b": Fluent("b", None)})
+    state["c"] = Fluent("c", False)
+    state["a"] = Fluent("a", None)
+    assert list(state) == ["a", "b", "c"]
+    assert len(state) == 3 and "b" in state and "d" not in state
+    assert [state[name].value for name in state] == [None, None, False]
+    assert state["c"] is Fluent("c", False)
+    with pytest.raises(KeyError):
+        state["d"]
+
+
+def test_bitstate_copy_is_independent():
+    state = BitState({"a": Fluent("a", True)})
+    copy = state.copy()
+    copy["a"] = Fluent("a", False)
+    copy["b"] = Fluent("b", True)
+    assert dict(state.items()) == {"a": Fluent("a", True)}
+    assert list(copy) == ["a", "b"]
+
+
+@pytest.mark.parametrize("values", [[True], [False], [None], [True, True], [True, False], []])
+def test_condition_matches_check(values):
+    conditions = [Fluent("a", value) for value in values]
+    for initial in (True, False, None):
+        plain, compact = DomainDescription(), DomainDescription(compact=True)
+        for domain in (plain, compact):
+            domain.initially(a=initial)
+        assert plain._check(conditions) == compact._check(conditions)
+    assert DomainDescription(compact=True)._check([Fluent("missing", True)]) is False
+
+
+def test_compact_domain_agrees_with_dict_domain(seed):
+    plain = make_domain(seed, cls=DomainDescription)
+    compact = make_domain(seed, cls=DomainDescription).compact()
+    assert isinstance(compact.fluents, BitState)
+    r = random.Random(seed)
+    for _ in range(12):
+        action = r.choice(sorted(plain._causes))
+        assert plain.do_action(action) == compact.do_action(action)
+        assert plain.state() == compact.state()
+
+
+def test_cached_conditions_follow_new_fluents():
+    domain = DomainDescription(compact=True)
+    domain.initially(a=True)
+    conditions = [Fluent("b", True)]
+    assert domain._check(conditions) is False
+    domain.initially(b=True)
+    assert domain._check(conditions) is True
+    domain.initially(**{name: False for name in NAMES})
+    assert domain._check(conditions + [Fluent("f0", False)]) is True
@@ -0,0 +1,114 @@
+import threading
+
+import pytest
+
+from krr_system import Fluent
+from krr_system.store import Store, decode, encode
+
+
+def test_encode_round_trip():
+    literals = (("loaded", True), ("alive", False))
+    assert encode(literals) == "loaded#True:alive#False"
+    assert decode(encode(literals)) == literals
+    assert decode("") == ()
+
+
+def test_store_round_trip(tmp_path):
+    path = str(tmp_path / "krr.db")
+    with Store(path) as store:
+        assert store.add_fluent("loaded") and not store.add_fluent("loaded")
+        store.add_action("load", 3)
+        store.set_duration("load", 2)
+        store.add_action("shoot")
+        store.add_statement("load", "causes", [("loaded", True)])
+        store.add_statement("load", "releases", [("hidden", False)])
+        store.add_statement("shoot", "causes", [("alive", False)], [("loaded", True)])
+        store.add_statement("shoot", "impossible", (), [("alive", False)])
+        assert store.add_initial_state("alive", True) and not store.add_initial_state("alive", False)
+        store.add_observation("alive", False, 4)
+        assert store.add_occurrence("load", 1) and not store.add_occurrence("shoot", 1)
+        store.add_occurrence("shoot", 3)
+    with Store(path) as store:
+        assert store.fluents() == ["loaded"]
+        assert store.actions() == [("load", 2), ("shoot", 1)]
+        assert store.statements()[2].conditions == (("loaded", True),)
+        assert store.initial_states() == [("alive", True)]
+        assert store.observations() == [("alive", False, 4)]
+        assert store.occurrences() == [("load", 1), ("shoot", 3)]
+        domain = store.domain()
+        assert domain.durations == {"load": 2, "shoot": 1}
+        scenario = store.scenario(domain)
+        assert scenario.observations == ((Fluent("alive", False), 4),)
+        assert scenario.check_if_condition_hold(Fluent("loaded", True), 2) is True
+
+
+def test_failed_transaction_rolls_back():
+    with Store() as store:
+        store.add_fluent("a")
+        version = store.version()
+        with pytest.raises(RuntimeError):
+            with store.transaction():
+                store.add_fluent("b")
+                with store.transaction():
+                    store.add_fluent("c")
+                raise RuntimeError
+        assert store.fluents() == ["a"]
+        assert store.version() == version
+
+
+def test_nested_transactions_bump_the_version_once():
+    with Store() as store:
+        with store.transaction():
+            store.add_fluent("a")
+            store.add_fluent("b")
+        assert store.version() == 1
+
+
+def test_reset_keeps_the_version():
+    with Store() as store:
+        store.add_fluent("a")
+        store.set_setting("fluents", "2")
+        store.reset()
+        assert store.fluents() == [] and store.setting("fluents") is None
+        # the setting did not count as a change
+        assert store.version() == 2
+
+
+def test_import_legacy(tmp_path):
+    files = {
+        "fluents": "loaded,alive",
+        "actions": "load;2,shoot;1,load;3",
+        "statements": "shoot;causes;alive#False;loaded#True",
+        "initial_states": "alive;True",
+        "observations": "alive;False;4",
+        "action_occurences": "load;1,shoot;4",
+        "technical_variables": "2;3",
+    }
+    for name, text in files.items():
+        (tmp_path / f"{name}.txt").write_text(text)
+    with Store() as store:
+        store.import_legacy(str(tmp_path))
+        assert store.version() == 1
+        assert store.actions() == [("load", 3), ("shoot", 1)]
+        assert store.statements()[0].fluents == (("alive", False),)
+        assert store.occurrences() == [("load", 1), ("shoot", 4)]
+        assert (store.setting("conditions"), store.setting("fluents")) == ("2", "3")
+        domain = store.domain()
+        assert ("alive", True) in domain.state()
+
+
+def test_store_is_shared_between_threads():
+    with Store() as store:
+        def write(k):
+            for i in range(50):
+                with store.transaction():
+                    store.add_fluent(f"f{k}_{i}")
+                store.fluents()
+
+        threads = [threading.Thread(target=write, args=(k,)) for k in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(store.fluents()) == 200
+        assert store.version() == 200
@@ -0,0 +1,66 @@
+import random
+
+from benchmarks.generator import random_domain, random_statements
+from krr_system import DomainDescription, Fluent, Statement, Structure
+
+from conftest import make_domain
+
+
+def counting(structure):
+    """Counts the actions the structure's model runs"""
+    model, calls = structure.model, []
+    do_action = model.do_action
+
+    def counted(*args, **kwargs):
+        calls.append(args)
+        return do_action(*args, **kwargs)
+
+    model.do_action = counted
+    return calls
+
+
+def test_check_statements_matches_is_statement_true(seed):
+    domain = make_domain(seed, cls=DomainDescription)
+    structure = Structure(domain)
+    r = random.Random(seed)
+    actions = sorted(domain._causes)
+    statements = [Statement([Fluent(r.choice(sorted(domain.fluents)), True)],
+                            [r.choice(actions) for _ in range(r.randint(0, 5))])
+                  for _ in range(r.randint(0, 30))]
+    assert structure.check_statements(statements) == [structure.is_statement_true(s) for s in statements]
+
+
+def test_every_shared_action_runs_once(seed):
+    domain = make_domain(seed, cls=DomainDescription)
+    structure = Structure(domain)
+    r = random.Random(seed)
+    actions = sorted(domain._causes)
+    statements = [Statement([Fluent("f0", True)], [r.choice(actions) for _ in range(r.randint(0, 5))])
+                  for _ in range(r.randint(1, 30))]
+    calls = counting(structure)
+    structure.check_statements(statements)
+    prefixes = {tuple(s.actions[:k]) for s in statements for k in range(1, len(s.actions) + 1)}
+    assert len(calls) == len(prefixes)
+
+
+def test_shallow_branch_points_are_not_replayed():
+    domain = DomainDescription()
+    domain.initially(a=False)
+    for action in "abcde":
+        domain.causes(action, Fluent("a", True))
+    structure = Structure(domain)
+    # sorted, A B C branches from A B D at depth 2 and from A E at depth 1
+    statements = [Statement([Fluent("a", True)], list(actions)) for actions in ("abc", "abd", "ae")]
+    calls = counting(structure)
+    assert structure.check_statements(statements) == [True, True, True]
+    assert len(calls) == 5
+
+
+def test_model_state_is_kept():
+    domain = random_domain(1, fluents=12, actions=5, cls=DomainDescription)
+    structure = Structure(domain)
+    state = structure.model.state()
+    statements = random_statements(domain, 1, statements=50, length=6, shared=0.8)
+    assert structure.check_statements(statements) == [structure.is_statement_true(s) for s in statements]
+    assert structure.model.state() == state
+    assert structure.check_statements([]) == []
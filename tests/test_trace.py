@@ -0,0 +1,62 @@
+import random
+
+import numpy as np
+import pytest
+
+from krr_system import Fluent, Scenario
+from krr_system.examples import example1
+from krr_system.utils import FALSE, TRUE, UNKNOWN
+
+from conftest import make_domain, make_occurances
+
+CODES = {True: TRUE, False: FALSE, None: UNKNOWN}
+
+
+def test_holds_matches_check_if_condition_hold(seed):
+    domain = make_domain(seed)
+    scenario = Scenario(domain, [], make_occurances(seed, domain, count=10))
+    trace = scenario.trace()
+    times = list(range(40))
+    r = random.Random(seed)
+    for _ in range(5):
+        conditions = [Fluent(r.choice(trace.names + ["missing"]), r.choice([True, False, None]))
+                      for _ in range(r.randint(1, 3))]
+        expected = [CODES[scenario.check_if_condition_hold(conditions, time)] for time in times]
+        assert trace.holds(conditions, times).tolist() == expected
+
+
+def test_value_at_matches_check_if_condition_hold(seed):
+    domain = make_domain(seed)
+    scenario = Scenario(domain, [], make_occurances(seed, domain, count=10))
+    trace = scenario.trace()
+    for time in range(0, 40, 3):
+        for name in trace.names:
+            holds = scenario.check_if_condition_hold(Fluent(name, True), time)
+            if trace.end is not None and time >= trace.end:
+                with pytest.raises(ValueError):
+                    trace.value_at(name, time)
+                assert holds is False and scenario.check_if_condition_hold(Fluent(name, False), time) is False
+            else:
+                value = trace.value_at(name, time)
+                assert holds is (None if value is None else value)
+
+
+def test_changes_of_the_shooting_scenario():
+    scenario = Scenario(example1, [], [("load", 1), ("shoot", 3)])
+    trace = scenario.trace()
+    assert len(trace) == 3 and trace.end is None
+    assert trace.times.tolist() == [1, 1, 3]
+    assert trace.first_change("loaded", True) == 1
+    assert trace.first_change("loaded", False) == 3
+    assert trace.first_change("alive", False) is None
+    assert trace.times_when("hidden", None).tolist() == [1, 1, 3]
+    assert trace.first_change("alive", None) == 3
+    assert trace.column("loaded").dtype == np.int8
+
+
+def test_trace_of_a_broken_scenario_ends_at_the_failing_occurance():
+    scenario = Scenario(example1, [], [("load", 1), ("shoot", 2)])
+    trace = scenario.trace()
+    assert not scenario.is_consistent()
+    assert trace.end == 2 and len(trace) == 2
+    assert trace.holds(Fluent("alive", True), [1, 2]).tolist() == [TRUE, FALSE]
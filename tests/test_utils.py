@@ -0,0 +1,55 @@
+import itertools
+from functools import reduce
+
+import numpy as np
+import pytest
+
+from krr_system.utils import (from_array, fuzzy_all, fuzzy_and, fuzzy_and_array, fuzzy_any, fuzzy_eq, fuzzy_eq_array,
+                              fuzzy_not, fuzzy_not_array, fuzzy_or, fuzzy_or_array, pack, packed_and, packed_eq,
+                              packed_not, packed_or, to_array, unpack)
+
+VALUES = [True, False, None]
+PAIRS = list(itertools.product(VALUES, VALUES))
+LEFT, RIGHT = to_array([a for a, _ in PAIRS]), to_array([b for _, b in PAIRS])
+
+
+@pytest.mark.parametrize("array, scalar", [(fuzzy_and_array, fuzzy_and), (fuzzy_or_array, fuzzy_or),
+                                           (fuzzy_eq_array, fuzzy_eq)])
+def test_array_kernels_match_the_scalar_functions(array, scalar):
+    assert from_array(array(LEFT, RIGHT)) == [scalar(a, b) for a, b in PAIRS]
+
+
+def test_not():
+    assert from_array(fuzzy_not_array(to_array(VALUES))) == [fuzzy_not(v) for v in VALUES]
+
+
+@pytest.mark.parametrize("length", range(4))
+def test_reductions(length):
+    for values in itertools.product(VALUES, repeat=length):
+        array = to_array(values)
+        assert from_array(fuzzy_all(array)) == [reduce(fuzzy_and, values, True)]
+        assert from_array(fuzzy_any(array)) == [reduce(fuzzy_or, values, False)]
+
+
+@pytest.mark.parametrize("packed, scalar", [(packed_and, fuzzy_and), (packed_or, fuzzy_or), (packed_eq, fuzzy_eq)])
+def test_packed_kernels(packed, scalar):
+    known, value = packed(*pack(LEFT), *pack(RIGHT))
+    assert from_array(unpack(known, value, len(PAIRS))) == [scalar(a, b) for a, b in PAIRS]
+
+
+def test_packed_kernels_on_ints():
+    # BitState masks: bit i is the i-th value
+    def masks(values):
+        return (sum(1 << i for i, v in enumerate(values) if v is not None),
+                sum(1 << i for i, v in enumerate(values) if v))
+
+    known, value = packed_and(*masks([a for a, _ in PAIRS]), *masks([b for _, b in PAIRS]))
+    assert masks([fuzzy_and(a, b) for a, b in PAIRS]) == (known, value)
+    known, value = packed_not(*masks(VALUES))
+    assert masks([fuzzy_not(v) for v in VALUES]) == (known, value)
+
+
+def test_pack_round_trip():
+    matrix = to_array([True, None, False] * 5).reshape(3, 5)
+    assert (unpack(*pack(matrix), 5) == matrix).all()
+    assert pack(matrix)[0].dtype == np.uint8